@@ -10,10 +10,134 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str
     SUPABASE_JWT_SECRET: str
 
+    # Threads used for blocking Supabase calls (see app/supabase_client.py)
+    SUPABASE_EXECUTOR_WORKERS: int = 32
+
+    # JWKS key cache (see app/services/jwks_store.py)
+    JWKS_CACHE_TTL_SECONDS: float = 600
+    JWKS_REFRESH_AHEAD_SECONDS: float = 60
+    JWKS_MAX_STALE_READS: int = 1000
+    JWKS_MIN_REFETCH_INTERVAL_SECONDS: float = 30
+    JWKS_FETCH_TIMEOUT_SECONDS: float = 5
+
+    # Verified-claims LRU (see app/services/token_verifier.py)
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+
+    # Per-user profile cache (see app/services/profile_cache.py)
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    PROFILE_CACHE_TTL_SECONDS: float = 300
+
     # Google Gemini LLM
     GEMINI_API_KEY: str = ""
     LLM_MODEL: str = "gemini-2.0-flash"
 
+    # Shared Gemini HTTP pool (see app/services/gemini_client.py)
+    GEMINI_MAX_CONNECTIONS: int = 50
+    GEMINI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GEMINI_KEEPALIVE_EXPIRY_SECONDS: float = 60
+    GEMINI_HTTP2: bool = False  # needs the optional 'h2' package
+    GEMINI_CONNECT_TIMEOUT_SECONDS: float = 10
+    GEMINI_READ_TIMEOUT_SECONDS: float = 120  # max gap between received chunks
+    GEMINI_WRITE_TIMEOUT_SECONDS: float = 30
+    GEMINI_POOL_TIMEOUT_SECONDS: float = 10
+    GEMINI_FIRST_BYTE_TIMEOUT_SECONDS: float = 60
+
+    # Gemini retries / hedging / fallback (see app/services/gemini_policy.py)
+    LLM_FALLBACK_MODEL: str = ""  # e.g. "gemini-2.0-flash-lite"; empty = no fallback
+    LLM_FALLBACK_AFTER_FAILURES: int = 3
+    LLM_FALLBACK_COOLDOWN_SECONDS: float = 60
+    LLM_RETRY_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+
+    # LLM admission control (see app/services/llm_governor.py)
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MAX_QUEUE: int = 32
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 20
+    LLM_USER_RATE_PER_MINUTE: float = 6
+    LLM_USER_BURST: int = 3
+
+    # Roadmap generation cache (see app/services/roadmap_cache.py)
+    ROADMAP_CACHE_ENABLED: bool = True
+    ROADMAP_CACHE_MAX_ENTRIES: int = 256
+    ROADMAP_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    ROADMAP_CACHE_DISK_PATH: str = ""  # empty = memory only
+    ROADMAP_CACHE_DISK_MAX_ENTRIES: int = 5000
+
+    # Two-phase roadmap generation: a module outline first, then every
+    # module's tasks in parallel calls (see LLMService._generate_fanout)
+    ROADMAP_FANOUT_ENABLED: bool = False
+    ROADMAP_FANOUT_CONCURRENCY: int = 4  # task-planning calls in flight per generation
+
+    # Background jobs (see app/services/job_queue.py)
+    JOB_BACKEND: str = "memory"  # memory | sqlite | redis
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX_SIZE: int = 100
+    JOB_MAX_RETAINED: int = 1000  # finished jobs kept by the memory backend
+    JOB_RESULT_TTL_SECONDS: float = 24 * 3600
+    JOB_STALE_AFTER_SECONDS: float = 900  # sqlite (on start) / redis (periodically): re-queue jobs claimed longer ago than this
+    JOB_SQLITE_PATH: str = "jobs.db"
+    JOB_REDIS_URL: str = "redis://localhost:6379/0"
+    JOB_LONG_POLL_MAX_SECONDS: float = 30
+    JOB_RETRY_AFTER_SECONDS: int = 5
+
+    # Project list pagination
+    PROJECT_LIST_PAGE_SIZE: int = 50
+    PROJECT_LIST_MAX_PAGE_SIZE: int = 100
+
+    # Roadmap SSE stream (see app/services/sse_stream.py)
+    SSE_COALESCE_WINDOW_SECONDS: float = 0.05  # merge LLM text fragments for up to this long…
+    SSE_COALESCE_MAX_BYTES: int = 1024  # …or until this many bytes are buffered
+    SSE_HEARTBEAT_SECONDS: float = 15
+    SSE_MAX_QUEUED_FRAMES: int = 64  # per stream; a slow client stalls the producer beyond this…
+    SSE_READER_STALL_SECONDS: float = 15  # …for at most this long, then the reader is detached (resumes via Last-Event-ID)
+    SSE_REPLAY_MAX_EVENTS: int = 5000  # frames kept per stream for Last-Event-ID resume
+    SSE_REPLAY_MAX_BYTES: int = 4 * 1024 * 1024
+    SSE_RESUME_GRACE_SECONDS: float = 60  # keep generating this long with no client attached (0 = cancel on disconnect)
+    SSE_DISCONNECT_POLL_SECONDS: float = 1.0
+
+    # Abandoned generations (see app/services/orphan_sweeper.py)
+    ABANDONED_PROJECT_RETENTION_SECONDS: float = 3600  # then the row (and anything under it) is deleted
+    ORPHAN_SWEEP_INTERVAL_SECONDS: float = 600
+
+    # Idempotency-Key / single-flight for project creation (see app/services/idempotency.py)
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600
+
+    # Resource versions behind ETags (see app/services/resource_versions.py)
+    VERSION_BACKEND: str = "memory"  # memory (single worker) | redis (multiple workers/hosts)
+    VERSION_REDIS_URL: str = "redis://localhost:6379/0"
+    VERSION_MAX_TRACKED: int = 100000
+
+    # Assembled project tree cache (see app/services/project_tree_cache.py)
+    PROJECT_TREE_CACHE_MAX_ENTRIES: int = 2000
+    PROJECT_TREE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PROJECT_TREE_CACHE_TTL_SECONDS: float = 600
+
+    # Save modules + tasks through the transactional `save_roadmap` RPC
+    # (install backend/sql/save_roadmap.sql first); False = two bulk inserts
+    ROADMAP_SAVE_RPC: bool = False
+
+    # Check ownership + update task statuses in one call to the
+    # `update_task_statuses` RPC (install backend/sql/update_task_statuses.sql)
+    TASK_UPDATE_RPC: bool = False
+
+    # Read progress from trigger-maintained counters and let the database
+    # roll module/project status up (install backend/sql/progress_counters.sql)
+    PROGRESS_COUNTERS: bool = False
+
+    # GET /api/metrics requires "Authorization: Bearer <METRICS_TOKEN>";
+    # empty = the endpoint is disabled
+    METRICS_TOKEN: str = ""
+
+    # Filter the deadlines view and task status updates on the denormalized
+    # tasks.user_id column (install backend/sql/tasks_user_id.sql)
+    TASK_USER_ID_COLUMN: bool = False
+
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
 
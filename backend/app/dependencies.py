@@ -1,8 +1,10 @@
+import hmac
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-import httpx
 from app.config import get_settings
+from app.services.jwks_store import JWKSUnavailableError
+from app.services.token_verifier import get_token_verifier
 # HTTPBearer → reads Authorization: Bearer <token> header automatically
 # HTTPAuthorizationCredentials → object contains the token
 # jose.jwt → library to decode and verify JWTs
@@ -38,23 +40,15 @@ async def get_current_user(
             ...
     """
     token = credentials.credentials
-    settings = get_settings()
     #credentials is an object like:
     #HTTPAuthorizationCredentials(scheme="Bearer", credentials="eyJhbGciOiJIUzI1NiIsInR...")
     # .credentials → "eyJhbGciOiJIUzI1NiIsInR..." actual string
     try:
-        # Fetch the JWKS (JSON Web Key Set) from Supabase
-        # This contains the Public Keys used to verify the token signature
-        jwks_url = f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
-        
-        # Verify the token against the JWKS
-        # This automatically handles key rotation and algorithm selection (ES256/RS256)
-        payload = jwt.decode(
-            token,
-            key=httpx.get(jwks_url).json(),  # In production, cache this!
-            algorithms=["HS256", "RS256", "ES256"],
-            audience="authenticated",
-        )
+        # Verify the token signature, expiry and audience.
+        # HS256 tokens are checked locally with SUPABASE_JWT_SECRET,
+        # ES256/RS256 tokens with cached JWKS public keys, and a token
+        # that was already verified is served from the claims cache.
+        payload = await get_token_verifier().verify(token)
 
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
@@ -72,9 +66,35 @@ async def get_current_user(
             "role": payload.get("role", "authenticated"),
         }
 
+    except JWKSUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Unable to verify token right now: {str(e)}",
+        )
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Token validation failed: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def require_metrics_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> None:
+    """
+    Guard for internal endpoints (/api/metrics): the bearer token must be
+    METRICS_TOKEN, not a user JWT. With no token configured the endpoint
+    is off.
+    """
+    expected = get_settings().METRICS_TOKEN
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+    if not hmac.compare_digest(credentials.credentials.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid metrics token.",
+        )
@@ -1,7 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.middleware.cors import setup_cors
+from app.responses import FastJSONResponse
+from app.services.gemini_client import open_gemini_client, close_gemini_client
+from app.services.job_queue import get_job_queue
+from app.services.orphan_sweeper import get_orphan_sweeper
+from app.services.project_service import ProjectService
 from app.routers import auth
 from app.routers import projects
+from app.routers import metrics
+
+# ──────────────────────────────────────────────
+# Lifespan (startup / shutdown)
+# ──────────────────────────────────────────────
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    await open_gemini_client()
+
+    job_queue = get_job_queue()
+    job_queue.register("create_project", ProjectService.run_create_project_job)
+    await job_queue.start()
+
+    orphan_sweeper = get_orphan_sweeper()
+    await orphan_sweeper.start()
+
+    yield
+
+    await orphan_sweeper.stop()
+    await job_queue.stop()
+    await close_gemini_client()
+
 
 # ──────────────────────────────────────────────
 # App Initialization
@@ -13,6 +44,8 @@ app = FastAPI(
     version="0.2.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # ──────────────────────────────────────────────
@@ -27,6 +60,7 @@ setup_cors(app)
 
 app.include_router(auth.router)
 app.include_router(projects.router)
+app.include_router(metrics.router)
 
 # ──────────────────────────────────────────────
 # Health Check
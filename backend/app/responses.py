@@ -0,0 +1,76 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional speed-up — falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # stdlib json only: orjson handles these itself
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Compact UTF-8 JSON (dates/datetimes as ISO 8601, UUIDs as strings)."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+else:
+    def dumps(obj: Any) -> bytes:
+        """Compact UTF-8 JSON (dates/datetimes as ISO 8601, UUIDs as strings)."""
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+if orjson is not None:
+    loads = orjson.loads
+else:
+    loads = json.loads
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (when installed). Used as the app's
+    default response class, so every route — including the large project
+    detail payloads — skips the stdlib encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ── Server-Sent Events ───────────────────────────────
+# Frames are `data: {"type": <type>, "data": <payload>}\n\n`. The event
+# types are fixed strings, so each one gets its frame prefix formatted
+# once; per event only the payload is encoded.
+_SSE_PREFIXES: dict[str, str] = {}
+
+
+def sse_event(event_type: str, data: Any) -> str:
+    """Encode one SSE `data:` frame."""
+    prefix = _SSE_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = _SSE_PREFIXES[event_type] = 'data: {"type":%s,"data":' % dumps(event_type).decode()
+    return prefix + dumps(data).decode() + "}\n\n"
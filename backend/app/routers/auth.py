@@ -33,7 +33,7 @@ async def signup(data: SignUpRequest):
     - Returns tokens if email confirmation is disabled,
       otherwise returns a confirmation message
     """
-    return AuthService.sign_up(data)
+    return await AuthService.sign_up(data)
 
 
 @router.post(
@@ -46,7 +46,7 @@ async def login(data: LoginRequest):
 
     Returns access_token, refresh_token, and basic user info.
     """
-    return AuthService.sign_in(data)
+    return await AuthService.sign_in(data)
 
 
 @router.post(
@@ -57,7 +57,7 @@ async def refresh_token(data: RefreshTokenRequest):
     """
     Exchange a refresh token for a new access + refresh token pair.
     """
-    return AuthService.refresh_token(data)
+    return await AuthService.refresh_token(data)
 
 
 @router.post(
@@ -70,7 +70,7 @@ async def forgot_password(data: ForgotPasswordRequest):
     Send a password reset email to the provided address.
     Always returns success to avoid revealing whether the email exists.
     """
-    return AuthService.forgot_password(data)
+    return await AuthService.forgot_password(data)
 
 
 @router.post(
@@ -82,7 +82,7 @@ async def reset_password(data: ResetPasswordRequest):
     """
     Reset the user's password using the token from the reset email.
     """
-    return AuthService.reset_password(data)
+    return await AuthService.reset_password(data)
 
 
 # ── Protected Endpoints (auth required) ─────────────
@@ -98,7 +98,7 @@ async def logout(user: dict = Depends(get_current_user)):
     Logout the current user.
     Frontend should also discard stored tokens.
     """
-    return AuthService.sign_out(user["sub"])
+    return await AuthService.sign_out(user["sub"])
 
 
 @router.get(
@@ -110,7 +110,7 @@ async def get_me(user: dict = Depends(get_current_user)):
     """
     Fetch the authenticated user's profile data.
     """
-    return AuthService.get_profile(user["sub"], user["email"])
+    return await AuthService.get_profile(user["sub"], user["email"])
 
 
 @router.put(
@@ -125,4 +125,4 @@ async def update_me(
     Update profile fields for the authenticated user.
     Only non-null fields in the request body will be updated.
     """
-    return AuthService.update_profile(user["sub"], data)
+    return await AuthService.update_profile(user["sub"], data)
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from app.dependencies import require_metrics_token
+from app.services.gemini_policy import get_gemini_policy
+from app.services.idempotency import get_idempotency_store
+from app.services.job_queue import get_job_queue
+from app.services.llm_governor import get_llm_governor
+from app.services.orphan_sweeper import get_orphan_sweeper
+from app.services.profile_cache import get_profile_cache
+from app.services.project_tree_cache import get_project_tree_cache
+from app.services.roadmap_cache import get_roadmap_cache
+from app.services.sse_stream import get_sse_streamer
+from app.services.token_verifier import get_token_verifier
+
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(require_metrics_token)],
+)
+
+
+# ──────────────────────────────────────────────
+# GET /api/metrics — In-process counters
+# ──────────────────────────────────────────────
+@router.get(
+    "",
+    summary="Runtime counters for caches, queues and the LLM governor",
+)
+async def get_metrics():
+    """
+    Snapshot of this worker's in-process counters.
+    Each uvicorn worker keeps its own numbers. Internal only: needs
+    `Authorization: Bearer <METRICS_TOKEN>`.
+    """
+    verifier = get_token_verifier()
+    return {
+        "llm": get_llm_governor().stats(),
+        "gemini": get_gemini_policy().stats(),
+        "jobs": await get_job_queue().stats(),
+        "sse": get_sse_streamer().stats(),
+        "orphan_sweeper": get_orphan_sweeper().stats(),
+        "idempotency": get_idempotency_store().stats(),
+        "roadmap_cache": get_roadmap_cache().stats(),
+        "profile_cache": get_profile_cache().stats(),
+        "project_tree_cache": get_project_tree_cache().stats(),
+        "auth_claims_cache": {
+            "hits": verifier.hits,
+            "misses": verifier.misses,
+        },
+    }
@@ -1,22 +1,44 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
-from app.dependencies import get_current_user
+from app.config import get_settings
+from app.dependencies import get_current_user, require_metrics_token
 from app.schemas.project import (
     CreateProjectRequest,
     UpdateTaskStatusRequest,
+    BatchUpdateTaskStatusRequest,
+    BatchUpdateTaskStatusResponse,
     ProjectResponse,
     ProjectWithRoadmap,
+    ProjectProgress,
     DeadlineItem,
 )
 from app.schemas.auth import MessageResponse
+from app.schemas.job import JobResponse, JobQueueStats
 from app.services.project_service import ProjectService
 from app.services.llm_service import LLMService
-from app.supabase_client import supabase
-import json
+from app.services.job_queue import get_job_queue
+from app.services.llm_governor import get_llm_governor
+from app.services.sse_stream import get_sse_streamer
+from app.services.idempotency import get_idempotency_store
+from app.services.job_backends import QueueFullError
+from app.services.resource_versions import ResourceVersions
+from app.responses import FastJSONResponse, sse_event
+from contextlib import aclosing
+from datetime import date
+import asyncio
+import time
+import uuid
 
 
 router = APIRouter(prefix="/api/projects", tags=["Projects"])
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 # ──────────────────────────────────────────────
 # POST /api/projects — Create project + generate roadmap
@@ -29,29 +51,77 @@ router = APIRouter(prefix="/api/projects", tags=["Projects"])
 async def create_project(
     data: CreateProjectRequest,
     user: dict = Depends(get_current_user),
+    prefer: str | None = Header(None),
+    idempotency_key: str | None = Header(None),
 ):
     """
     Creates a project, calls Gemini to generate a roadmap,
     saves modules + tasks to DB, and returns the full project.
+
+    With `Prefer: respond-async` the work is queued instead: the response
+    is 202 with the job (poll GET /api/projects/jobs/{job_id} for progress).
+
+    Identical concurrent requests share one generation. With an
+    `Idempotency-Key` header, repeats also get the same project (or job)
+    back after completion instead of creating another one.
     """
-    # Fetch user profile for skill_level and preferred_pace
-    try:
-        profile_response = (
-            supabase.table("profiles")
-            .select("skill_level, preferred_pace")
-            .eq("id", user["sub"])
-            .single()
-            .execute()
+    store = get_idempotency_store()
+    fingerprint = store.fingerprint(data.model_dump(mode="json"))
+
+    if prefer and "respond-async" in prefer.lower():
+        ProjectService.validate_create_request(data)
+        entry, created = store.claim(user["sub"], "create_project_job", idempotency_key, fingerprint)
+        if created:
+            try:
+                job = await get_job_queue().submit(
+                    kind="create_project",
+                    user_id=user["sub"],
+                    payload={"data": data.model_dump(mode="json")},
+                )
+            except QueueFullError:
+                settings = get_settings()
+                error = HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many projects are being generated right now. Try again shortly.",
+                    headers={"Retry-After": str(settings.JOB_RETRY_AFTER_SECONDS)},
+                )
+                store.fail(entry, error)
+                raise error
+            except Exception as e:
+                store.fail(entry, e)
+                raise
+            # Repeats get this job until it has finished, with or without a key
+            finished = asyncio.create_task(
+                get_job_queue().wait_finished(job.id, poll=get_settings().JOB_LONG_POLL_MAX_SECONDS)
+            )
+            store.complete(entry, job.id, hold=finished)
+        else:
+            job = await get_job_queue().get(await asyncio.shield(entry.future))
+            if job is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Job not found.",
+                )
+        return FastJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(JobResponse(**job.to_dict())),
+            headers={"Location": f"/api/projects/jobs/{job.id}"},
         )
-        user_profile = profile_response.data or {}
-    except Exception:
-        user_profile = {}
 
-    project = await ProjectService.create_project(
+    entry, created = store.claim(user["sub"], "create_project", idempotency_key, fingerprint)
+    if not created:
+        # Same request already running (join it) or done (replay it)
+        project_id = await asyncio.shield(entry.future)
+        return await ProjectService.get_project_detail(project_id, user["sub"])
+
+    # Owned by the entry, not this request: joiners still get the result
+    # if this client goes away
+    work = asyncio.ensure_future(ProjectService.create_project(
         user_id=user["sub"],
         data=data,
-        user_profile=user_profile,
-    )
+    ))
+    store.track(entry, work, result=lambda project: project["id"])
+    project = await asyncio.shield(work)
     return project
 
 # ──────────────────────────────────────────────
@@ -63,69 +133,123 @@ async def create_project(
 )
 async def create_project_stream(
     data: CreateProjectRequest,
+    request: Request,
     user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(None),
 ):
     """
     Same as create_project but returns a Server-Sent Events stream.
-    Events: status, chunk (raw LLM text), done (project_id), error.
+    Events: project (project_id, sent first), status, chunk (raw LLM text),
+    module, done (project_id), error.
+    Consecutive chunks are merged into larger frames and `: keep-alive`
+    comments are sent while idle (see app/services/sse_stream.py).
+
+    Every event has an `id`; after a disconnect, GET /api/projects/{id}/stream
+    with `Last-Event-ID` picks the stream up where it left off. If nobody
+    reattaches within SSE_RESUME_GRACE_SECONDS the Gemini call is cancelled
+    and the project is marked 'abandoned'.
+
+    An identical request while this one is running gets the same stream
+    (replayed from the start); with an `Idempotency-Key`, a repeat after
+    it finished gets just the `project` and `done` events.
     """
-    from datetime import date
+    started_at = time.monotonic()
 
     # Validate deadline mode
     if data.planning_mode == "deadline" and not data.deadline_date:
         return StreamingResponse(
-            iter([f"data: {json.dumps({'type': 'error', 'data': 'deadline_date is required when planning_mode is deadline.'})}\n\n"]),
+            iter([sse_event("error", "deadline_date is required when planning_mode is deadline.")]),
             media_type="text/event-stream",
         )
 
     if data.planning_mode == "deadline" and data.deadline_date:
         if data.deadline_date <= date.today():
             return StreamingResponse(
-                iter([f"data: {json.dumps({'type': 'error', 'data': 'deadline_date must be in the future.'})}\n\n"]),
+                iter([sse_event("error", "deadline_date must be in the future.")]),
                 media_type="text/event-stream",
             )
 
-    # Fetch user profile
-    try:
-        profile_response = (
-            supabase.table("profiles")
-            .select("skill_level, preferred_pace")
-            .eq("id", user["sub"])
-            .single()
-            .execute()
+    store = get_idempotency_store()
+    streamer = get_sse_streamer()
+    entry, created = store.claim(
+        user["sub"], "create_project_stream", idempotency_key,
+        store.fingerprint(data.model_dump(mode="json")),
+    )
+    if not created:
+        session = streamer.get(entry.value, user["sub"]) if entry.value else None
+        if session is not None:
+            return StreamingResponse(
+                streamer.subscribe(session, request=request),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
+        if entry.future.done():
+            project_id = entry.future.result()
+            return StreamingResponse(
+                iter([sse_event("project", project_id), sse_event("done", project_id)]),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This project is already being created.",
         )
-        user_profile = profile_response.data or {}
-    except Exception:
-        user_profile = {}
-
-    # Insert project into DB first
-    project_insert = {
-        "user_id": user["sub"],
-        "title": data.title,
-        "description": data.description,
-        "tech_stack": data.tech_stack,
-        "planning_mode": data.planning_mode,
-        "deadline_date": str(data.deadline_date) if data.deadline_date else None,
-        "working_hours_per_day": data.working_hours_per_day,
-        "status": "planning",
-    }
 
+    # Reject with a real 429 while we still can (before the stream starts)
     try:
-        project_response = (
-            supabase.table("projects").insert(project_insert).execute()
-        )
-        project = project_response.data[0]
-    except Exception as e:
-        return StreamingResponse(
-            iter([f"data: {json.dumps({'type': 'error', 'data': f'Failed to create project: {str(e)}'})}\n\n"]),
-            media_type="text/event-stream",
-        )
+        get_llm_governor().check_admission(user["sub"])
+    except HTTPException as e:
+        store.fail(entry, e)
+        raise
+
+    # The response starts right away; the project row is inserted while
+    # the profile is fetched and Gemini generates. The id is chosen here so
+    # it can be sent first (it names the stream for resuming); the first
+    # module save is the first thing that needs the row to exist.
+    project_id = str(uuid.uuid4())
+    entry.value = project_id
+    insert_task = asyncio.create_task(
+        ProjectService.insert_project(user["sub"], data, project_id=project_id)
+    )
+    # Mark a failure as retrieved even if the stream ends before awaiting it
+    insert_task.add_done_callback(lambda task: task.cancelled() or task.exception())
 
-    project_id = project["id"]
+    # Each module is written to the DB as soon as it has been generated,
+    # overlapping the inserts with the rest of the Gemini stream
+    pending_saves: list[asyncio.Task] = []
 
     async def event_generator():
+        error = None
+        try:
+            async with aclosing(generate_events()) as events:
+                async for event in events:
+                    if event[0] == "done":
+                        store.complete(entry, project_id)
+                    elif event[0] == "error":
+                        error = event[1]
+                    yield event
+        except Exception as e:
+            error = f"Roadmap generation failed: {str(e)}"
+            yield ("error", error)
+        finally:
+            # Errors, cancellation: forget it so a retry starts a new generation
+            store.fail(entry, HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Roadmap generation failed.",
+            ))
+        # Cancellation skips this: abandon() cleans up instead
+        if error is not None:
+            await discard(error)
+
+    async def generate_events():
         roadmap = None
 
+        yield ("project", project_id)
+        yield ("status", "🚀 Creating project...")
+
+        # Profile (skill_level, preferred_pace) is all the prompt waits on
+        user_profile = await ProjectService.get_generation_profile(user["sub"])
+
         async for event_type, event_data in LLMService.generate_roadmap_stream(
             description=data.description,
             tech_stack=data.tech_stack,
@@ -134,82 +258,170 @@ async def create_project_stream(
             working_hours_per_day=data.working_hours_per_day,
             skill_level=user_profile.get("skill_level"),
             preferred_pace=user_profile.get("preferred_pace"),
+            user_id=user["sub"],
         ):
-            if event_type == "status":
-                yield f"data: {json.dumps({'type': 'status', 'data': event_data})}\n\n"
-
-            elif event_type == "chunk":
-                yield f"data: {json.dumps({'type': 'chunk', 'data': event_data})}\n\n"
+            if event_type in ("status", "chunk", "outline"):
+                yield (event_type, event_data)
+
+            elif event_type == "module":
+                try:
+                    await insert_task
+                except HTTPException as e:
+                    yield ("error", e.detail)
+                    return
+                pending_saves.append(
+                    asyncio.create_task(LLMService.save_module_to_db(project_id, event_data))
+                )
+                mod_title = event_data.get("title", "Untitled")
+                status_msg = f"💾 Saving Module {len(pending_saves)}: {mod_title}..."
+                yield ("status", status_msg)
+                yield ("module", event_data)
 
             elif event_type == "error":
-                yield f"data: {json.dumps({'type': 'error', 'data': event_data})}\n\n"
+                yield ("error", event_data)
                 return
 
             elif event_type == "done":
                 roadmap = event_data
 
         if roadmap is None:
-            yield f"data: {json.dumps({'type': 'error', 'data': 'No roadmap generated.'})}\n\n"
+            yield ("error", "No roadmap generated.")
             return
 
-        # Save roadmap to DB
         try:
-            supabase.table("projects").update(
-                {"llm_raw_response": roadmap, "status": "active"}
-            ).eq("id", project_id).execute()
-
-            modules_data = roadmap.get("modules", [])
-            for i, module_data in enumerate(modules_data):
-                mod_title = module_data.get("title", "Untitled")
-                status_msg = f"💾 Saving Module {i + 1}: {mod_title}..."
-                yield f"data: {json.dumps({'type': 'status', 'data': status_msg})}\n\n"
-
-                module_insert = {
-                    "project_id": project_id,
-                    "title": module_data["title"],
-                    "description": module_data.get("description", ""),
-                    "order_index": module_data.get("order_index", 0),
-                    "estimated_days": module_data.get("estimated_days"),
-                    "start_date": module_data.get("start_date"),
-                    "end_date": module_data.get("end_date"),
-                    "status": "pending",
-                }
-
-                module_response = (
-                    supabase.table("modules").insert(module_insert).execute()
-                )
-                module = module_response.data[0]
-
-                tasks = module_data.get("tasks", [])
-                for task_data in tasks:
-                    task_insert = {
-                        "module_id": module["id"],
-                        "project_id": project_id,
-                        "title": task_data["title"],
-                        "description": task_data.get("description", ""),
-                        "order_index": task_data.get("order_index", 0),
-                        "estimated_hours": task_data.get("estimated_hours"),
-                        "deadline": task_data.get("deadline"),
-                        "status": "pending",
-                    }
-                    supabase.table("tasks").insert(task_insert).execute()
-
-            yield f"data: {json.dumps({'type': 'status', 'data': '✅ Roadmap saved successfully!'})}\n\n"
-            yield f"data: {json.dumps({'type': 'done', 'data': project_id})}\n\n"
+            await insert_task
+        except HTTPException as e:
+            yield ("error", e.detail)
+            return
+
+        # Wait for the in-flight module saves and mark the project active
+        try:
+            await LLMService.finish_streamed_save(project_id, roadmap, pending_saves)
+            await ProjectService.touch(user["sub"], project_id)
+
+            yield ("status", "✅ Roadmap saved successfully!")
+            yield ("done", project_id)
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'data': f'Failed to save roadmap: {str(e)}'})}\n\n"
+            yield ("error", f"Failed to save roadmap: {str(e)}")
+
+    async def discard(error: str):
+        # Failed: the client got the error; remove the row (it would sit in
+        # the list as 'planning' with no roadmap) and anything saved under it
+        print(f"Roadmap generation {project_id} failed: {error}")
+        await LLMService.discard_streamed_modules(project_id, pending_saves)
+        try:
+            await insert_task
+        except HTTPException:
+            return  # the row was never created
+        try:
+            await ProjectService.delete_project(project_id, user["sub"])
+        except HTTPException as e:
+            # Left 'planning': the orphan sweeper removes it later
+            print(f"Cleanup of failed generation {project_id} failed: {e.detail}")
+
+    async def abandon():
+        # Cancelled with nobody listening: drop what was saved, flag the row
+        await LLMService.discard_streamed_modules(project_id, pending_saves)
+        try:
+            await insert_task
+        except HTTPException:
+            return
+        await ProjectService.mark_abandoned(user["sub"], project_id)
+
+    # Generation runs on its own; this connection is just its first reader
+    session = streamer.start(project_id, user["sub"], event_generator(), on_abandon=abandon)
+    return StreamingResponse(
+        streamer.subscribe(session, started_at=started_at, request=request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+# ──────────────────────────────────────────────
+# GET /api/projects/{id}/stream — Resume a generation stream
+# ──────────────────────────────────────────────
+@router.get(
+    "/{project_id}/stream",
+    summary="Reattach to a roadmap generation stream after a disconnect",
+)
+async def resume_project_stream(
+    project_id: str,
+    request: Request,
+    user: dict = Depends(get_current_user),
+    last_event_id: str | None = Header(None),
+):
+    """
+    Replays the events after `Last-Event-ID` of a stream started by
+    POST /api/projects/stream, then follows it live. Streams stay
+    resumable for SSE_RESUME_GRACE_SECONDS after the last reader left;
+    after that this is a 404 and the project itself should be fetched.
+    """
+    streamer = get_sse_streamer()
+    session = streamer.get(project_id, user["sub"])
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No generation stream for this project.",
+        )
+
+    try:
+        after = max(0, int(last_event_id or 0))
+    except ValueError:
+        after = 0
 
     return StreamingResponse(
-        event_generator(),
+        streamer.subscribe(session, last_event_id=after, request=request),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
     )
 
+# ──────────────────────────────────────────────
+# GET /api/projects/jobs/stats — Job queue depth + utilization
+# ──────────────────────────────────────────────
+@router.get(
+    "/jobs/stats",
+    response_model=JobQueueStats,
+    summary="Background job queue depth and worker utilization",
+    dependencies=[Depends(require_metrics_token)],
+)
+async def get_job_stats():
+    """Operator view, same guard as /api/metrics (which also includes it)."""
+    return await get_job_queue().stats()
+
+
+# ──────────────────────────────────────────────
+# GET /api/projects/jobs/{job_id} — Job status (long-poll)
+# ──────────────────────────────────────────────
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Get the status and progress of a project creation job",
+)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Long-poll: seconds to wait for a change"),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Returns the job immediately, or with `?wait=N` holds the request open
+    until the job's progress/status changes (at most N seconds).
+    """
+    settings = get_settings()
+    job_queue = get_job_queue()
+
+    job = await job_queue.get(job_id)
+    if job is None or job.user_id != user["sub"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found.",
+        )
+
+    if wait:
+        job = await job_queue.wait(job_id, min(wait, settings.JOB_LONG_POLL_MAX_SECONDS)) or job
+
+    return job.to_dict()
+
+
 # ──────────────────────────────────────────────
 # GET /api/projects — List all projects
 # ──────────────────────────────────────────────
@@ -218,8 +430,31 @@ async def create_project_stream(
     response_model=list[ProjectResponse],
     summary="List all projects for the authenticated user",
 )
-def list_projects(user: dict = Depends(get_current_user)):
-    return ProjectService.get_projects(user_id=user["sub"])
+async def list_projects(
+    response: Response,
+    limit: int | None = Query(None, ge=1, description="Page size (capped by PROJECT_LIST_MAX_PAGE_SIZE)"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    if_none_match: str | None = Header(None),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Newest projects first, one page at a time. When more projects exist
+    the `X-Next-Cursor` response header holds the cursor for the next page.
+    Supports If-None-Match (304 when nothing changed).
+    """
+    etag = await ProjectService.list_etag(user["sub"], "list", limit, cursor)
+    if ResourceVersions.matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    projects, next_cursor = await ProjectService.get_projects(
+        user_id=user["sub"],
+        limit=limit,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    _set_validators(response, etag)
+    return projects
 
 
 # ──────────────────────────────────────────────
@@ -230,8 +465,26 @@ def list_projects(user: dict = Depends(get_current_user)):
     response_model=list[DeadlineItem],
     summary="Get upcoming task deadlines across all projects",
 )
-def get_deadlines(user: dict = Depends(get_current_user)):
-    return ProjectService.get_upcoming_deadlines(user_id=user["sub"])
+async def get_deadlines(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    deadline_from: date | None = Query(None, alias="from", description="Earliest deadline (inclusive)"),
+    deadline_to: date | None = Query(None, alias="to", description="Latest deadline (inclusive)"),
+    if_none_match: str | None = Header(None),
+    user: dict = Depends(get_current_user),
+):
+    etag = await ProjectService.list_etag(user["sub"], "deadlines", limit, deadline_from, deadline_to)
+    if ResourceVersions.matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    deadlines = await ProjectService.get_upcoming_deadlines(
+        user_id=user["sub"],
+        limit=limit,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+    )
+    _set_validators(response, etag)
+    return deadlines
 
 
 # ──────────────────────────────────────────────
@@ -242,10 +495,44 @@ def get_deadlines(user: dict = Depends(get_current_user)):
     response_model=ProjectWithRoadmap,
     summary="Get full project detail with modules and tasks",
 )
-def get_project(project_id: str, user: dict = Depends(get_current_user)):
-    return ProjectService.get_project_detail(
+async def get_project(
+    project_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    user: dict = Depends(get_current_user),
+):
+    etag = await ProjectService.detail_etag(user["sub"], project_id)
+    if ResourceVersions.matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    project = await ProjectService.get_project_detail(
         project_id=project_id, user_id=user["sub"]
     )
+    _set_validators(response, etag)
+    return project
+
+
+# ──────────────────────────────────────────────
+# GET /api/projects/{id}/progress — Progress counters
+# ──────────────────────────────────────────────
+@router.get(
+    "/{project_id}/progress",
+    response_model=ProjectProgress,
+    summary="Task counts and hours done/remaining per project and module",
+)
+async def get_project_progress(
+    project_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    user: dict = Depends(get_current_user),
+):
+    etag = await ProjectService.detail_etag(user["sub"], project_id, "progress")
+    if ResourceVersions.matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    progress = await ProjectService.get_progress(project_id=project_id, user_id=user["sub"])
+    _set_validators(response, etag)
+    return progress
 
 
 # ──────────────────────────────────────────────
@@ -255,13 +542,13 @@ def get_project(project_id: str, user: dict = Depends(get_current_user)):
     "/{project_id}/tasks/{task_id}",
     summary="Update a task's status",
 )
-def update_task(
+async def update_task(
     project_id: str,
     task_id: str,
     data: UpdateTaskStatusRequest,
     user: dict = Depends(get_current_user),
 ):
-    return ProjectService.update_task_status(
+    return await ProjectService.update_task_status(
         task_id=task_id,
         project_id=project_id,
         user_id=user["sub"],
@@ -269,6 +556,31 @@ def update_task(
     )
 
 
+# ──────────────────────────────────────────────
+# PATCH /api/projects/{id}/tasks — Batch update task statuses
+# ──────────────────────────────────────────────
+@router.patch(
+    "/{project_id}/tasks",
+    response_model=BatchUpdateTaskStatusResponse,
+    summary="Update the status of several tasks at once",
+)
+async def update_tasks(
+    project_id: str,
+    data: BatchUpdateTaskStatusRequest,
+    user: dict = Depends(get_current_user),
+):
+    """
+    Applies every `{task_id, status}` pair in one go (e.g. "mark module
+    done"). Tasks that don't exist in this project are listed in `not_found`.
+    If a task appears more than once, its last status wins.
+    """
+    return await ProjectService.update_task_statuses(
+        project_id=project_id,
+        user_id=user["sub"],
+        updates={update.task_id: update.status for update in data.updates},
+    )
+
+
 # ──────────────────────────────────────────────
 # DELETE /api/projects/{id} — Delete project
 # ──────────────────────────────────────────────
@@ -277,7 +589,23 @@ def update_task(
     response_model=MessageResponse,
     summary="Delete a project and all its modules/tasks",
 )
-def delete_project(project_id: str, user: dict = Depends(get_current_user)):
-    return ProjectService.delete_project(
+async def delete_project(project_id: str, user: dict = Depends(get_current_user)):
+    return await ProjectService.delete_project(
         project_id=project_id, user_id=user["sub"]
     )
+
+
+# ──────────────────────────────────────────────
+# Conditional GET helpers
+# ──────────────────────────────────────────────
+def _set_validators(response: Response, etag: str | None) -> None:
+    """ETag + `no-cache` so browsers revalidate with If-None-Match."""
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    _set_validators(response, etag)
+    return response
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+# ──────────────────────────────────────────────
+# Response Models
+# ──────────────────────────────────────────────
+
+class JobResponse(BaseModel):
+    """State of a background job (e.g. project creation)."""
+    id: str
+    kind: str
+    status: str
+    progress: int = 0
+    stage: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobQueueStats(BaseModel):
+    """Queue depth and worker utilization."""
+    depth: int
+    max_size: int
+    workers: int
+    busy_workers: int
+    utilization: float
+    submitted: int
+    succeeded: int
+    failed: int
+    rejected: int
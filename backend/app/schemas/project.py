@@ -22,6 +22,17 @@ class UpdateTaskStatusRequest(BaseModel):
     status: str = Field(..., pattern="^(pending|in_progress|completed|blocked)$")
 
 
+class TaskStatusUpdate(BaseModel):
+    """One task's new status within a batch update."""
+    task_id: str
+    status: str = Field(..., pattern="^(pending|in_progress|completed|blocked)$")
+
+
+class BatchUpdateTaskStatusRequest(BaseModel):
+    """Request body to update the status of several tasks of one project."""
+    updates: List[TaskStatusUpdate] = Field(..., min_length=1, max_length=500)
+
+
 # ──────────────────────────────────────────────
 # Response Models
 # ──────────────────────────────────────────────
@@ -76,6 +87,40 @@ class ProjectWithRoadmap(ProjectResponse):
     modules: List[ModuleResponse] = []
 
 
+class BatchUpdateTaskStatusResponse(BaseModel):
+    """Result of a batch task-status update."""
+    updated: List[TaskResponse]
+    not_found: List[str] = []
+
+
+class ProgressCounts(BaseModel):
+    """Task counts by status and estimated hours done vs remaining."""
+    pending: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    blocked: int = 0
+    total: int = 0
+    hours_total: float = 0
+    hours_done: float = 0
+    hours_remaining: float = 0
+    percent_complete: float = 0
+
+
+class ModuleProgress(ProgressCounts):
+    """Progress of one module."""
+    module_id: str
+    title: str
+    order_index: int
+    status: str
+
+
+class ProjectProgress(ProgressCounts):
+    """Progress of a project and each of its modules."""
+    project_id: str
+    status: str
+    modules: List[ModuleProgress] = []
+
+
 class DeadlineItem(BaseModel):
     """A single upcoming deadline (task or module)."""
     project_id: str
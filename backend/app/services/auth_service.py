@@ -1,6 +1,7 @@
 from fastapi import HTTPException, status
 from gotrue.errors import AuthApiError
-from app.supabase_client import supabase
+from app.supabase_client import supabase, execute, run_sync, create_session_client
+from app.services.profile_cache import get_profile_cache
 from app.schemas.auth import (
     SignUpRequest,
     LoginRequest,
@@ -19,10 +20,11 @@ class AuthService:
  
     # ── Sign Up ──────────────────────────────────────────
     @staticmethod
-    def sign_up(data: SignUpRequest) -> dict:
+    async def sign_up(data: SignUpRequest) -> dict:
         """Register a new user. Profile row is auto-created by DB trigger."""
         try:
-            response = supabase.auth.sign_up(
+            response = await run_sync(
+                supabase.auth.sign_up,
                 {
                     "email": data.email,
                     "password": data.password,
@@ -72,10 +74,11 @@ class AuthService:
 
     # ── Sign In ──────────────────────────────────────────
     @staticmethod
-    def sign_in(data: LoginRequest) -> dict:
+    async def sign_in(data: LoginRequest) -> dict:
         """Authenticate user with email + password, return tokens."""
         try:
-            response = supabase.auth.sign_in_with_password(
+            response = await run_sync(
+                supabase.auth.sign_in_with_password,
                 {
                     "email": data.email,
                     "password": data.password,
@@ -108,7 +111,7 @@ class AuthService:
 
     # ── Sign Out ─────────────────────────────────────────
     @staticmethod
-    def sign_out(user_id: str) -> dict:
+    async def sign_out(user_id: str) -> dict:
         """
         Sign out user. Since we use JWT (stateless), the frontend
         should also discard the token. This endpoint lets the backend
@@ -120,10 +123,10 @@ class AuthService:
 
     # ── Refresh Token ────────────────────────────────────
     @staticmethod
-    def refresh_token(data: RefreshTokenRequest) -> dict:
+    async def refresh_token(data: RefreshTokenRequest) -> dict:
         """Exchange a refresh token for a new access token."""
         try:
-            response = supabase.auth.refresh_session(data.refresh_token)
+            response = await run_sync(supabase.auth.refresh_session, data.refresh_token)
 
             session = response.session
             if session is None:
@@ -151,10 +154,11 @@ class AuthService:
 
     # ── Forgot Password ─────────────────────────────────
     @staticmethod
-    def forgot_password(data: ForgotPasswordRequest) -> dict:
+    async def forgot_password(data: ForgotPasswordRequest) -> dict:
         """Send a password reset email via Supabase."""
         try:
-            supabase.auth.reset_password_for_email(
+            await run_sync(
+                supabase.auth.reset_password_for_email,
                 data.email,
                 {
                     "redirect_to": "http://localhost:3000/reset-password"
@@ -171,13 +175,18 @@ class AuthService:
             }
     # ── Reset Password ───────────────────────────────────
     @staticmethod
-    def reset_password(data: ResetPasswordRequest) -> dict:
+    async def reset_password(data: ResetPasswordRequest) -> dict:
         """Reset password using the token from the reset email."""
         try:
-            # First set the session using the access token from the reset link
-            supabase.auth.set_session(data.access_token, data.refresh_token)
-            # Then update the password
-            supabase.auth.update_user({"password": data.new_password})
+            def _reset():
+                # Own client: the session below belongs to this user only
+                client = create_session_client()
+                # First set the session using the access token from the reset link
+                client.auth.set_session(data.access_token, data.refresh_token)
+                # Then update the password
+                client.auth.update_user({"password": data.new_password})
+
+            await run_sync(_reset)
             return {"message": "Password updated successfully.", "success": True}
         except AuthApiError as e:
             raise HTTPException(
@@ -187,18 +196,10 @@ class AuthService:
 
     # ── Get Profile ──────────────────────────────────────
     @staticmethod
-    def get_profile(user_id: str, email: str) -> dict:
+    async def get_profile(user_id: str, email: str) -> dict:
         """Fetch user profile from the profiles table."""
         try:
-            response = (
-                supabase.table("profiles")
-                .select("*")
-                .eq("id", user_id)
-                .single()
-                .execute()
-            )
-
-            profile = response.data
+            profile = await get_profile_cache().get(user_id)
             if profile is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -226,7 +227,7 @@ class AuthService:
 
     # ── Update Profile ───────────────────────────────────
     @staticmethod
-    def update_profile(user_id: str, data: UpdateProfileRequest) -> dict:
+    async def update_profile(user_id: str, data: UpdateProfileRequest) -> dict:
         """Update user profile fields (only non-None fields are updated)."""
         try:
             update_data = data.model_dump(exclude_none=True) #model_dump convert pydantic model to dict
@@ -236,19 +237,22 @@ class AuthService:
                     detail="No fields provided to update.",
                 )
 
-            response = (
+            response = await execute(
                 supabase.table("profiles")
                 .update(update_data)
                 .eq("id", user_id)
-                .execute()
             )
 
             if not response.data:
+                get_profile_cache().invalidate(user_id)
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Profile not found.",
                 )
 
+            # Write-through so the next read (e.g. project creation) sees it
+            get_profile_cache().put(user_id, response.data[0])
+
             return {
                 "message": "Profile updated successfully.",
                 "success": True,
@@ -258,6 +262,8 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
+            # The write may or may not have landed — don't trust the cached row
+            get_profile_cache().invalidate(user_id)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update profile: {str(e)}",
@@ -0,0 +1,95 @@
+import asyncio
+import importlib.util
+import httpx
+from contextlib import asynccontextmanager
+from app.config import get_settings
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# One pooled client for every Gemini call (streaming and non-streaming).
+# Opened/closed by the FastAPI lifespan handler in app/main.py.
+_client: httpx.AsyncClient | None = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    settings = get_settings()
+
+    http2 = settings.GEMINI_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("GEMINI_HTTP2 is enabled but the 'h2' package is not installed — using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        base_url=GEMINI_BASE_URL,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.GEMINI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GEMINI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.GEMINI_CONNECT_TIMEOUT_SECONDS,
+            read=settings.GEMINI_READ_TIMEOUT_SECONDS,
+            write=settings.GEMINI_WRITE_TIMEOUT_SECONDS,
+            pool=settings.GEMINI_POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+async def open_gemini_client() -> None:
+    """Create the shared client (called on app startup)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+
+
+async def close_gemini_client() -> None:
+    """Close the shared client and its pooled connections (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_gemini_client() -> httpx.AsyncClient:
+    """
+    Return the shared client. Created lazily if the lifespan handler
+    didn't run (e.g. when the service is used from a script).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def open_gemini_response(path: str, payload: dict) -> httpx.Response:
+    """
+    POST `payload` to a Gemini endpoint on the shared pool and return the
+    response as soon as its headers arrive (body not read yet — the caller
+    must close it).
+
+    Connect/read/write/pool timeouts come from the client itself; on top of
+    that the response headers must arrive within GEMINI_FIRST_BYTE_TIMEOUT_SECONDS,
+    otherwise an httpx.TimeoutException is raised.
+    """
+    settings = get_settings()
+    client = get_gemini_client()
+    request = client.build_request("POST", path, json=payload)
+
+    try:
+        return await asyncio.wait_for(
+            client.send(request, stream=True),
+            timeout=settings.GEMINI_FIRST_BYTE_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        raise httpx.ReadTimeout("Timed out waiting for the first byte from Gemini.", request=request)
+
+
+@asynccontextmanager
+async def gemini_request(path: str, payload: dict):
+    """Context-managed open_gemini_response(): the response is closed on exit."""
+    response = await open_gemini_response(path, payload)
+    try:
+        yield response
+    finally:
+        await response.aclose()
@@ -0,0 +1,246 @@
+import asyncio
+import random
+import time
+import httpx
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
+from app.config import get_settings
+from app.services.gemini_client import open_gemini_response
+
+
+class GeminiCallError(Exception):
+    """Gemini answered with a non-200 status after all retries/fallbacks."""
+
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"Gemini API error: {status_code} — {body}")
+        self.status_code = status_code
+        self.body = body
+
+
+class GeminiCallPolicy:
+    """
+    Resilient call policy for Gemini requests.
+
+    - Retries 429 / 5xx responses and transport errors with full-jitter
+      exponential backoff, sleeping at least as long as Retry-After says.
+      A Retry-After longer than LLM_RETRY_MAX_DELAY_SECONDS ends the
+      retries for that model instead of being cut short.
+    - Optional hedging: if the response headers haven't arrived after the
+      p-th percentile of recent time-to-first-byte, a second identical
+      request is sent; the first to answer wins and the other is cancelled.
+    - Model fallback: when LLM_MODEL exhausts its retries the call moves to
+      LLM_FALLBACK_MODEL. After LLM_FALLBACK_AFTER_FAILURES consecutive
+      failed calls, the primary model is skipped for a cooldown period.
+
+    All of this happens before the response is handed to the caller, so it
+    is safe for streaming too: nothing has been forwarded to the client yet.
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+    TTFB_WINDOW = 200
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._ttfb: dict[str, deque] = {}
+        self._primary_failures = 0
+        self._primary_skipped_until = 0.0
+
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+
+    # ── Public API ───────────────────────────────────
+    @asynccontextmanager
+    async def call(self, method: str, payload: dict, params: dict | None = None):
+        """
+        Yield `(response, model)` for the first 200 response obtained for
+        `models/{model}:{method}`. The response body is not read yet and is
+        closed when the block exits. Raises GeminiCallError or an
+        httpx.TransportError once every attempt has failed.
+        """
+        settings = self.settings
+        models = self._models()
+        attempts = max(1, settings.LLM_RETRY_MAX_ATTEMPTS)
+        last_error: Exception | None = None
+
+        for index, model in enumerate(models):
+            if index > 0:
+                self.fallbacks += 1
+            query = urlencode({**(params or {}), "key": settings.GEMINI_API_KEY})
+            path = f"/models/{model}:{method}?{query}"
+
+            for attempt in range(attempts):
+                retry_after = None
+                try:
+                    response = await self._send_hedged(method, path, payload)
+                except httpx.TransportError as e:
+                    last_error = e
+                else:
+                    if response.status_code == 200:
+                        self._record_result(model, success=True)
+                        try:
+                            yield response, model
+                        finally:
+                            await response.aclose()
+                        return
+
+                    body = (await response.aread()).decode(errors="replace")
+                    await response.aclose()
+                    last_error = GeminiCallError(response.status_code, body)
+                    if response.status_code not in self.RETRYABLE_STATUS:
+                        raise last_error
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+                if attempt + 1 < attempts:
+                    delay = self._backoff(attempt, retry_after)
+                    if delay is None:
+                        break
+                    self.retries += 1
+                    await asyncio.sleep(delay)
+
+            self._record_result(model, success=False)
+
+        raise last_error
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "primary_skipped": time.monotonic() < self._primary_skipped_until,
+            "ttfb_p50_seconds": {m: self._percentile(m, 50) for m in self._ttfb},
+        }
+
+    # ── Models / fallback ────────────────────────────
+    def _models(self) -> list[str]:
+        primary = self.settings.LLM_MODEL
+        fallback = self.settings.LLM_FALLBACK_MODEL
+        if not fallback or fallback == primary:
+            return [primary]
+        if time.monotonic() < self._primary_skipped_until:
+            return [fallback]
+        return [primary, fallback]
+
+    def _record_result(self, model: str, success: bool) -> None:
+        if model != self.settings.LLM_MODEL:
+            return
+        if success:
+            self._primary_failures = 0
+            return
+        self._primary_failures += 1
+        if self._primary_failures >= self.settings.LLM_FALLBACK_AFTER_FAILURES:
+            self._primary_skipped_until = time.monotonic() + self.settings.LLM_FALLBACK_COOLDOWN_SECONDS
+            self._primary_failures = 0
+
+    # ── Backoff ──────────────────────────────────────
+    def _backoff(self, attempt: int, retry_after: float | None) -> float | None:
+        """
+        Seconds to sleep before the next attempt, or None when the server's
+        Retry-After is longer than we are willing to wait (stop retrying).
+        """
+        settings = self.settings
+        ceiling = min(settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            if retry_after > settings.LLM_RETRY_MAX_DELAY_SECONDS:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None  # HTTP-date form: fall back to our own backoff
+
+    # ── Hedging ──────────────────────────────────────
+    async def _send_hedged(self, method: str, path: str, payload: dict) -> httpx.Response:
+        primary = asyncio.create_task(self._send(method, path, payload))
+        delay = self._hedge_delay(method)
+        if delay is None:
+            return await primary
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedge = asyncio.create_task(self._send(method, path, payload))
+        pending = {primary, hedge}
+        fallback_result: httpx.Response | None = None
+        last_error: BaseException | None = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    response = task.result()
+                    if response.status_code == 200:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        if fallback_result is not None:
+                            await fallback_result.aclose()
+                        return response
+                    # Non-200: keep it in case the other one fails too
+                    if fallback_result is None:
+                        fallback_result = response
+                    else:
+                        await response.aclose()
+        finally:
+            # Cancel the loser; close any response it already produced
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                try:
+                    loser = await task
+                except BaseException:
+                    continue
+                await loser.aclose()
+
+        if fallback_result is not None:
+            return fallback_result
+        raise last_error
+
+    async def _send(self, method: str, path: str, payload: dict) -> httpx.Response:
+        started = time.monotonic()
+        response = await open_gemini_response(path, payload)
+        if response.status_code == 200:
+            samples = self._ttfb.setdefault(method, deque(maxlen=self.TTFB_WINDOW))
+            samples.append(time.monotonic() - started)
+        return response
+
+    def _hedge_delay(self, method: str) -> float | None:
+        settings = self.settings
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        samples = self._ttfb.get(method)
+        if not samples or len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, self._percentile(method, settings.LLM_HEDGE_PERCENTILE))
+
+    def _percentile(self, method: str, percentile: float) -> float:
+        samples = sorted(self._ttfb.get(method, ()))
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return round(samples[index], 4)
+
+
+@lru_cache()
+def get_gemini_policy() -> GeminiCallPolicy:
+    """Process-wide call policy — shares TTFB history and fallback state."""
+    return GeminiCallPolicy(get_settings())
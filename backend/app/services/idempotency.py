@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable
+from fastapi import HTTPException, status
+from app.config import get_settings
+
+
+@dataclass
+class IdempotencyEntry:
+    slot: tuple[str, str, str]
+    fingerprint: str
+    remember: bool       # keep the result after completion (explicit Idempotency-Key)
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    value: object = None  # known before completion (e.g. the streamed project's id)
+    expires_at: float = 0.0
+    hold: asyncio.Future | None = None  # keeps a keyless entry until this finishes
+
+
+class IdempotencyStore:
+    """
+    Single-flight + replay for project creation, per user and scope.
+
+    - `claim()` returns the entry for (user, scope, key) and whether the
+      caller created it. The creator does the work and calls `complete()`
+      or `fail()` (or hands a task to `track()`); everyone else awaits
+      `entry.future` (or attaches to `entry.value`) instead of starting a
+      second generation.
+    - With an explicit Idempotency-Key the result (a project / job id, not
+      the payload) is kept for `ttl` seconds; a repeat gets the stored
+      result. Reusing a key with a different request body is a 422.
+    - Without one, the request fingerprint is the key and the entry only
+      lives while the work is in flight (double clicks join, later
+      identical requests create a new project). Work that finishes after
+      its result is known (a queued job) passes `hold` to `complete()`.
+    - Failures are not remembered: the entry is dropped, so a retry runs.
+    - Bounded LRU of `max_entries`. Lives in this process only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str, str], IdempotencyEntry] = OrderedDict()
+
+        self.started = 0
+        self.joined = 0
+        self.replayed = 0
+        self.conflicts = 0
+
+    @staticmethod
+    def fingerprint(payload: dict) -> str:
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def claim(self, user_id: str, scope: str, key: str | None, fingerprint: str) -> tuple[IdempotencyEntry, bool]:
+        """
+        Entry for this request and True if the caller must do the work
+        (False: join / replay the existing one).
+        """
+        remember = bool(key)
+        slot = (user_id, scope, f"key:{key}" if remember else f"body:{fingerprint}")
+
+        entry = self._entries.get(slot)
+        if entry is not None and entry.future.done() and entry.expires_at <= time.monotonic():
+            del self._entries[slot]
+            entry = None
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                self.conflicts += 1
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used for a different request.",
+                )
+            self._entries.move_to_end(slot)
+            if entry.future.done():
+                self.replayed += 1
+            else:
+                self.joined += 1
+            return entry, False
+
+        entry = IdempotencyEntry(slot=slot, fingerprint=fingerprint, remember=remember)
+        # Failures are re-raised by every waiter; don't warn if there is none
+        entry.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._entries[slot] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.started += 1
+        return entry, True
+
+    def complete(self, entry: IdempotencyEntry, result: object, hold: asyncio.Future | None = None) -> None:
+        """
+        Store the result. A keyless entry is dropped right away, or once
+        `hold` finishes if given — repeats get `result` until then.
+        """
+        if entry.future.done():
+            return
+        entry.expires_at = time.monotonic() + self.ttl
+        entry.future.set_result(result)
+        if entry.remember:
+            return
+        if hold is None:
+            self._drop(entry)
+        else:
+            def release(done: asyncio.Future) -> None:
+                if not done.cancelled():
+                    done.exception()  # retrieved: how `hold` ended doesn't matter
+                self._drop(entry)
+
+            entry.hold = hold
+            hold.add_done_callback(release)
+
+    def fail(self, entry: IdempotencyEntry, error: BaseException) -> None:
+        if entry.future.done():
+            return
+        entry.future.set_exception(error)
+        self._drop(entry)
+
+    def track(self, entry: IdempotencyEntry, work: asyncio.Future, result: Callable[[object], object]) -> None:
+        """Settle `entry` when `work` finishes, storing `result(work's value)`."""
+        def settle(task: asyncio.Future) -> None:
+            if task.cancelled():
+                self.fail(entry, HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Project creation was cancelled.",
+                ))
+            elif task.exception() is not None:
+                self.fail(entry, task.exception())
+            else:
+                self.complete(entry, result(task.result()))
+
+        work.add_done_callback(settle)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "in_flight": sum(1 for e in self._entries.values() if not e.future.done()),
+            "max_entries": self.max_entries,
+            "started": self.started,
+            "joined": self.joined,
+            "replayed": self.replayed,
+            "conflicts": self.conflicts,
+        }
+
+    # ── Internals ────────────────────────────────────
+    def _drop(self, entry: IdempotencyEntry) -> None:
+        if self._entries.get(entry.slot) is entry:
+            del self._entries[entry.slot]
+
+
+@lru_cache()
+def get_idempotency_store() -> IdempotencyStore:
+    """Process-wide idempotency store — created once, shared by every request."""
+    settings = get_settings()
+    return IdempotencyStore(
+        max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    )
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass
+class Job:
+    """A unit of background work and its current state."""
+    id: str
+    kind: str
+    user_id: str
+    payload: dict
+    status: str = "queued"          # queued | running | succeeded | failed
+    progress: int = 0               # 0-100
+    stage: str = "Queued"
+    result: dict | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(**data)
+
+
+class QueueFullError(Exception):
+    """Raised by a backend when the queue is at capacity."""
+
+
+# ──────────────────────────────────────────────
+# In-process (default)
+# ──────────────────────────────────────────────
+
+class MemoryJobBackend:
+    """
+    asyncio.Queue of job ids + dict of job records.
+    Jobs are lost on restart; finished jobs are kept up to `max_retained`.
+    """
+
+    def __init__(self, max_size: int, max_retained: int):
+        self.max_size = max_size
+        self.max_retained = max_retained
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_size)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def put(self, job: Job) -> None:
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise QueueFullError()
+        self._jobs[job.id] = job
+        self._prune()
+
+    async def next(self) -> Job:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def load(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _prune(self) -> None:
+        # Drop the oldest finished jobs once we keep too many records
+        if len(self._jobs) <= self.max_retained:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.finished]:
+            if len(self._jobs) <= self.max_retained:
+                break
+            del self._jobs[job_id]
+
+
+# ──────────────────────────────────────────────
+# SQLite (persistent, single host)
+# ──────────────────────────────────────────────
+
+class SQLiteJobBackend:
+    """
+    Jobs persisted in a local SQLite file, so queued work survives a restart.
+    Queued jobs are claimed atomically (UPDATE ... RETURNING), which also
+    makes the file safe to share between workers on the same host.
+    """
+
+    POLL_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, path: str, max_size: int, result_ttl: float, stale_after: float):
+        self.path = path
+        self.max_size = max_size
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._available = asyncio.Event()
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    async def put(self, job: Job) -> None:
+        if not await asyncio.to_thread(self._insert, job):
+            raise QueueFullError()
+        self._available.set()
+
+    async def next(self) -> Job:
+        while True:
+            job = await asyncio.to_thread(self._claim)
+            if job is not None:
+                return job
+            self._available.clear()
+            try:
+                # Woken by put() in this process, or poll for other processes
+                await asyncio.wait_for(self._available.wait(), self.POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def save(self, job: Job) -> None:
+        await asyncio.to_thread(self._update, job)
+
+    async def load(self, job_id: str) -> Job | None:
+        return await asyncio.to_thread(self._select, job_id)
+
+    async def depth(self) -> int:
+        return await asyncio.to_thread(self._count_queued)
+
+    # ── blocking helpers (run in a thread) ───────────
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    body TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+            now = time.time()
+            # Re-queue work orphaned by a crashed process, drop expired results
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+                (now - self.stale_after,),
+            )
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.result_ttl,),
+            )
+
+    def _insert(self, job: Job) -> bool:
+        with self._lock:
+            (queued,) = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()
+            if queued >= self.max_size:
+                return False
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, created_at, started_at, finished_at, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.status, job.created_at, job.started_at, job.finished_at, json.dumps(job.to_dict())),
+            )
+            return True
+
+    def _claim(self) -> Job | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = ?
+                WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1)
+                RETURNING body
+                """,
+                (now,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = Job.from_dict(json.loads(row[0]))
+        job.status = "running"
+        job.started_at = now
+        return job
+
+    def _update(self, job: Job) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, finished_at = ?, body = ? WHERE id = ?",
+                (job.status, job.started_at, job.finished_at, json.dumps(job.to_dict()), job.id),
+            )
+
+    def _select(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_dict(json.loads(row[0])) if row else None
+
+    def _count_queued(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()
+        return count
+
+
+# ──────────────────────────────────────────────
+# Redis (persistent, shared across hosts)
+# ──────────────────────────────────────────────
+
+class RedisJobBackend:
+    """
+    Redis list as the queue + one JSON key per job (expires after `result_ttl`).
+    Requires the optional `redis` package (redis>=4.2 for redis.asyncio) and
+    Redis >= 6.2 (BLMOVE).
+
+    Claiming moves the id atomically from the queue to a processing list
+    (BLMOVE), with the claim time in a hash. It leaves the processing list
+    when the job finishes. A claim older than `stale_after` (the worker
+    died mid-job) is moved back to the queue, checked on start and then
+    every REQUEUE_INTERVAL_SECONDS by whichever worker is waiting.
+    """
+
+    QUEUE_KEY = "spm:jobs:queue"
+    PROCESSING_KEY = "spm:jobs:processing"
+    CLAIMED_KEY = "spm:jobs:claimed"  # job id → claim time
+    JOB_KEY = "spm:jobs:{}"
+    CLAIM_TIMEOUT_SECONDS = 5
+    REQUEUE_INTERVAL_SECONDS = 60
+
+    # Back to the queue only if still claimed: concurrent sweeps requeue once
+    _REQUEUE_SCRIPT = """
+    if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 1 then
+        redis.call('RPUSH', KEYS[2], ARGV[1])
+        redis.call('HDEL', KEYS[3], ARGV[1])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, max_size: int, result_ttl: float, stale_after: float):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("JOB_BACKEND=redis requires the 'redis' package (pip install redis).")
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+        self._requeue = self._redis.register_script(self._REQUEUE_SCRIPT)
+        self.max_size = max_size
+        self.result_ttl = int(result_ttl)
+        self.stale_after = stale_after
+        self._swept_at = 0.0
+
+    async def start(self) -> None:
+        await self._redis.ping()
+        await self._requeue_stale()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    async def put(self, job: Job) -> None:
+        if await self._redis.llen(self.QUEUE_KEY) >= self.max_size:
+            raise QueueFullError()
+        await self.save(job)
+        await self._redis.lpush(self.QUEUE_KEY, job.id)
+
+    async def next(self) -> Job:
+        while True:
+            if time.time() - self._swept_at >= self.REQUEUE_INTERVAL_SECONDS:
+                await self._requeue_stale()
+            job_id = await self._redis.blmove(
+                self.QUEUE_KEY, self.PROCESSING_KEY, self.CLAIM_TIMEOUT_SECONDS, "RIGHT", "LEFT"
+            )
+            if job_id is None:
+                continue
+            await self._redis.hset(self.CLAIMED_KEY, job_id, time.time())
+            job = await self.load(job_id)
+            if job is not None:
+                return job
+            await self._release(job_id)  # record expired
+
+    async def save(self, job: Job) -> None:
+        await self._redis.set(self.JOB_KEY.format(job.id), json.dumps(job.to_dict()), ex=self.result_ttl)
+        if job.finished:
+            await self._release(job.id)
+
+    async def load(self, job_id: str) -> Job | None:
+        body = await self._redis.get(self.JOB_KEY.format(job_id))
+        return Job.from_dict(json.loads(body)) if body else None
+
+    async def depth(self) -> int:
+        return await self._redis.llen(self.QUEUE_KEY)
+
+    async def _release(self, job_id: str) -> None:
+        await self._redis.lrem(self.PROCESSING_KEY, 1, job_id)
+        await self._redis.hdel(self.CLAIMED_KEY, job_id)
+
+    async def _requeue_stale(self) -> None:
+        """Put jobs claimed by a dead worker back on the queue."""
+        self._swept_at = time.time()
+        cutoff = self._swept_at - self.stale_after
+        claimed = await self._redis.hgetall(self.CLAIMED_KEY)
+        for job_id in await self._redis.lrange(self.PROCESSING_KEY, 0, -1):
+            claimed_at = claimed.get(job_id)
+            if claimed_at is None:
+                # Died between BLMOVE and HSET: start the clock now
+                await self._redis.hsetnx(self.CLAIMED_KEY, job_id, self._swept_at)
+                continue
+            if float(claimed_at) >= cutoff:
+                continue
+            job = await self.load(job_id)
+            if job is None or job.finished:
+                await self._release(job_id)
+                continue
+            job.status = "queued"
+            job.started_at = None
+            job.stage = "Queued"
+            await self.save(job)
+            await self._requeue(
+                keys=[self.PROCESSING_KEY, self.QUEUE_KEY, self.CLAIMED_KEY], args=[job_id]
+            )
@@ -0,0 +1,223 @@
+import asyncio
+import time
+import uuid
+from functools import lru_cache
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+from app.config import get_settings
+from app.services.job_backends import (
+    Job,
+    QueueFullError,
+    MemoryJobBackend,
+    SQLiteJobBackend,
+    RedisJobBackend,
+)
+
+# handler(job, report) → result dict; report(progress, stage) updates the job
+ProgressReporter = Callable[[int, str], Awaitable[None]]
+JobHandler = Callable[[Job, ProgressReporter], Awaitable[dict]]
+
+
+class JobQueue:
+    """
+    Bounded background job queue with a fixed pool of asyncio workers.
+
+    - `submit()` stores the job and returns immediately; when the queue is
+      full it raises QueueFullError so the caller can push back (503).
+    - Workers pull jobs from the backend and run the handler registered
+      for the job's kind, recording progress as they go.
+    - `wait()` lets a status request long-poll until the job changes.
+    - A backend error (sqlite locked, redis down) is logged and the worker
+      backs off and carries on; it never takes the worker down.
+    """
+
+    ERROR_BACKOFF_SECONDS = 0.5
+    ERROR_BACKOFF_MAX_SECONDS = 30.0
+
+    def __init__(self, backend, workers: int):
+        self.backend = backend
+        self.worker_count = workers
+        self._handlers: dict[str, JobHandler] = {}
+        self._workers: list[asyncio.Task] = []
+        self._changed: dict[str, asyncio.Event] = {}
+
+        self.busy_workers = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.worker_errors = 0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    # ── Lifecycle ────────────────────────────────────
+    async def start(self) -> None:
+        await self.backend.start()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"job-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.backend.close()
+
+    # ── Public API ───────────────────────────────────
+    async def submit(self, kind: str, user_id: str, payload: dict) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'.")
+
+        job = Job(id=str(uuid.uuid4()), kind=kind, user_id=user_id, payload=payload)
+        try:
+            await self.backend.put(job)
+        except QueueFullError:
+            self.rejected += 1
+            raise
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        return await self.backend.load(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Job | None:
+        """
+        Long-poll: return the job once it changes (progress or status) or
+        after `timeout` seconds, whichever comes first.
+        """
+        if timeout <= 0:
+            return await self.backend.load(job_id)
+
+        # Registered before the load: a change saved in between sets it
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        job = await self.backend.load(job_id)
+        if job is None or job.finished:
+            # No further saves will pop it; every other waiter sees the same
+            if self._changed.get(job_id) is event:
+                del self._changed[job_id]
+            return job
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.backend.load(job_id)
+
+    async def wait_finished(self, job_id: str, poll: float) -> Job | None:
+        """
+        Return once the job has finished (or no longer exists). Changes
+        made by this process wake it up; otherwise it re-checks every
+        `poll` seconds (jobs run by another worker).
+        """
+        while True:
+            job = await self.wait(job_id, poll)
+            if job is None or job.finished:
+                return job
+
+    async def stats(self) -> dict:
+        return {
+            "depth": await self.backend.depth(),
+            "max_size": self.backend.max_size,
+            "workers": self.worker_count,
+            "busy_workers": self.busy_workers,
+            "utilization": round(self.busy_workers / self.worker_count, 4) if self.worker_count else 0.0,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "worker_errors": self.worker_errors,
+            "dead_workers": sum(1 for task in self._workers if task.done()),
+        }
+
+    # ── Workers ──────────────────────────────────────
+    async def _worker_loop(self) -> None:
+        failures = 0
+        while True:
+            try:
+                job = await self.backend.next()
+                self.busy_workers += 1
+                try:
+                    await self._run(job)
+                finally:
+                    self.busy_workers -= 1
+                failures = 0
+            except Exception as e:
+                self.worker_errors += 1
+                failures += 1
+                delay = min(
+                    self.ERROR_BACKOFF_MAX_SECONDS,
+                    self.ERROR_BACKOFF_SECONDS * 2 ** (failures - 1),
+                )
+                print(f"Job worker error (retrying in {delay:.1f}s): {e}")
+                await asyncio.sleep(delay)
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = job.started_at or time.time()
+        job.stage = "Running"
+        await self._save(job)
+
+        async def report(progress: int, stage: str) -> None:
+            job.progress = max(0, min(100, progress))
+            job.stage = stage
+            await self._save(job)
+
+        try:
+            job.result = await self._handlers[job.kind](job, report)
+            job.status = "succeeded"
+            job.progress = 100
+            job.stage = "Done"
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job was cancelled (server shutting down)."
+            await self._save(job)
+            raise
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = str(e.detail)
+            self.failed += 1
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            self.failed += 1
+
+        job.finished_at = time.time()
+        await self._save(job)
+
+    async def _save(self, job: Job) -> None:
+        await self.backend.save(job)
+        # Wake up long-pollers waiting on this job
+        event = self._changed.pop(job.id, None)
+        if event is not None:
+            event.set()
+
+
+def _build_backend(settings):
+    if settings.JOB_BACKEND == "sqlite":
+        return SQLiteJobBackend(
+            path=settings.JOB_SQLITE_PATH,
+            max_size=settings.JOB_QUEUE_MAX_SIZE,
+            result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+            stale_after=settings.JOB_STALE_AFTER_SECONDS,
+        )
+    if settings.JOB_BACKEND == "redis":
+        return RedisJobBackend(
+            url=settings.JOB_REDIS_URL,
+            max_size=settings.JOB_QUEUE_MAX_SIZE,
+            result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+            stale_after=settings.JOB_STALE_AFTER_SECONDS,
+        )
+    return MemoryJobBackend(
+        max_size=settings.JOB_QUEUE_MAX_SIZE,
+        max_retained=settings.JOB_MAX_RETAINED,
+    )
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue — created once, started by the app lifespan."""
+    settings = get_settings()
+    return JobQueue(backend=_build_backend(settings), workers=settings.JOB_WORKERS)
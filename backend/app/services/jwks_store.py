@@ -0,0 +1,177 @@
+import asyncio
+import time
+import httpx
+from functools import lru_cache
+from jose import jwk
+from jose.exceptions import JWKError
+from app.config import get_settings
+
+
+class JWKSUnavailableError(Exception):
+    """Raised when no usable signing keys can be loaded from the JWKS endpoint."""
+
+
+class JWKSKeyStore:
+    """
+    In-process cache of the Supabase Auth JSON Web Key Set.
+
+    - Keys are fetched once and reused for `ttl` seconds.
+    - Shortly before the TTL runs out a background refresh is scheduled,
+      so requests keep using the cached keys while the new set loads.
+    - A token with an unknown `kid` (key rotation) triggers an immediate
+      refetch, throttled by `min_refetch_interval` so random kids can't
+      hammer the endpoint.
+    - If the endpoint is down after expiry, up to `max_stale_reads`
+      requests are still served from the old key set before failing.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float,
+        refresh_ahead: float,
+        max_stale_reads: int,
+        min_refetch_interval: float,
+        timeout: float,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self.max_stale_reads = max_stale_reads
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+
+        self._jwks: dict | None = None
+        self._kids: set[str] = set()
+        self._constructed: dict[tuple[str, str], jwk.Key] = {}
+        self._fetched_at = 0.0
+        self._last_forced_fetch = 0.0
+        self._stale_reads = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    # ── Public API ───────────────────────────────────
+    async def get_jwks(self, kid: str | None = None) -> dict:
+        """
+        Return the cached key set, loading or refreshing it when needed.
+        Raises JWKSUnavailableError if no usable keys can be served.
+        """
+        if self._jwks is None:
+            await self._refresh()
+            return self._jwks
+
+        now = time.monotonic()
+
+        # Unknown kid → keys were probably rotated, refetch right away
+        if kid is not None and kid not in self._kids:
+            if now - self._last_forced_fetch >= self.min_refetch_interval:
+                self._last_forced_fetch = now
+                try:
+                    await self._refresh()
+                except JWKSUnavailableError:
+                    pass  # keep the old set, decode will reject the token
+            return self._jwks
+
+        age = now - self._fetched_at
+
+        if age < self.ttl - self.refresh_ahead:
+            return self._jwks
+
+        if age < self.ttl:
+            self._schedule_refresh()
+            return self._jwks
+
+        # Expired: serve a bounded number of stale reads while refreshing
+        if self._stale_reads < self.max_stale_reads:
+            self._stale_reads += 1
+            self._schedule_refresh()
+            return self._jwks
+
+        await self._refresh()
+        return self._jwks
+
+    async def get_signing_key(self, kid: str | None, alg: str) -> jwk.Key | None:
+        """
+        Return the parsed public key for `kid`, or None if the set has no match.
+        Parsed keys are memoized until the next refresh, so the PEM/EC point
+        decoding happens once per key instead of once per request.
+        """
+        jwks = await self.get_jwks(kid)
+        cache_key = (kid or "", alg)
+
+        key = self._constructed.get(cache_key)
+        if key is not None:
+            return key
+
+        for key_data in jwks["keys"]:
+            if kid is not None and key_data.get("kid") != kid:
+                continue
+            if key_data.get("alg", alg) != alg:
+                continue
+            try:
+                key = jwk.construct(key_data, alg)
+            except JWKError:
+                continue
+            self._constructed[cache_key] = key
+            return key
+
+        return None
+
+    def invalidate(self) -> None:
+        """Drop the cached key set so the next request refetches it."""
+        self._jwks = None
+        self._kids = set()
+        self._constructed = {}
+        self._fetched_at = 0.0
+
+    # ── Internals ────────────────────────────────────
+    async def _refresh(self) -> None:
+        """Fetch the key set (single-flight: concurrent callers share one fetch)."""
+        started = time.monotonic()
+        async with self._lock:
+            # Another coroutine refreshed while we were waiting for the lock
+            if self._jwks is not None and self._fetched_at >= started:
+                return
+
+            try:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(self.url)
+                    response.raise_for_status()
+                    jwks = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                if self._jwks is None or self._stale_reads >= self.max_stale_reads:
+                    raise JWKSUnavailableError(f"Failed to fetch JWKS: {str(e)}")
+                return
+
+            keys = jwks.get("keys", []) if isinstance(jwks, dict) else []
+            self._jwks = {"keys": keys}
+            self._kids = {k["kid"] for k in keys if "kid" in k}
+            self._constructed = {}
+            self._fetched_at = time.monotonic()
+            self._stale_reads = 0
+
+    def _schedule_refresh(self) -> None:
+        """Start a background refresh unless one is already running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._refresh()
+        except JWKSUnavailableError:
+            pass  # next request past the stale budget will retry and surface it
+
+
+@lru_cache()
+def get_jwks_store() -> JWKSKeyStore:
+    """Process-wide JWKS store — created once, reused by every request."""
+    settings = get_settings()
+    return JWKSKeyStore(
+        url=f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+        ttl=settings.JWKS_CACHE_TTL_SECONDS,
+        refresh_ahead=settings.JWKS_REFRESH_AHEAD_SECONDS,
+        max_stale_reads=settings.JWKS_MAX_STALE_READS,
+        min_refetch_interval=settings.JWKS_MIN_REFETCH_INTERVAL_SECONDS,
+        timeout=settings.JWKS_FETCH_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,222 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from fastapi import HTTPException, status
+from app.config import get_settings
+
+
+class _TokenBucket:
+    """Classic token bucket: `capacity` burst, refilled at `rate` tokens/second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until_token(self) -> float:
+        self._refill()
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class LLMGovernor:
+    """
+    Admission control in front of every Gemini generation call.
+
+    - Global: at most `max_concurrency` generations in flight; extra callers
+      wait in a FIFO queue of at most `max_queue`, for up to `queue_timeout`.
+    - Per user: a token bucket (`user_burst` capacity, `user_rate_per_minute`
+      refill) so one user can't take the whole budget.
+
+    Anything that can't be admitted raises a 429 with a Retry-After estimate
+    instead of piling onto Gemini and failing with a 502.
+    """
+
+    MAX_TRACKED_USERS = 10000
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        user_rate_per_minute: float,
+        user_burst: int,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.user_rate = user_rate_per_minute / 60.0
+        self.user_burst = user_burst
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._buckets: dict[str, _TokenBucket] = {}
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_user_rate = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.waits = 0
+        self._avg_hold_seconds = 30.0  # EMA of generation time, seeds Retry-After
+
+    # ── Public API ───────────────────────────────────
+    def check_admission(self, user_id: str | None) -> None:
+        """
+        Cheap pre-flight check (consumes nothing). Raises the same 429 that
+        slot() would if the request were made right now — used by streaming
+        endpoints so they can reject before the response has started.
+        """
+        if user_id is not None:
+            bucket = self._bucket(user_id)
+            if not bucket.available():
+                self.rejected_user_rate += 1
+                self._reject_user(bucket)
+        if self._must_queue() and self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            self._reject_queue_full()
+
+    @asynccontextmanager
+    async def slot(self, user_id: str | None):
+        """Hold one generation slot for the duration of the `async with` block."""
+        bucket = self._bucket(user_id) if user_id is not None else None
+        if bucket is not None and not bucket.available():
+            self.rejected_user_rate += 1
+            self._reject_user(bucket)
+
+        await self._acquire()
+
+        # Another request of the same user may have used the token meanwhile
+        if bucket is not None and not bucket.take():
+            self._semaphore.release()
+            self.rejected_user_rate += 1
+            self._reject_user(bucket)
+
+        self.admitted += 1
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            held = time.monotonic() - started
+            self._avg_hold_seconds = 0.8 * self._avg_hold_seconds + 0.2 * held
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_user_rate": self.rejected_user_rate,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "queue_wait_avg_seconds": round(self.wait_seconds_total / self.waits, 4) if self.waits else 0.0,
+            "queue_wait_max_seconds": round(self.wait_seconds_max, 4),
+            "avg_generation_seconds": round(self._avg_hold_seconds, 3),
+            "tracked_users": len(self._buckets),
+        }
+
+    # ── Internals ────────────────────────────────────
+    def _must_queue(self) -> bool:
+        return self._semaphore.locked() or self.waiting > 0
+
+    async def _acquire(self) -> None:
+        if not self._must_queue():
+            await self._semaphore.acquire()
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            self._reject_queue_full()
+
+        self.waiting += 1
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="The roadmap generator is busy. Please try again shortly.",
+                headers={"Retry-After": str(self._retry_after_for_queue())},
+            )
+        finally:
+            self.waiting -= 1
+            waited = time.monotonic() - queued_at
+            self.waits += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def _bucket(self, user_id: str) -> _TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_TRACKED_USERS:
+                # Full buckets carry no state worth keeping
+                for uid in [u for u, b in self._buckets.items() if b.is_full()]:
+                    del self._buckets[uid]
+            bucket = _TokenBucket(self.user_burst, self.user_rate)
+            self._buckets[user_id] = bucket
+        return bucket
+
+    def _retry_after_for_queue(self) -> int:
+        # Time for the queue ahead of us to drain through the available slots
+        estimate = self._avg_hold_seconds * (self.waiting + 1) / max(self.max_concurrency, 1)
+        return max(1, math.ceil(estimate))
+
+    def _reject_user(self, bucket: _TokenBucket) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="You are generating roadmaps too quickly. Please wait a moment.",
+            headers={"Retry-After": str(max(1, math.ceil(bucket.seconds_until_token())))},
+        )
+
+    def _reject_queue_full(self) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="The roadmap generator is busy. Please try again shortly.",
+            headers={"Retry-After": str(self._retry_after_for_queue())},
+        )
+
+
+@lru_cache()
+def get_llm_governor() -> LLMGovernor:
+    """Process-wide LLM governor — created once, shared by every request."""
+    settings = get_settings()
+    return LLMGovernor(
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_queue=settings.LLM_MAX_QUEUE,
+        queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+        user_rate_per_minute=settings.LLM_USER_RATE_PER_MINUTE,
+        user_burst=settings.LLM_USER_BURST,
+    )
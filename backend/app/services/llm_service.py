@@ -1,8 +1,17 @@
+import asyncio
 import json
+import uuid
+from contextlib import aclosing
 import httpx
 from fastapi import HTTPException, status
 from app.config import get_settings
-from app.supabase_client import supabase
+from app.supabase_client import supabase, execute
+from app.services.gemini_policy import GeminiCallError, get_gemini_policy
+from app.services.llm_governor import get_llm_governor
+from app.services.project_tree_cache import get_project_tree_cache
+from app.services.resource_versions import get_resource_versions
+from app.services.roadmap_cache import RoadmapCache, get_roadmap_cache
+from app.services.roadmap_stream_parser import ModuleStreamParser
 from datetime import datetime
 
 class LLMService:
@@ -13,7 +22,7 @@ class LLMService:
     """
 
     @staticmethod
-    def _build_prompt(
+    def _project_brief(
         description: str,
         tech_stack: list[str],
         planning_mode: str,
@@ -23,8 +32,8 @@ class LLMService:
         preferred_pace: str | None,
     ) -> str:
         """
-        Build the structured prompt that tells the LLM exactly what to generate.
-        The prompt asks for a JSON response containing modules and tasks.
+        The project / developer / scheduling part of every generation prompt
+        (the monolithic one and both phases of the fan-out).
         """
 
         tech_str = ", ".join(tech_stack) if tech_stack else "Not specified"
@@ -49,10 +58,7 @@ class LLMService:
                                     - Assign estimated start_date and end_date for each module relative to today.
                                     - Assign deadline for each task based on estimated effort.
                                     """
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        prompt = f"""You are an expert software product manager. Create a detailed project roadmap.
-
-                PROJECT DESCRIPTION:
+        return f"""PROJECT DESCRIPTION:
                 {description}
 
                 TECH STACK: {tech_str}
@@ -61,7 +67,18 @@ class LLMService:
                 WORKING HOURS PER DAY: {working_hours_per_day}
                 PLANNING MODE: {planning_mode}
 
-                {deadline_instruction}
+                {deadline_instruction}"""
+
+    @staticmethod
+    def _build_prompt(brief: str) -> str:
+        """
+        Build the structured prompt that tells the LLM exactly what to generate.
+        The prompt asks for a JSON response containing modules and tasks.
+        """
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        prompt = f"""You are an expert software product manager. Create a detailed project roadmap.
+
+                {brief}
 
                 RESPOND WITH ONLY VALID JSON in this exact format (no markdown, no explanation):
                 {{
@@ -97,6 +114,82 @@ class LLMService:
                 """
         return prompt
 
+    @staticmethod
+    def _build_outline_prompt(brief: str) -> str:
+        """
+        Fan-out phase 1: only the modules (no tasks), so the response is a
+        few hundred tokens and the user sees the plan's shape quickly.
+        """
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        return f"""You are an expert software product manager. Outline a project roadmap.
+
+                {brief}
+
+                Only outline the modules now; their tasks are planned separately afterwards.
+
+                RESPOND WITH ONLY VALID JSON in this exact format (no markdown, no explanation):
+                {{
+                "modules": [
+                    {{
+                    "title": "Module Name",
+                    "description": "What this module covers",
+                    "order_index": 0,
+                    "estimated_days": 3,
+                    "start_date": "YYYY-MM-DD",
+                    "end_date": "YYYY-MM-DD"
+                    }}
+                ]
+                }}
+
+                Rules:
+                - Break the project into 3-8 high-level modules.
+                - Dates must be realistic and sequential (no overlapping modules unless independent).
+                - Order modules by dependency (do prerequisites first).
+                - Today is {current_date}.
+                """
+
+    @staticmethod
+    def _build_module_tasks_prompt(brief: str, outline: list[dict], module: dict) -> str:
+        """
+        Fan-out phase 2: the tasks of one module. The whole outline is
+        included so tasks don't drift into what other modules cover.
+        """
+        outline_str = "\n".join(
+            f"                {m.get('order_index')}. {m.get('title')} "
+            f"({m.get('start_date')} → {m.get('end_date')}): {m.get('description', '')}"
+            for m in outline
+        )
+        return f"""You are an expert software product manager. Plan the tasks of one module of a project roadmap.
+
+                {brief}
+
+                ROADMAP OUTLINE:
+{outline_str}
+
+                MODULE TO PLAN: {module.get('order_index')}. {module.get('title')}
+                {module.get('description', '')}
+                Runs from {module.get('start_date')} to {module.get('end_date')} ({module.get('estimated_days')} days).
+
+                RESPOND WITH ONLY VALID JSON in this exact format (no markdown, no explanation):
+                {{
+                "tasks": [
+                    {{
+                    "title": "Task Name",
+                    "description": "What to do",
+                    "order_index": 0,
+                    "estimated_hours": 4,
+                    "deadline": "YYYY-MM-DD"
+                    }}
+                ]
+                }}
+
+                Rules:
+                - 2-6 tasks, only for this module (the other modules are planned separately).
+                - Tasks should be actionable and specific.
+                - Every deadline must fall between the module's start and end date.
+                - estimated_hours should reflect the developer's skill level.
+                """
+
     @staticmethod
     async def generate_roadmap(
         description: str,
@@ -106,10 +199,17 @@ class LLMService:
         working_hours_per_day: float,
         skill_level: str | None,
         preferred_pace: str | None,
+        user_id: str | None = None,
     ) -> dict:
         """
         Call Google Gemini API with the structured prompt.
         Returns parsed JSON with modules and tasks.
+
+        The call goes through the LLM governor (global concurrency + per-user
+        rate); if it can't be admitted a 429 with Retry-After is raised.
+
+        With ROADMAP_FANOUT_ENABLED the roadmap is generated in two phases
+        instead (see _generate_fanout).
         """
         settings = get_settings()
 
@@ -119,7 +219,25 @@ class LLMService:
                 detail="GEMINI_API_KEY is not configured.",
             )
 
-        prompt = LLMService._build_prompt(
+        # Identical inputs → reuse an earlier generation (dates rebased to today)
+        cache = get_roadmap_cache() if settings.ROADMAP_CACHE_ENABLED else None
+        cache_key = None
+        if cache is not None:
+            cache_key = RoadmapCache.make_key(
+                model=settings.LLM_MODEL,
+                description=description,
+                tech_stack=tech_stack,
+                planning_mode=planning_mode,
+                deadline_date=deadline_date,
+                working_hours_per_day=working_hours_per_day,
+                skill_level=skill_level,
+                preferred_pace=preferred_pace,
+            )
+            cached = await cache.get(cache_key, deadline_date=deadline_date)
+            if cached is not None:
+                return cached
+
+        brief = LLMService._project_brief(
             description=description,
             tech_stack=tech_stack,
             planning_mode=planning_mode,
@@ -129,9 +247,35 @@ class LLMService:
             preferred_pace=preferred_pace,
         )
 
-        # Google Gemini REST API endpoint
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{settings.LLM_MODEL}:generateContent?key={settings.GEMINI_API_KEY}"
+        if settings.ROADMAP_FANOUT_ENABLED:
+            models: list[str] = []
+            modules = []
+            async with aclosing(LLMService._generate_fanout(brief, user_id, models)) as events:
+                async for event_type, event_data in events:
+                    if event_type == "module":
+                        modules.append(event_data)
+            roadmap = {"modules": sorted(modules, key=lambda m: m["order_index"])}
+        else:
+            async with get_llm_governor().slot(user_id):
+                roadmap, model = await LLMService._request_json(
+                    LLMService._build_prompt(brief), max_output_tokens=20000
+                )
+            models = [model]
+
+        # Only cache what the requested model produced
+        if cache is not None and all(model == settings.LLM_MODEL for model in models):
+            await cache.set(cache_key, roadmap)
 
+        return roadmap
+
+    @staticmethod
+    async def _request_json(prompt: str, max_output_tokens: int) -> tuple[dict, str]:
+        """
+        One non-streamed Gemini call that must answer with a JSON object.
+        Returns the parsed object and the model that produced it; failures
+        are raised as HTTPExceptions (502/504). The caller holds the LLM
+        governor slot.
+        """
         payload = {
             "contents": [
                 {
@@ -143,19 +287,15 @@ class LLMService:
             "generationConfig": {
                 "temperature": 0.7,
                 "responseMimeType": "application/json",
-                "maxOutputTokens": 20000, 
+                "maxOutputTokens": max_output_tokens,
             },
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, json=payload)
-
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"Gemini API error: {response.status_code} — {response.text}",
-                    )
+            # Google Gemini REST API (generateContent) — retried with backoff,
+            # optionally hedged, and moved to LLM_FALLBACK_MODEL if needed
+            async with get_gemini_policy().call("generateContent", payload) as (response, model):
+                await response.aread()
 
                 data = response.json()
 
@@ -163,10 +303,13 @@ class LLMService:
                 text_content = data["candidates"][0]["content"]["parts"][0]["text"]
 
                 # Parse the JSON from the LLM response
-                roadmap = json.loads(text_content)
-
-                return roadmap
+                return json.loads(text_content), model
 
+        except GeminiCallError as e:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=str(e),
+            )
         except json.JSONDecodeError as e:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -183,6 +326,74 @@ class LLMService:
                 detail=f"Unexpected Gemini response structure: {str(e)}",
             )
 
+    @staticmethod
+    async def _generate_fanout(brief: str, user_id: str | None, models: list[str]):
+        """
+        Two-phase generation. Yields:
+          ("outline", modules) — the modules without tasks, once
+          ("module", module)   — a module with its tasks, in completion order
+
+        Phase 1 asks for the module outline only (small, fast). Phase 2
+        expands every module's tasks in its own call, at most
+        ROADMAP_FANOUT_CONCURRENCY at a time, so the task output is produced
+        in parallel instead of one token after another.
+
+        The whole generation is one governor admission (one slot, one queue
+        position, one token of the user's rate), held until the last
+        expansion is done; the expansions run inside it and can't be
+        rejected half-way. LLM_MAX_CONCURRENCY counts generations, so with
+        fan-out up to LLM_MAX_CONCURRENCY × ROADMAP_FANOUT_CONCURRENCY Gemini
+        calls can be in flight.
+
+        Raises HTTPException on failure; closing the generator early cancels
+        the expansions still running. The model of each call is appended to
+        `models`.
+        """
+        async with get_llm_governor().slot(user_id):
+            outline, model = await LLMService._request_json(
+                LLMService._build_outline_prompt(brief), max_output_tokens=4096
+            )
+            models.append(model)
+
+            modules = [m for m in outline.get("modules") or [] if isinstance(m, dict)]
+            if not modules:
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="LLM returned an empty roadmap outline.",
+                )
+            for i, module in enumerate(modules):
+                module.pop("tasks", None)
+                if not isinstance(module.get("order_index"), int):
+                    module["order_index"] = i
+            yield ("outline", modules)
+
+            limit = asyncio.Semaphore(max(1, get_settings().ROADMAP_FANOUT_CONCURRENCY))
+
+            async def expand(module: dict) -> dict:
+                async with limit:
+                    result, model = await LLMService._request_json(
+                        LLMService._build_module_tasks_prompt(brief, modules, module),
+                        max_output_tokens=8192,
+                    )
+                models.append(model)
+                tasks = result.get("tasks")
+                if not isinstance(tasks, list):
+                    raise HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY,
+                        detail=f"LLM returned no tasks for module '{module.get('title')}'.",
+                    )
+                return {**module, "tasks": tasks}
+
+            expansions = [asyncio.create_task(expand(module)) for module in modules]
+            try:
+                for expansion in asyncio.as_completed(expansions):
+                    yield ("module", await expansion)
+            finally:
+                # First failure (or the consumer leaving) ends the generation
+                for expansion in expansions:
+                    expansion.cancel()
+                await asyncio.gather(*expansions, return_exceptions=True)
+
     @staticmethod
     async def generate_roadmap_stream(
         description: str,
@@ -192,14 +403,20 @@ class LLMService:
         working_hours_per_day: float,
         skill_level: str | None,
         preferred_pace: str | None,
+        user_id: str | None = None,
     ):
         """
         Streaming version of generate_roadmap.
         Yields (event_type, data) tuples:
           ("status", "message")  — progress messages
           ("chunk", "text")      — raw LLM text chunks
+          ("module", module)     — a module (with its tasks) as soon as its JSON closes
           ("done", roadmap_dict) — final parsed roadmap
           ("error", "message")   — error occurred
+
+        With ROADMAP_FANOUT_ENABLED there are no chunks: an ("outline",
+        modules) event comes first and each module follows once its tasks
+        have been generated (see _generate_fanout).
         """
         settings = get_settings()
 
@@ -209,7 +426,7 @@ class LLMService:
 
         yield ("status", "⚡ Building AI prompt...")
 
-        prompt = LLMService._build_prompt(
+        brief = LLMService._project_brief(
             description=description,
             tech_stack=tech_stack,
             planning_mode=planning_mode,
@@ -219,8 +436,13 @@ class LLMService:
             preferred_pace=preferred_pace,
         )
 
-        # Use streamGenerateContent instead of generateContent
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{settings.LLM_MODEL}:streamGenerateContent?alt=sse&key={settings.GEMINI_API_KEY}"
+        if settings.ROADMAP_FANOUT_ENABLED:
+            async with aclosing(LLMService._stream_fanout(brief, user_id)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        prompt = LLMService._build_prompt(brief)
 
         payload = {
             "contents": [
@@ -239,33 +461,45 @@ class LLMService:
 
         yield ("status", "🧠 Streaming from Gemini API...")
 
-        full_text = ""
+        # Fragments are collected in a list and joined once at the end;
+        # the parser picks completed modules out of the stream as it goes.
+        text_parts: list[str] = []
+        parser = ModuleStreamParser()
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client: # here backend is the client for llms server
-                async with client.stream("POST", url, json=payload) as response: # here response is from llms server
-                    if response.status_code != 200:
-                        error_body = await response.aread()
-                        yield ("error", f"Gemini API error: {response.status_code} — {error_body.decode()}")
-                        return
-
-                    async for line in response.aiter_lines():
-                        # SSE format: lines starting with "data: " contain JSON
-                        if line.startswith("data: "):
-                            json_str = line[6:]  # strip "data: " prefix
-                            try:
-                                chunk_data = json.loads(json_str)
-                                candidates = chunk_data.get("candidates", [])
-                                if candidates:
-                                    parts = candidates[0].get("content", {}).get("parts", [])
-                                    for part in parts:
-                                        text = part.get("text", "")
-                                        if text:
-                                            full_text += text
-                                            yield ("chunk", text) # here we are sending the chunk to the frontend
-                            except json.JSONDecodeError:
-                                continue
-
+            # Use streamGenerateContent instead of generateContent.
+            # Shared pooled client: the backend is the client for the LLM server.
+            # Retries/hedging/fallback all happen before the first chunk is
+            # yielded; the governor slot is held for the whole stream.
+            async with get_llm_governor().slot(user_id), get_gemini_policy().call(
+                "streamGenerateContent", payload, params={"alt": "sse"}
+            ) as (response, _model): # here response is from llms server
+                async for line in response.aiter_lines():
+                    # SSE format: lines starting with "data: " contain JSON
+                    if line.startswith("data: "):
+                        json_str = line[6:]  # strip "data: " prefix
+                        try:
+                            chunk_data = json.loads(json_str)
+                            candidates = chunk_data.get("candidates", [])
+                            if candidates:
+                                parts = candidates[0].get("content", {}).get("parts", [])
+                                for part in parts:
+                                    text = part.get("text", "")
+                                    if text:
+                                        text_parts.append(text)
+                                        yield ("chunk", text) # here we are sending the chunk to the frontend
+                                        for module in parser.feed(text):
+                                            yield ("module", module)
+                        except json.JSONDecodeError:
+                            continue
+
+        except HTTPException as e:
+            # Rejected by the LLM governor (429)
+            yield ("error", e.detail)
+            return
+        except GeminiCallError as e:
+            yield ("error", str(e))
+            return
         except httpx.TimeoutException:
             yield ("error", "LLM request timed out. Try again.")
             return
@@ -277,7 +511,7 @@ class LLMService:
         yield ("status", "📋 Parsing roadmap...")
 
         try:
-            roadmap = json.loads(full_text)
+            roadmap = json.loads("".join(text_parts))
         except json.JSONDecodeError as e:
             yield ("error", f"LLM returned invalid JSON: {str(e)}")
             return
@@ -285,20 +519,43 @@ class LLMService:
         yield ("done", roadmap)
 
     @staticmethod
-    async def save_roadmap_to_db(
-        project_id: str,
-        roadmap: dict,
-    ) -> list[dict]:
+    async def _stream_fanout(brief: str, user_id: str | None):
+        """generate_roadmap_stream's events for a two-phase generation."""
+        yield ("status", "🧭 Outlining modules...")
+
+        modules = []
+        try:
+            async with aclosing(LLMService._generate_fanout(brief, user_id, [])) as events:
+                async for event_type, event_data in events:
+                    if event_type == "outline":
+                        yield ("outline", event_data)
+                        yield ("status", f"🧠 Planning tasks for {len(event_data)} modules in parallel...")
+                    else:
+                        modules.append(event_data)
+                        yield ("module", event_data)
+        except HTTPException as e:
+            yield ("error", e.detail)
+            return
+        except Exception as e:
+            yield ("error", f"Generation failed: {str(e)}")
+            return
+
+        yield ("done", {"modules": sorted(modules, key=lambda m: m["order_index"])})
+
+    @staticmethod
+    def _build_roadmap_rows(project_id: str, roadmap: dict) -> tuple[list[dict], list[dict]]:
         """
-        Take the parsed LLM roadmap and insert modules + tasks into Supabase.
-        Returns the list of created modules (with their tasks).
+        Flatten the LLM roadmap into insert-ready module and task rows.
+        Module ids are generated here so tasks can reference their module
+        without waiting for the module insert to come back.
         """
-        modules_data = roadmap.get("modules", [])
-        created_modules = []
+        module_rows = []
+        task_rows = []
 
-        for module_data in modules_data:
-            # Insert module
-            module_insert = {
+        for module_data in roadmap.get("modules", []):
+            module_id = str(uuid.uuid4())
+            module_rows.append({
+                "id": module_id,
                 "project_id": project_id,
                 "title": module_data["title"],
                 "description": module_data.get("description", ""),
@@ -307,20 +564,11 @@ class LLMService:
                 "start_date": module_data.get("start_date"),
                 "end_date": module_data.get("end_date"),
                 "status": "pending",
-            }
-
-            module_response = (
-                supabase.table("modules").insert(module_insert).execute()
-            )
-            module = module_response.data[0]
+            })
 
-            # Insert tasks for this module
-            tasks = module_data.get("tasks", [])
-            created_tasks = []
-
-            for task_data in tasks:
-                task_insert = {
-                    "module_id": module["id"],
+            for task_data in module_data.get("tasks", []):
+                task_rows.append({
+                    "module_id": module_id,
                     "project_id": project_id,
                     "title": task_data["title"],
                     "description": task_data.get("description", ""),
@@ -328,14 +576,177 @@ class LLMService:
                     "estimated_hours": task_data.get("estimated_hours"),
                     "deadline": task_data.get("deadline"),
                     "status": "pending",
-                }
+                })
+
+        return module_rows, task_rows
+
+    @staticmethod
+    def _nest_tasks(modules: list[dict], tasks: list[dict]) -> list[dict]:
+        """Attach each task to its module (tasks keep their insert order)."""
+        tasks_by_module = {}
+        for task in tasks:
+            tasks_by_module.setdefault(task["module_id"], []).append(task)
+
+        for module in modules:
+            module["tasks"] = tasks_by_module.get(module["id"], [])
+        return modules
+
+    @staticmethod
+    async def save_roadmap_to_db(
+        project_id: str,
+        roadmap: dict,
+    ) -> list[dict]:
+        """
+        Take the parsed LLM roadmap and insert modules + tasks into Supabase,
+        then store the raw response and mark the project active.
+        Returns the list of created modules (with their tasks).
 
-                task_response = (
-                    supabase.table("tasks").insert(task_insert).execute()
+        With ROADMAP_SAVE_RPC enabled everything happens in one transactional
+        call to the `save_roadmap` function (backend/sql/save_roadmap.sql).
+        Otherwise all modules go out in one bulk insert and all tasks in a
+        second one; if any step fails the inserted rows are deleted again,
+        so a roadmap is never left half-saved.
+        """
+        module_rows, task_rows = LLMService._build_roadmap_rows(project_id, roadmap)
+
+        if get_settings().ROADMAP_SAVE_RPC:
+            response = await execute(
+                supabase.rpc(
+                    "save_roadmap",
+                    {
+                        "p_project_id": project_id,
+                        "p_roadmap": roadmap,
+                        "p_modules": module_rows,
+                        "p_tasks": task_rows,
+                    },
                 )
-                created_tasks.append(task_response.data[0])
+            )
+            return response.data or []
+
+        modules, tasks = await LLMService._insert_rows(module_rows, task_rows)
+        try:
+            await LLMService.mark_roadmap_saved(project_id, roadmap)
+        except Exception:
+            await LLMService.delete_modules(project_id, [m["id"] for m in module_rows])
+            raise
 
-            module["tasks"] = created_tasks
-            created_modules.append(module)
+        return LLMService._nest_tasks(modules, tasks)
+
+    @staticmethod
+    async def save_module_to_db(project_id: str, module_data: dict) -> dict:
+        """
+        Insert a single module and its tasks (one bulk insert each).
+        Used by the streaming pipeline to persist modules while the rest of
+        the roadmap is still being generated. Returns the module with tasks.
+        """
+        module_rows, task_rows = LLMService._build_roadmap_rows(
+            project_id, {"modules": [module_data]}
+        )
+        modules, tasks = await LLMService._insert_rows(module_rows, task_rows)
+        return LLMService._nest_tasks(modules, tasks)[0]
+
+    @staticmethod
+    async def finish_streamed_save(project_id: str, roadmap: dict, pending: list) -> None:
+        """
+        Complete a roadmap whose modules were saved one by one while streaming.
+
+        `pending` holds the save_module_to_db tasks started for each streamed
+        module. If any of them failed the saved ones are removed and the error
+        is raised; if the parser missed a module (counts differ) the streamed
+        saves are replaced by a regular bulk save of the full roadmap.
+        """
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        saved_ids = [r["id"] for r in results if isinstance(r, dict)]
+        failed = [r for r in results if isinstance(r, BaseException)]
+
+        if failed:
+            await LLMService.delete_modules(project_id, saved_ids)
+            raise failed[0]
+
+        if len(saved_ids) != len(roadmap.get("modules", [])):
+            await LLMService.delete_modules(project_id, saved_ids)
+            await LLMService.save_roadmap_to_db(project_id=project_id, roadmap=roadmap)
+            return
+
+        try:
+            await LLMService.mark_roadmap_saved(project_id, roadmap)
+        except Exception:
+            await LLMService.delete_modules(project_id, saved_ids)
+            raise
 
-        return created_modules
+    @staticmethod
+    async def discard_streamed_modules(project_id: str, pending: list) -> None:
+        """Wait for in-flight module saves and delete whatever they wrote."""
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        await LLMService.delete_modules(project_id, [r["id"] for r in results if isinstance(r, dict)])
+
+    @staticmethod
+    async def mark_roadmap_saved(project_id: str, roadmap: dict) -> None:
+        """Store the raw LLM response and mark the project active."""
+        await execute(
+            supabase.table("projects")
+            .update({"llm_raw_response": roadmap, "status": "active"})
+            .eq("id", project_id)
+        )
+
+    @staticmethod
+    async def delete_modules(project_id: str, module_ids: list[str]) -> None:
+        """
+        Best-effort removal of modules (and their tasks) after a failed save.
+        The project's cached tree and ETags are invalidated as for any write.
+        """
+        if not module_ids:
+            return
+        try:
+            await execute(supabase.table("tasks").delete().in_("module_id", module_ids))
+            await execute(supabase.table("modules").delete().in_("id", module_ids))
+        except Exception:
+            pass
+        await LLMService._record_removal(project_id)
+
+    @staticmethod
+    async def _record_removal(project_id: str) -> None:
+        """
+        ProjectService.touch() for rows removed here, where the owner isn't
+        passed in: bumps the project's version and its owner's (deadlines /
+        list) and drops the cached tree. Best-effort, like the delete.
+        """
+        tree_cache = get_project_tree_cache()
+        tree_cache.evict(project_id)
+
+        owner_id = tree_cache.owner_of(project_id)
+        if owner_id is None:
+            try:
+                rows = (await execute(
+                    supabase.table("projects").select("user_id").eq("id", project_id)
+                )).data
+                owner_id = rows[0]["user_id"] if rows else None
+            except Exception:
+                owner_id = None
+
+        versions = get_resource_versions()
+        keys = [versions.project_key(project_id)]
+        if owner_id is not None:
+            keys.append(versions.user_key(owner_id))
+        await versions.bump(*keys)
+
+    @staticmethod
+    async def _insert_rows(module_rows: list[dict], task_rows: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Bulk-insert modules, then tasks. If the task insert fails the
+        modules are deleted again before the error is re-raised.
+        """
+        modules = []
+        tasks = []
+
+        if module_rows:
+            modules = (await execute(supabase.table("modules").insert(module_rows))).data
+        try:
+            if task_rows:
+                tasks = (await execute(supabase.table("tasks").insert(task_rows))).data
+        except Exception:
+            # Compensate: remove whatever part of the roadmap made it in
+            await LLMService.delete_modules(module_rows[0]["project_id"], [m["id"] for m in module_rows])
+            raise
+
+        return modules, tasks
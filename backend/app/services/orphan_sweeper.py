@@ -0,0 +1,82 @@
+import asyncio
+import random
+import time
+from functools import lru_cache
+from app.config import get_settings
+from app.services.project_service import ProjectService
+
+
+class OrphanSweeper:
+    """
+    Background cleanup of abandoned generations.
+
+    A roadmap stream cancelled because its client went away marks its
+    project 'abandoned' (see SSEStreamer / create_project_stream). Every
+    `interval` seconds this deletes the abandoned projects older than
+    `retention`, including those whose immediate cleanup failed. A
+    generation lost to a worker restart leaves its row 'planning'; that
+    row is not swept, since nothing tells it apart from a live one.
+
+    Every worker runs its own sweeper. The delete is idempotent and keyed
+    on age, not on in-process state, so concurrent sweeps are harmless;
+    the interval is jittered so workers don't all sweep at once.
+    """
+
+    JITTER = 0.2  # ± fraction of the interval
+
+    def __init__(self, interval: float, retention: float):
+        self.interval = interval
+        self.retention = retention
+        self._task: asyncio.Task | None = None
+
+        self.runs = 0
+        self.purged = 0
+        self.failures = 0
+        self.last_run_at: float | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="orphan-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sweep(self) -> int:
+        """One pass; returns the number of projects deleted."""
+        self.runs += 1
+        self.last_run_at = time.time()
+        purged = await ProjectService.purge_abandoned_projects(self.retention)
+        self.purged += purged
+        return purged
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "purged": self.purged,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "interval_seconds": self.interval,
+            "retention_seconds": self.retention,
+        }
+
+    # ── Internals ────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.failures += 1
+                print(f"Orphan sweep failed: {e}")
+            await asyncio.sleep(self.interval * random.uniform(1 - self.JITTER, 1 + self.JITTER))
+
+
+@lru_cache()
+def get_orphan_sweeper() -> OrphanSweeper:
+    """Process-wide orphan sweeper — created once, started with the app."""
+    settings = get_settings()
+    return OrphanSweeper(
+        interval=settings.ORPHAN_SWEEP_INTERVAL_SECONDS,
+        retention=settings.ABANDONED_PROJECT_RETENTION_SECONDS,
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from app.config import get_settings
+from app.supabase_client import supabase, execute
+
+
+class ProfileCache:
+    """
+    Per-user cache of `profiles` rows, keyed by user id.
+
+    - Bounded LRU; entries expire after `ttl` seconds so changes made
+      outside this process (other workers, the dashboard) show up eventually.
+    - Concurrent misses for the same user share one database read.
+    - Writes go through `put()` / `invalidate()`: AuthService.update_profile
+      stores the updated row, so this process never serves a stale profile
+      after its own writes.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # user_id → (expires_at, row)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ── Public API ───────────────────────────────────
+    async def get(self, user_id: str) -> dict | None:
+        """Return the user's full profile row (None if there is none)."""
+        cached = self._entries.get(user_id)
+        if cached is not None:
+            expires_at, row = cached
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return dict(row)
+            del self._entries[user_id]
+
+        self.misses += 1
+        future = self._inflight.get(user_id)
+        if future is None:
+            future = asyncio.ensure_future(self._load(user_id))
+            self._inflight[user_id] = future
+        row = await asyncio.shield(future)
+        return dict(row) if row is not None else None
+
+    def put(self, user_id: str, row: dict) -> None:
+        """Write-through: store a freshly written row."""
+        self._inflight.pop(user_id, None)  # an older read must not overwrite it
+        self._store(user_id, row)
+
+    def invalidate(self, user_id: str) -> None:
+        self._inflight.pop(user_id, None)
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ── Internals ────────────────────────────────────
+    async def _load(self, user_id: str) -> dict | None:
+        future = self._inflight.get(user_id)
+        try:
+            response = await execute(
+                supabase.table("profiles")
+                .select("*")
+                .eq("id", user_id)
+                .maybe_single()
+            )
+            row = response.data if response is not None else None
+            # Only cache if nobody wrote/invalidated the row meanwhile
+            if row is not None and self._inflight.get(user_id) is future:
+                self._store(user_id, row)
+            return row
+        finally:
+            if self._inflight.get(user_id) is future:
+                del self._inflight[user_id]
+
+    def _store(self, user_id: str, row: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl, dict(row))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@lru_cache()
+def get_profile_cache() -> ProfileCache:
+    """Process-wide profile cache — created once, shared by every request."""
+    settings = get_settings()
+    return ProfileCache(
+        max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+        ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+    )
@@ -1,8 +1,20 @@
 from fastapi import HTTPException, status
-from app.supabase_client import supabase
-from app.schemas.project import CreateProjectRequest
+from app.supabase_client import supabase, execute
+from app.config import get_settings
+from app.schemas.project import CreateProjectRequest, ProjectResponse
 from app.services.llm_service import LLMService
-from datetime import date
+from app.services.profile_cache import get_profile_cache
+from app.services.project_tree_cache import get_project_tree_cache
+from app.services.resource_versions import ResourceVersions, get_resource_versions
+from app.services.job_backends import Job
+from app.services.job_queue import ProgressReporter
+from datetime import date, datetime, timedelta, timezone
+import asyncio
+import base64
+import json
+
+# Columns needed for the project list — everything ProjectResponse shows
+PROJECT_SUMMARY_COLUMNS = ",".join(ProjectResponse.model_fields)
 
 
 class ProjectService:
@@ -11,18 +23,10 @@ class ProjectService:
     CRUD operations on projects, modules, and tasks via Supabase.
     """
 
-    # ── Create Project + Generate Roadmap ────────────
+    # ── Validate Create Request ──────────────────────
     @staticmethod
-    async def create_project(user_id: str, data: CreateProjectRequest, user_profile: dict) -> dict:
-        """
-        1. Validate inputs (deadline mode must have deadline_date)
-        2. Insert project into Supabase
-        3. Call LLM to generate roadmap
-        4. Save modules + tasks to Supabase
-        5. Return the full project with roadmap
-        """
-
-        # Validate deadline mode
+    def validate_create_request(data: CreateProjectRequest) -> None:
+        """Deadline mode must have a deadline_date, and it must be in the future."""
         if data.planning_mode == "deadline" and not data.deadline_date:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -36,7 +40,26 @@ class ProjectService:
                     detail="deadline_date must be in the future.",
                 )
 
-        # Insert project
+    # ── Profile for Roadmap Generation ───────────────
+    @staticmethod
+    async def get_generation_profile(user_id: str) -> dict:
+        """Fetch skill_level and preferred_pace for the prompt ({} if unavailable)."""
+        try:
+            profile = await get_profile_cache().get(user_id) or {}
+        except Exception:
+            return {}
+        return {
+            "skill_level": profile.get("skill_level"),
+            "preferred_pace": profile.get("preferred_pace"),
+        }
+
+    # ── Insert Project Row ───────────────────────────
+    @staticmethod
+    async def insert_project(user_id: str, data: CreateProjectRequest, project_id: str | None = None) -> dict:
+        """
+        Insert the project row (status 'planning', no roadmap yet).
+        `project_id` lets the caller hand out the id before the row exists.
+        """
         project_insert = {
             "user_id": user_id,
             "title": data.title,
@@ -47,21 +70,51 @@ class ProjectService:
             "working_hours_per_day": data.working_hours_per_day,
             "status": "planning",
         }
+        if project_id is not None:
+            project_insert["id"] = project_id
 
         try:
-            project_response = (
-                supabase.table("projects").insert(project_insert).execute()
-            )
+            project_response = await execute(supabase.table("projects").insert(project_insert))
             project = project_response.data[0]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to create project: {str(e)}",
             )
- 
-        # Generate roadmap via LLM
-        try:
-            roadmap = await LLMService.generate_roadmap(
+
+        await ProjectService.touch(user_id)
+        return project
+
+    # ── Create Project + Generate Roadmap ────────────
+    @staticmethod
+    async def create_project(
+        user_id: str,
+        data: CreateProjectRequest,
+        on_progress: ProgressReporter | None = None,
+    ) -> dict:
+        """
+        1. Validate inputs (deadline mode must have deadline_date)
+        2. Insert project into Supabase, while
+        3. fetching the user's profile and calling the LLM to generate the roadmap
+        4. Save modules + tasks to Supabase
+        5. Return the full project with roadmap
+
+        The insert doesn't gate the LLM call: only the profile (needed for
+        the prompt) does. If the insert fails the generation is cancelled;
+        if the generation fails the project row is still there (no roadmap),
+        as before, and the user can retry.
+
+        `on_progress(percent, stage)` is called between steps when the
+        project is created by a background job.
+        """
+
+        async def report(progress: int, stage: str) -> None:
+            if on_progress is not None:
+                await on_progress(progress, stage)
+
+        async def generate() -> dict:
+            user_profile = await ProjectService.get_generation_profile(user_id)
+            return await LLMService.generate_roadmap(
                 description=data.description,
                 tech_stack=data.tech_stack,
                 planning_mode=data.planning_mode,
@@ -69,106 +122,175 @@ class ProjectService:
                 working_hours_per_day=data.working_hours_per_day,
                 skill_level=user_profile.get("skill_level"),
                 preferred_pace=user_profile.get("preferred_pace"),
+                user_id=user_id,
             )
 
-            # Store raw LLM response for future reference
-            supabase.table("projects").update(
-                {"llm_raw_response": roadmap, "status": "active"}
-            ).eq("id", project["id"]).execute()
+        ProjectService.validate_create_request(data)
 
-            # Save modules + tasks into DB
-            modules = await LLMService.save_roadmap_to_db(
-                project_id=project["id"],
-                roadmap=roadmap,
-            )
+        await report(5, "Generating roadmap")
 
-            project["modules"] = modules
-            project["status"] = "active"
+        insert_task = asyncio.create_task(ProjectService.insert_project(user_id, data))
+        generate_task = asyncio.create_task(generate())
+        try:
+            await asyncio.wait({insert_task, generate_task}, return_when=asyncio.FIRST_EXCEPTION)
+            project = await insert_task
 
-        except HTTPException:
-            # If LLM fails, project exists but has no roadmap — user can retry
-            raise
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Roadmap generation failed: {str(e)}",
-            )
+            try:
+                roadmap = await generate_task
+
+                await report(80, "Saving roadmap")
+
+                # Save modules + tasks into DB (also stores the raw LLM
+                # response and marks the project active)
+                modules = await LLMService.save_roadmap_to_db(
+                    project_id=project["id"],
+                    roadmap=roadmap,
+                )
+
+                project["modules"] = modules
+                project["status"] = "active"
+                await ProjectService.touch(user_id, project["id"])
+
+            except HTTPException:
+                # If LLM fails, project exists but has no roadmap — user can retry
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Roadmap generation failed: {str(e)}",
+                )
+        finally:
+            generate_task.cancel()  # no-op unless the insert failed (or we were cancelled)
 
         return project
 
+    # ── Background Job: Create Project ───────────────
+    @staticmethod
+    async def run_create_project_job(job: Job, report: ProgressReporter) -> dict:
+        """Job handler for `create_project` jobs submitted by POST /api/projects."""
+        data = CreateProjectRequest(**job.payload["data"])
+        project = await ProjectService.create_project(
+            user_id=job.user_id,
+            data=data,
+            on_progress=report,
+        )
+        return {"project_id": project["id"]}
+
     # ── List Projects ────────────────────────────────
     @staticmethod
-    def get_projects(user_id: str) -> list[dict]:
-        """Get all projects for a user (no modules/tasks, just summaries)."""
+    async def get_projects(
+        user_id: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        One page of project summaries (no modules/tasks), newest first.
+
+        Only the ProjectResponse columns are selected (never llm_raw_response).
+        Pagination is keyset-based on (created_at, id): `cursor` is the
+        opaque value returned with the previous page. Returns
+        (projects, next_cursor) — next_cursor is None on the last page.
+        """
+        settings = get_settings()
+        page_size = min(limit or settings.PROJECT_LIST_PAGE_SIZE, settings.PROJECT_LIST_MAX_PAGE_SIZE)
+
+        query = (
+            supabase.table("projects")
+            .select(PROJECT_SUMMARY_COLUMNS)
+            .eq("user_id", user_id)
+            .neq("status", "abandoned")
+        )
+        if cursor:
+            created_at, last_id = ProjectService._decode_cursor(cursor)
+            # Rows strictly after the cursor in (created_at desc, id desc) order
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt."{last_id}")'
+            )
+
         try:
-            response = (
-                supabase.table("projects")
-                .select("*")
-                .eq("user_id", user_id)
+            response = await execute(
+                query
                 .order("created_at", desc=True)
-                .execute()
+                .order("id", desc=True)
+                .limit(page_size + 1)  # one extra row tells us if there's a next page
             )
-            return response.data
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to fetch projects: {str(e)}",
             )
 
+        projects = response.data
+        if len(projects) <= page_size:
+            return projects, None
+
+        projects = projects[:page_size]
+        last = projects[-1]
+        return projects, ProjectService._encode_cursor(last["created_at"], last["id"])
+
+    @staticmethod
+    def _encode_cursor(created_at: str, project_id: str) -> str:
+        raw = json.dumps([created_at, project_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[str, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            decoded = json.loads(raw)
+            if not isinstance(decoded, list):
+                raise ValueError
+            created_at, project_id = decoded
+            if not isinstance(created_at, str) or not isinstance(project_id, str):
+                raise ValueError
+            # Values end up inside a PostgREST filter — reject anything odd
+            if '"' in created_at or '"' in project_id or "\\" in created_at + project_id:
+                raise ValueError
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor.",
+            )
+        return created_at, project_id
+
     # ── Get Project Detail ───────────────────────────
     @staticmethod
-    def get_project_detail(project_id: str, user_id: str) -> dict:
-        """Get a single project with all its modules and tasks."""
+    async def get_project_detail(project_id: str, user_id: str) -> dict:
+        """
+        Get a single project with all its modules and tasks.
+        Served from the project tree cache while the project is unchanged.
+        """
+        versions = get_resource_versions()
+        tree_cache = get_project_tree_cache()
+        # Read the version *before* the data (see ResourceVersions)
+        current = await versions.get(versions.project_key(project_id))
+        version = current[0] if current else None
+        if version is not None:
+            cached = tree_cache.get(project_id, user_id, version)
+            if cached is not None:
+                return cached
+
         try:
-            # Fetch project
-            project_response = (
+            # Project + modules + tasks in one round trip (embedded resources)
+            query = (
                 supabase.table("projects")
-                .select("*")
+                .select("*, modules(*, tasks(*))")
                 .eq("id", project_id)
                 .eq("user_id", user_id)
-                .single()
-                .execute()
             )
-            project = project_response.data
+            ProjectService._order_embedded(query, "modules", "modules.tasks")
+            project_response = await execute(query.maybe_single())
+
+            project = project_response.data if project_response is not None else None
             if not project:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Project not found.",
                 )
 
-            # Fetch modules
-            modules_response = (
-                supabase.table("modules")
-                .select("*")
-                .eq("project_id", project_id)
-                .order("order_index")
-                .execute()
-            )
-            modules = modules_response.data
-
-            # Fetch all tasks for this project
-            tasks_response = (
-                supabase.table("tasks")
-                .select("*")
-                .eq("project_id", project_id)
-                .order("order_index")
-                .execute()
-            )
-            all_tasks = tasks_response.data
-
-            # Group tasks by module_id
-            tasks_by_module = {}
-            for task in all_tasks:
-                mid = task["module_id"]
-                if mid not in tasks_by_module:
-                    tasks_by_module[mid] = []
-                tasks_by_module[mid].append(task)
-
-            # Attach tasks to their modules
-            for module in modules:
-                module["tasks"] = tasks_by_module.get(module["id"], [])
-
-            project["modules"] = modules
+            if version is not None:
+                tree_cache.put(project_id, user_id, version, project)
             return project
 
         except HTTPException:
@@ -179,119 +301,341 @@ class ProjectService:
                 detail=f"Failed to fetch project: {str(e)}",
             )
 
-    # ── Update Task Status ───────────────────────────
     @staticmethod
-    def update_task_status(task_id: str, project_id: str, user_id: str, new_status: str) -> dict:
-        """Update a single task's status. Verifies ownership via project_id."""
+    def _order_embedded(query, *embeds: str, column: str = "order_index") -> None:
+        """
+        Have PostgREST sort embedded rows (`<embed>.order=<column>`).
+
+        postgrest-py 0.17 (pinned through supabase==2.9.1) has no API for
+        this — order(foreign_table=...) emits `<embed>(<column>)`, the
+        to-one syntax — so the param goes onto the builder's `params`
+        directly. Re-check on upgrades; tests/test_project_detail.py pins
+        the URL it must produce.
+        """
+        for embed in embeds:
+            query.params = query.params.add(f"{embed}.order", column)
+
+    # ── Progress ─────────────────────────────────────
+    @staticmethod
+    async def get_progress(project_id: str, user_id: str) -> dict:
+        """
+        Task counts and hours done/remaining for a project and its modules.
+
+        With PROGRESS_COUNTERS the numbers come from the module_progress /
+        project_progress tables kept current by triggers on tasks
+        (backend/sql/progress_counters.sql) — no task rows are read.
+        Otherwise they are counted from the tasks' status/hours columns.
+        """
+        use_counters = get_settings().PROGRESS_COUNTERS
+        if use_counters:
+            columns = "id, status, project_progress(*), modules(id, title, order_index, status, module_progress(*))"
+        else:
+            columns = "id, status, modules(id, title, order_index, status, tasks(status, estimated_hours))"
+
+        query = (
+            supabase.table("projects")
+            .select(columns)
+            .eq("id", project_id)
+            .eq("user_id", user_id)
+        )
+        ProjectService._order_embedded(query, "modules")
+
         try:
-            # Verify the project belongs to the user
-            project_check = (
-                supabase.table("projects")
-                .select("id")
-                .eq("id", project_id)
-                .eq("user_id", user_id)
-                .execute()
+            response = await execute(query.maybe_single())
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch progress: {str(e)}",
             )
-            if not project_check.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Project not found.",
-                )
-
-            # Update the task
-            update_data = {"status": new_status}
-            if new_status == "completed":
-                from datetime import datetime
-                update_data["completed_at"] = datetime.utcnow().isoformat()
 
-            response = (
-                supabase.table("tasks")
-                .update(update_data)
-                .eq("id", task_id)
-                .eq("project_id", project_id)
-                .execute()
+        project = response.data if response is not None else None
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found.",
             )
 
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Task not found.",
-                )
+        modules = []
+        for module in project.get("modules") or []:
+            if use_counters:
+                counts = ProjectService._counts_from_row(module.get("module_progress"))
+            else:
+                counts = ProjectService._count_tasks(module.get("tasks") or [])
+            modules.append({
+                "module_id": module["id"],
+                "title": module["title"],
+                "order_index": module["order_index"],
+                "status": module["status"],
+                **counts,
+            })
+
+        if use_counters:
+            totals = ProjectService._counts_from_row(project.get("project_progress"))
+        else:
+            totals = ProjectService._sum_counts(modules)
+
+        return {
+            "project_id": project["id"],
+            "status": project["status"],
+            "modules": modules,
+            **totals,
+        }
 
-            return response.data[0]
+    @staticmethod
+    def _counts_from_row(row: dict | list | None) -> dict:
+        if isinstance(row, list):  # one-to-one embeds come back as a list on older PostgREST
+            row = row[0] if row else None
+        row = row or {}
+        return ProjectService._finish_counts({
+            "pending": row.get("pending", 0),
+            "in_progress": row.get("in_progress", 0),
+            "completed": row.get("completed", 0),
+            "blocked": row.get("blocked", 0),
+            "hours_total": float(row.get("hours_total") or 0),
+            "hours_done": float(row.get("hours_done") or 0),
+        })
+
+    @staticmethod
+    def _count_tasks(tasks: list[dict]) -> dict:
+        counts = {"pending": 0, "in_progress": 0, "completed": 0, "blocked": 0, "hours_total": 0.0, "hours_done": 0.0}
+        for task in tasks:
+            if task["status"] in counts:
+                counts[task["status"]] += 1
+            hours = float(task.get("estimated_hours") or 0)
+            counts["hours_total"] += hours
+            if task["status"] == "completed":
+                counts["hours_done"] += hours
+        return ProjectService._finish_counts(counts)
+
+    @staticmethod
+    def _sum_counts(items: list[dict]) -> dict:
+        keys = ("pending", "in_progress", "completed", "blocked", "hours_total", "hours_done")
+        return ProjectService._finish_counts({key: sum(item[key] for item in items) for key in keys})
+
+    @staticmethod
+    def _finish_counts(counts: dict) -> dict:
+        total = counts["pending"] + counts["in_progress"] + counts["completed"] + counts["blocked"]
+        return {
+            **counts,
+            "total": total,
+            "hours_remaining": round(counts["hours_total"] - counts["hours_done"], 2),
+            "percent_complete": round(100 * counts["completed"] / total, 1) if total else 0.0,
+        }
+
+    # ── Update Task Status ───────────────────────────
+    @staticmethod
+    async def update_task_status(task_id: str, project_id: str, user_id: str, new_status: str) -> dict:
+        """Update a single task's status. Verifies ownership via project_id."""
+        result = await ProjectService.update_task_statuses(
+            project_id=project_id,
+            user_id=user_id,
+            updates={task_id: new_status},
+        )
+        if not result["updated"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found.",
+            )
+        return result["updated"][0]
+
+    # ── Batch Update Task Status ─────────────────────
+    @staticmethod
+    async def update_task_statuses(project_id: str, user_id: str, updates: dict[str, str]) -> dict:
+        """
+        Update the status of several tasks of one project.
+        `updates` maps task_id → new status. Returns
+        {"updated": rows (in request order), "not_found": task ids}.
+
+        completed_at is set when a task becomes completed and cleared
+        when it leaves that state.
+
+        The ownership check is part of the update where the schema allows:
+        with TASK_UPDATE_RPC it is one statement
+        (backend/sql/update_task_statuses.sql); with TASK_USER_ID_COLUMN the
+        UPDATEs filter on tasks.user_id. Either way the project is only
+        looked up when nothing matched, to tell "not your project" from "no
+        such task". Without either, PostgREST can't filter an UPDATE through
+        projects, so ownership is checked first (skipped for projects
+        already known to be the user's), then one UPDATE per distinct status.
+        """
+        settings = get_settings()
+        owned = False
+        try:
+            if settings.TASK_UPDATE_RPC:
+                updated = await ProjectService._update_tasks_rpc(project_id, user_id, updates)
+            elif settings.TASK_USER_ID_COLUMN:
+                updated = await ProjectService._update_tasks_bulk(project_id, updates, user_id=user_id)
+            else:
+                await ProjectService._check_owner(project_id, user_id)
+                owned = True
+                updated = await ProjectService._update_tasks_bulk(project_id, updates)
+            if not updated and not owned:
+                await ProjectService._check_owner(project_id, user_id)
+            owned = True
+
+            position = {task_id: i for i, task_id in enumerate(updates)}
+            updated.sort(key=lambda task: position.get(task["id"], len(position)))
+            found = {task["id"] for task in updated}
+            result = {
+                "updated": updated,
+                "not_found": [task_id for task_id in updates if task_id not in found],
+            }
 
         except HTTPException:
             raise
         except Exception as e:
+            if owned:
+                # Some of the updates may have landed
+                await ProjectService._record_task_write(user_id, project_id, None)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update task: {str(e)}",
             )
 
+        await ProjectService._record_task_write(user_id, project_id, updated)
+        return result
+
+    @staticmethod
+    async def _check_owner(project_id: str, user_id: str) -> None:
+        """404 unless the project belongs to the user (remembered once confirmed)."""
+        tree_cache = get_project_tree_cache()
+        if tree_cache.owner_of(project_id) == user_id:
+            return
+
+        project_check = await execute(
+            supabase.table("projects")
+            .select("id")
+            .eq("id", project_id)
+            .eq("user_id", user_id)
+        )
+        if not project_check.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found.",
+            )
+        tree_cache.remember_owner(project_id, user_id)
+
+    @staticmethod
+    async def _update_tasks_bulk(project_id: str, updates: dict[str, str], user_id: str | None = None) -> list[dict]:
+        """
+        One UPDATE ... WHERE id IN (...) per distinct status, run concurrently.
+        With `user_id`, only the user's tasks match (tasks.user_id).
+        """
+        ids_by_status: dict[str, list[str]] = {}
+        for task_id, new_status in updates.items():
+            ids_by_status.setdefault(new_status, []).append(task_id)
+
+        completed_at = datetime.utcnow().isoformat()
+
+        async def apply(new_status: str, task_ids: list[str]) -> list[dict]:
+            update_data = {
+                "status": new_status,
+                "completed_at": completed_at if new_status == "completed" else None,
+            }
+            query = (
+                supabase.table("tasks")
+                .update(update_data)
+                .in_("id", task_ids)
+                .eq("project_id", project_id)
+            )
+            if user_id is not None:
+                query = query.eq("user_id", user_id)
+            response = await execute(query)
+            return response.data
+
+        results = await asyncio.gather(
+            *(apply(new_status, task_ids) for new_status, task_ids in ids_by_status.items())
+        )
+        return [task for rows in results for task in rows]
+
+    @staticmethod
+    async def _update_tasks_rpc(project_id: str, user_id: str, updates: dict[str, str]) -> list[dict]:
+        response = await execute(
+            supabase.rpc(
+                "update_task_statuses",
+                {
+                    "p_user_id": user_id,
+                    "p_project_id": project_id,
+                    "p_updates": [
+                        {"task_id": task_id, "status": new_status}
+                        for task_id, new_status in updates.items()
+                    ],
+                },
+            )
+        )
+        return response.data or []
+
     # ── Upcoming Deadlines ───────────────────────────
     @staticmethod
-    def get_upcoming_deadlines(user_id: str, limit: int = 10) -> list[dict]:
+    async def get_upcoming_deadlines(
+        user_id: str,
+        limit: int = 10,
+        deadline_from: date | None = None,
+        deadline_to: date | None = None,
+    ) -> list[dict]:
         """
         Get upcoming task deadlines across all user's projects.
         Returns tasks that are not completed and have a deadline set,
-        ordered by deadline ascending (soonest first).
+        ordered by deadline ascending (soonest first), optionally limited
+        to deadlines within [deadline_from, deadline_to].
+
+        One query: tasks inner-joined to their project (for the title).
+        The owner filter goes through the join by default, which reads and
+        sorts every open task of the user's projects (tasks_open_deadline_idx
+        in sql/indexes.sql only narrows it to those projects). With
+        TASK_USER_ID_COLUMN it filters on tasks.user_id instead, and
+        tasks_user_open_deadline_idx (sql/tasks_user_id.sql) returns the
+        first `limit` rows in order — cost independent of how many
+        projects and tasks the user has.
         """
-        try:
-            # Get all project IDs for this user
-            projects_response = (
-                supabase.table("projects")
-                .select("id, title")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            projects = {p["id"]: p["title"] for p in projects_response.data}
-
-            if not projects:
-                return []
+        query = supabase.table("tasks").select(
+            "id, project_id, title, deadline, status, projects!inner(title)"
+        )
+        if get_settings().TASK_USER_ID_COLUMN:
+            query = query.eq("user_id", user_id)
+        else:
+            query = query.eq("projects.user_id", user_id)
+        query = query.neq("status", "completed").not_.is_("deadline", "null")
+        if deadline_from:
+            query = query.gte("deadline", deadline_from.isoformat())
+        if deadline_to:
+            query = query.lte("deadline", deadline_to.isoformat())
 
-            # Get tasks with deadlines that aren't completed
-            project_ids = list(projects.keys())
-            tasks_response = (
-                supabase.table("tasks")
-                .select("id, project_id, title, deadline, status")
-                .in_("project_id", project_ids)
-                .neq("status", "completed")
-                .not_.is_("deadline", "null")
+        try:
+            tasks_response = await execute(
+                query
                 .order("deadline")
+                .order("id")
                 .limit(limit)
-                .execute()
             )
-
-            deadlines = []
-            for task in tasks_response.data:
-                deadlines.append({
-                    "project_id": task["project_id"],
-                    "project_title": projects.get(task["project_id"], "Unknown"),
-                    "task_id": task["id"],
-                    "task_title": task["title"],
-                    "deadline": task["deadline"],
-                    "status": task["status"],
-                })
-
-            return deadlines
-
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to fetch deadlines: {str(e)}",
             )
 
+        return [
+            {
+                "project_id": task["project_id"],
+                "project_title": (task.get("projects") or {}).get("title", "Unknown"),
+                "task_id": task["id"],
+                "task_title": task["title"],
+                "deadline": task["deadline"],
+                "status": task["status"],
+            }
+            for task in tasks_response.data
+        ]
+
     # ── Delete Project ───────────────────────────────
     @staticmethod
-    def delete_project(project_id: str, user_id: str) -> dict:
+    async def delete_project(project_id: str, user_id: str) -> dict:
         """Delete a project and all its modules/tasks (cascading delete in DB)."""
         try:
-            response = (
+            response = await execute(
                 supabase.table("projects")
                 .delete()
                 .eq("id", project_id)
                 .eq("user_id", user_id)
-                .execute()
             )
 
             if not response.data:
@@ -300,8 +644,6 @@ class ProjectService:
                     detail="Project not found.",
                 )
 
-            return {"message": "Project deleted successfully.", "success": True}
-
         except HTTPException:
             raise
         except Exception as e:
@@ -309,3 +651,94 @@ class ProjectService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to delete project: {str(e)}",
             )
+
+        # Only once the row was ours and is gone: a 404 must not touch
+        # another user's project version or cached tree
+        await ProjectService.touch(user_id, project_id)
+        get_project_tree_cache().forget(project_id)
+        return {"message": "Project deleted successfully.", "success": True}
+
+    # ── Abandoned Generations ────────────────────────
+    @staticmethod
+    async def mark_abandoned(user_id: str, project_id: str) -> None:
+        """
+        Flag a project whose generation was cancelled because nobody was
+        listening (only while it is still 'planning'). Hidden from the
+        project list; the orphan sweeper deletes it later.
+        """
+        await execute(
+            supabase.table("projects")
+            .update({"status": "abandoned"})
+            .eq("id", project_id)
+            .eq("user_id", user_id)
+            .eq("status", "planning")
+        )
+        await ProjectService.touch(user_id, project_id)
+
+    @staticmethod
+    async def purge_abandoned_projects(older_than_seconds: float) -> int:
+        """
+        Delete abandoned projects created more than `older_than_seconds`
+        ago (modules/tasks go with them). Returns how many were deleted.
+
+        Only 'abandoned' rows: a 'planning' row may belong to a generation
+        still running on any worker (sync create, queued job, stream), and
+        nothing records which ones are alive.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than_seconds)
+        response = await execute(
+            supabase.table("projects")
+            .delete()
+            .eq("status", "abandoned")
+            .lt("created_at", cutoff.isoformat())
+        )
+        deleted = response.data or []
+        for project in deleted:
+            await ProjectService.touch(project["user_id"], project["id"])
+            get_project_tree_cache().forget(project["id"])
+        return len(deleted)
+
+    # ── Versions / ETags ─────────────────────────────
+    @staticmethod
+    async def touch(user_id: str, project_id: str | None = None) -> None:
+        """
+        Record a write: bumps the user's version (list, deadlines) and, if
+        given, the project's version (detail) and drops its cached tree.
+        Called by every write path.
+        """
+        await ProjectService._bump(user_id, project_id)
+        if project_id is not None:
+            get_project_tree_cache().evict(project_id)
+
+    @staticmethod
+    async def _record_task_write(user_id: str, project_id: str, tasks: list[dict] | None) -> None:
+        """touch() for task writes: patches the cached tree instead of evicting it."""
+        changes = await ProjectService._bump(user_id, project_id)
+        tree_cache = get_project_tree_cache()
+        change = (changes or {}).get(ResourceVersions.project_key(project_id))
+        # With progress counters the database also rolled up module/project
+        # status, which a task-only patch can't reflect
+        if tasks is None or change is None or get_settings().PROGRESS_COUNTERS:
+            tree_cache.evict(project_id)
+        else:
+            tree_cache.update_tasks(project_id, tasks, *change)
+
+    @staticmethod
+    async def _bump(user_id: str, project_id: str | None) -> dict | None:
+        versions = get_resource_versions()
+        keys = [versions.user_key(user_id)]
+        if project_id is not None:
+            keys.append(versions.project_key(project_id))
+        return await versions.bump(*keys)
+
+    @staticmethod
+    async def list_etag(user_id: str, *params) -> str | None:
+        """ETag for the user's project list / deadlines (`params` = query args)."""
+        versions = get_resource_versions()
+        return await versions.etag([versions.user_key(user_id)], *params)
+
+    @staticmethod
+    async def detail_etag(user_id: str, project_id: str, *params) -> str | None:
+        """ETag for a project's detail / progress (`params` = view + query args)."""
+        versions = get_resource_versions()
+        return await versions.etag([versions.project_key(project_id)], user_id, *params)
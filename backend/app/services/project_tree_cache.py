@@ -0,0 +1,178 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from app.config import get_settings
+from app.responses import dumps, loads
+
+
+@dataclass
+class _TreeEntry:
+    owner_id: str
+    version: int          # project version the tree was read at
+    blob: bytes           # the tree, serialized
+    size: int             # len(blob)
+    expires_at: float
+
+
+class ProjectTreeCache:
+    """
+    Bounded in-process cache of assembled project trees (project → modules
+    → tasks), as returned by ProjectService.get_project_detail.
+
+    - Keyed by project id and scoped by owner: another user never gets a hit.
+    - Every entry is stamped with the project's version (app/services/
+      resource_versions.py) read *before* the database fetch; a hit requires
+      the stamp to still be current, so writes made by any worker invalidate it.
+    - Writes in this process also evict the entry, or patch it in place
+      (task status updates) when no other write slipped in between.
+    - Also remembers confirmed project owners, so task writes can skip
+      the separate ownership query.
+    - Memory is accounted per entry (serialized size) and bounded by
+      `max_bytes` and `max_entries`, evicting least recently used trees.
+    - Trees are stored serialized and every hit decodes a fresh copy, so a
+      caller mutating its response can't change what later readers get.
+    """
+
+    MAX_OWNERS = 50000
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _TreeEntry] = OrderedDict()
+        self._owners: OrderedDict[str, str] = OrderedDict()  # project_id → owner_id
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.patches = 0
+
+    # ── Reads ────────────────────────────────────────
+    def get(self, project_id: str, owner_id: str, version: int) -> dict | None:
+        entry = self._entries.get(project_id)
+        if entry is None or entry.owner_id != owner_id:
+            self.misses += 1
+            return None
+        if entry.version != version or entry.expires_at <= time.monotonic():
+            self._remove(project_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(project_id)
+        self.hits += 1
+        return loads(entry.blob)
+
+    def put(self, project_id: str, owner_id: str, version: int, tree: dict) -> None:
+        blob = dumps(tree)
+        size = len(blob)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return  # would evict everything else
+
+        self._remove(project_id)
+        self.remember_owner(project_id, owner_id)
+        self._entries[project_id] = _TreeEntry(
+            owner_id=owner_id,
+            version=version,
+            blob=blob,
+            size=size,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    # ── Writes ───────────────────────────────────────
+    def evict(self, project_id: str) -> None:
+        self._remove(project_id)
+
+    def update_tasks(self, project_id: str, tasks: list[dict], previous_version: int | None, new_version: int) -> None:
+        """
+        Replace tasks in the cached tree after a task write. Only done if the
+        tree was current right before this write (its stamp equals
+        `previous_version`); otherwise the entry is evicted.
+        """
+        entry = self._entries.get(project_id)
+        if entry is None:
+            return
+        if previous_version is None or entry.version != previous_version:
+            self._remove(project_id)
+            return
+
+        # A decoded copy: patched in place, then stored serialized again
+        tree = loads(entry.blob)
+        changed = {task["id"]: task for task in tasks}
+        replaced = set()
+        for module in tree.get("modules", []):
+            for t in module.get("tasks", []):
+                if t.get("id") in changed:
+                    t.update(changed[t["id"]])
+                    replaced.add(t["id"])
+
+        if len(replaced) != len(changed):
+            self._remove(project_id)
+            return
+
+        blob = dumps(tree)
+        self.bytes += len(blob) - entry.size
+        entry.blob = blob
+        entry.size = len(blob)
+        entry.version = new_version
+        self.patches += 1
+
+    # ── Ownership ────────────────────────────────────
+    def owner_of(self, project_id: str) -> str | None:
+        """Known owner of a project (ownership never changes, so no version check)."""
+        owner = self._owners.get(project_id)
+        if owner is not None:
+            self._owners.move_to_end(project_id)
+        return owner
+
+    def remember_owner(self, project_id: str, owner_id: str) -> None:
+        self._owners[project_id] = owner_id
+        self._owners.move_to_end(project_id)
+        while len(self._owners) > self.MAX_OWNERS:
+            self._owners.popitem(last=False)
+
+    def forget(self, project_id: str) -> None:
+        """Project deleted: drop its tree and its owner."""
+        self._remove(project_id)
+        self._owners.pop(project_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._owners.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "patches": self.patches,
+        }
+
+    # ── Internals ────────────────────────────────────
+    def _remove(self, project_id: str) -> None:
+        entry = self._entries.pop(project_id, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+
+@lru_cache()
+def get_project_tree_cache() -> ProjectTreeCache:
+    """Process-wide project tree cache — created once, shared by every request."""
+    settings = get_settings()
+    return ProjectTreeCache(
+        max_entries=settings.PROJECT_TREE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.PROJECT_TREE_CACHE_MAX_BYTES,
+        ttl=settings.PROJECT_TREE_CACHE_TTL_SECONDS,
+    )
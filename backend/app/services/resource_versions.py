@@ -0,0 +1,156 @@
+import hashlib
+import itertools
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from app.config import get_settings
+
+
+# ──────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────
+
+class MemoryVersionBackend:
+    """
+    Version counters kept in this process (default).
+
+    Every bump takes the next value of one process-wide clock, so a counter
+    that was evicted and recreated never reuses an old value. The `epoch`
+    changes on every start, so ETags from a previous run never match.
+    Only correct with a single worker — use the redis backend otherwise.
+    """
+
+    def __init__(self, max_tracked: int):
+        self.max_tracked = max_tracked
+        self.epoch = uuid.uuid4().hex
+        self._clock = itertools.count(1)
+        self._versions: OrderedDict[str, int] = OrderedDict()
+
+    async def get(self, keys: list[str]) -> list[int]:
+        versions = []
+        for key in keys:
+            version = self._versions.get(key)
+            if version is None:
+                version = self._set(key)
+            else:
+                self._versions.move_to_end(key)
+            versions.append(version)
+        return versions
+
+    async def bump(self, keys: list[str]) -> list[tuple[int | None, int]]:
+        return [(self._versions.get(key), self._set(key)) for key in keys]
+
+    def _set(self, key: str) -> int:
+        version = next(self._clock)
+        self._versions[key] = version
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_tracked:
+            self._versions.popitem(last=False)
+        return version
+
+
+class RedisVersionBackend:
+    """
+    Version counters shared by every worker/host (INCR per key).
+    Requires the optional `redis` package (redis>=4.2 for redis.asyncio).
+    """
+
+    KEY = "spm:version:{}"
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("VERSION_BACKEND=redis requires the 'redis' package (pip install redis).")
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+        self.epoch = ""
+
+    async def get(self, keys: list[str]) -> list[int]:
+        values = await self._redis.mget([self.KEY.format(k) for k in keys])
+        return [int(v or 0) for v in values]
+
+    async def bump(self, keys: list[str]) -> list[tuple[int | None, int]]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(self.KEY.format(key))
+            values = await pipe.execute()
+        return [(new - 1, new) for new in values]
+
+
+# ──────────────────────────────────────────────
+# Versions + ETags
+# ──────────────────────────────────────────────
+
+class ResourceVersions:
+    """
+    Cheap per-user / per-project version numbers, bumped by every write in
+    ProjectService. Read endpoints derive their ETag from these versions
+    (read *before* the data, so a racing write can only make the ETag
+    older than the body, never newer) and answer 304 without querying.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def user_key(user_id: str) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def project_key(project_id: str) -> str:
+        return f"project:{project_id}"
+
+    async def bump(self, *keys: str) -> dict[str, tuple[int | None, int]] | None:
+        """
+        Advance each key's version. Returns {key: (previous, new)} — previous
+        is None if it isn't known — or None if the backend failed.
+        """
+        try:
+            changes = await self.backend.bump(list(keys))
+        except Exception as e:
+            print(f"Failed to bump resource versions {keys}: {e}")
+            return None
+        return dict(zip(keys, changes))
+
+    async def get(self, *keys: str) -> list[int] | None:
+        """Current versions of `keys` (None if the backend failed)."""
+        try:
+            return await self.backend.get(list(keys))
+        except Exception as e:
+            print(f"Failed to read resource versions {keys}: {e}")
+            return None
+
+    async def etag(self, keys: list[str], *parts) -> str | None:
+        """
+        Weak ETag over the current versions of `keys` plus any request
+        parameters that shape the response. None if versions are unavailable.
+        """
+        versions = await self.get(*keys)
+        if versions is None:
+            return None
+        raw = repr((self.backend.epoch, keys, versions, parts)).encode()
+        return f'W/"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+    @staticmethod
+    def matches(if_none_match: str | None, etag: str | None) -> bool:
+        """If-None-Match semantics (weak comparison, lists and `*`)."""
+        if not if_none_match or etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(
+            candidate.strip().removeprefix("W/") == opaque
+            for candidate in if_none_match.split(",")
+        )
+
+
+@lru_cache()
+def get_resource_versions() -> ResourceVersions:
+    """Process-wide version registry — created once, shared by every request."""
+    settings = get_settings()
+    if settings.VERSION_BACKEND == "redis":
+        backend = RedisVersionBackend(url=settings.VERSION_REDIS_URL)
+    else:
+        backend = MemoryVersionBackend(max_tracked=settings.VERSION_MAX_TRACKED)
+    return ResourceVersions(backend)
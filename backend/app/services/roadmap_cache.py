@@ -0,0 +1,259 @@
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import lru_cache
+from app.config import get_settings
+
+
+class RoadmapCache:
+    """
+    Content-addressed cache for generated roadmaps.
+
+    The key is a SHA-256 over the normalized prompt inputs plus the model
+    name, so re-submits, retries and the same template project from
+    different users all map to one entry.
+
+    - Memory tier: LRU bounded by `max_entries`, entries expire after `ttl`.
+    - Disk tier (optional): one JSON file per key in `disk_path`, same TTL,
+      oldest files pruned beyond `disk_max_entries`. Survives restarts and
+      is shared by workers on the same host.
+
+    Roadmaps are stored with the date they were generated on. On a hit
+    every module/task date is shifted by the number of days since then,
+    so a plan cached yesterday still starts today.
+    """
+
+    DATE_FIELDS_MODULE = ("start_date", "end_date")
+    DATE_FIELDS_TASK = ("deadline",)
+
+    def __init__(self, max_entries: int, ttl: float, disk_path: str = "", disk_max_entries: int = 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        # key → (stored_at, generated_on, roadmap)
+        self._memory: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_errors = 0
+
+        if self.disk_path:
+            os.makedirs(self.disk_path, exist_ok=True)
+
+    # ── Keys ─────────────────────────────────────────
+    @staticmethod
+    def make_key(
+        model: str,
+        description: str,
+        tech_stack: list[str],
+        planning_mode: str,
+        deadline_date: str | None,
+        working_hours_per_day: float,
+        skill_level: str | None,
+        preferred_pace: str | None,
+    ) -> str:
+        """Canonical hash of everything that goes into the prompt (LLMService._project_brief)."""
+        canonical = {
+            "model": model,
+            "description": " ".join(description.split()).lower(),
+            "tech_stack": sorted({t.strip().lower() for t in tech_stack if t.strip()}),
+            "planning_mode": planning_mode,
+            "deadline_date": deadline_date if planning_mode == "deadline" else None,
+            "working_hours_per_day": float(working_hours_per_day),
+            "skill_level": skill_level or "medium",
+            "preferred_pace": preferred_pace or "medium",
+        }
+        encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    # ── Public API ───────────────────────────────────
+    async def get(self, key: str, deadline_date: str | None = None) -> dict | None:
+        """
+        Return a rebased copy of the cached roadmap, or None on a miss.
+        With `deadline_date` set, an entry whose shifted dates would run
+        past the deadline is treated as a miss.
+        """
+        entry = self._memory_get(key)
+        from_disk = False
+
+        if entry is None and self.disk_path:
+            entry = await asyncio.to_thread(self._disk_get, key)
+            from_disk = entry is not None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        _, generated_on, roadmap = entry
+        rebased = self._rebase(roadmap, date.fromisoformat(generated_on), date.today())
+
+        if deadline_date and not self._fits_deadline(rebased, deadline_date):
+            self.misses += 1
+            return None
+
+        if from_disk:
+            self._memory_put(key, entry)
+            self.disk_hits += 1
+        self.hits += 1
+        return rebased
+
+    async def set(self, key: str, roadmap: dict) -> None:
+        """
+        Store a freshly generated roadmap under `key`. Best-effort: a failed
+        disk write is logged and counted, never raised to the generation.
+        """
+        entry = (time.time(), date.today().isoformat(), copy.deepcopy(roadmap))
+        self._memory_put(key, entry)
+        if self.disk_path:
+            try:
+                await asyncio.to_thread(self._disk_put, key, entry)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Roadmap cache write failed for {key}: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "write_errors": self.write_errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    # ── Memory tier ──────────────────────────────────
+    def _memory_get(self, key: str) -> tuple | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl:
+            del self._memory[key]
+            self.evictions += 1
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # ── Disk tier ────────────────────────────────────
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.json")
+
+    def _disk_get(self, key: str) -> tuple | None:
+        path = self._disk_file(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - stored["stored_at"] > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored["stored_at"], stored["generated_on"], stored["roadmap"]
+
+    def _disk_put(self, key: str, entry: tuple) -> None:
+        stored_at, generated_on, roadmap = entry
+        path = self._disk_file(key)
+        # Unique temp file per writer: concurrent writes of the same key
+        # each replace the file whole, the last one wins
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_path, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "generated_on": generated_on, "roadmap": roadmap}, f)
+            os.replace(tmp_path, path)  # atomic, readers never see half a file
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._disk_prune()
+
+    def _disk_prune(self) -> None:
+        if self.disk_max_entries <= 0:
+            return
+        files = [
+            os.path.join(self.disk_path, name)
+            for name in os.listdir(self.disk_path)
+            if name.endswith(".json")
+        ]
+        if len(files) <= self.disk_max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.disk_max_entries]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+
+    # ── Date rebasing ────────────────────────────────
+    @staticmethod
+    def _shift(value, days: int):
+        if not value or not days:
+            return value
+        try:
+            return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+        except (TypeError, ValueError):
+            return value
+
+    @staticmethod
+    def _rebase(roadmap: dict, generated_on: date, today: date) -> dict:
+        """Deep copy of `roadmap` with all dates moved forward by (today - generated_on)."""
+        rebased = copy.deepcopy(roadmap)
+        days = (today - generated_on).days
+        if days <= 0:
+            return rebased
+
+        for module in rebased.get("modules", []):
+            for field in RoadmapCache.DATE_FIELDS_MODULE:
+                module[field] = RoadmapCache._shift(module.get(field), days)
+            for task in module.get("tasks", []):
+                for field in RoadmapCache.DATE_FIELDS_TASK:
+                    task[field] = RoadmapCache._shift(task.get(field), days)
+        return rebased
+
+    @staticmethod
+    def _fits_deadline(roadmap: dict, deadline_date: str) -> bool:
+        """True if no module end date or task deadline is after `deadline_date`."""
+        for module in roadmap.get("modules", []):
+            dates = [module.get("end_date")] + [t.get("deadline") for t in module.get("tasks", [])]
+            for value in dates:
+                if isinstance(value, str) and value > deadline_date:
+                    return False
+        return True
+
+
+@lru_cache()
+def get_roadmap_cache() -> RoadmapCache:
+    """Process-wide roadmap cache — created once, reused by every request."""
+    settings = get_settings()
+    return RoadmapCache(
+        max_entries=settings.ROADMAP_CACHE_MAX_ENTRIES,
+        ttl=settings.ROADMAP_CACHE_TTL_SECONDS,
+        disk_path=settings.ROADMAP_CACHE_DISK_PATH,
+        disk_max_entries=settings.ROADMAP_CACHE_DISK_MAX_ENTRIES,
+    )
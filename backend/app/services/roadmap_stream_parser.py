@@ -0,0 +1,83 @@
+import json
+
+
+class ModuleStreamParser:
+    """
+    Incremental parser for the streamed roadmap JSON.
+
+    Feed it raw text fragments as they arrive from Gemini; every time an
+    element of the top-level `"modules"` array is closed, `feed()` returns
+    it as a parsed dict. Each character is scanned exactly once and only
+    the text of the module currently being built is buffered, so the cost
+    stays linear in the size of the response.
+
+    Expected shape: {"modules": [ {...}, {...}, ... ]}
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        # Last string seen at depth 1 — i.e. the most recent top-level key
+        self._key_chars: list[str] | None = None
+        self._last_key: str | None = None
+
+        self._in_modules = False        # inside the "modules" array
+        self._element_parts: list[str] | None = None  # text of the open module
+
+    def feed(self, text: str) -> list[dict]:
+        """Consume a fragment; return the modules completed by it (maybe none)."""
+        completed = []
+        element_start = 0 if self._element_parts is not None else None
+
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._key_chars is not None and not (ch == '"' and not self._escape):
+                    self._key_chars.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_key = "".join(self._key_chars)
+                        self._key_chars = None
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._key_chars = []
+            elif ch in "{[":
+                if self._in_modules and self._depth == 2 and ch == "{":
+                    self._element_parts = []
+                    element_start = i
+                if self._depth == 1 and ch == "[" and self._last_key == "modules":
+                    self._in_modules = True
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._in_modules and self._depth == 2 and ch == "}":
+                    self._element_parts.append(text[element_start:i + 1])
+                    module = self._parse("".join(self._element_parts))
+                    if module is not None:
+                        completed.append(module)
+                    self._element_parts = None
+                    element_start = None
+                elif self._in_modules and self._depth == 1:
+                    self._in_modules = False
+
+        if self._element_parts is not None and element_start is not None:
+            self._element_parts.append(text[element_start:])
+
+        return completed
+
+    @staticmethod
+    def _parse(fragment: str) -> dict | None:
+        try:
+            module = json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return module if isinstance(module, dict) else None
@@ -0,0 +1,460 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import suppress
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable
+from fastapi import Request
+from app.config import get_settings
+from app.responses import sse_event
+
+
+_HEARTBEAT = b": keep-alive\n\n"
+_CHUNK_PREFIX = sse_event("chunk", "").encode()[:-4]  # b'data: {"type":"chunk","data":"'
+
+
+class StreamSession:
+    """
+    One generation's SSE frames, numbered 1, 2, 3, … (the SSE `id`).
+
+    The most recent frames are kept for replay (bounded by `max_events`
+    and `max_bytes`); readers follow the buffer with their own cursor.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        owner_id: str,
+        max_events: int,
+        max_bytes: int,
+        on_abandon: Callable[[], Awaitable[None]] | None = None,
+    ):
+        self.key = key
+        self.owner_id = owner_id
+        self.on_abandon = on_abandon
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.frames: deque[tuple[int, bytes]] = deque()
+        self.bytes = 0
+        self.last_id = 0
+        self.output_chars = 0  # chunk text produced so far
+        self.finished = False
+        self.task: asyncio.Task | None = None
+        self.expiry: asyncio.TimerHandle | None = None
+        self.readers: dict[int, int] = {}  # reader token → last id sent to it
+        self._tokens = itertools.count()
+        self._changed = asyncio.Event()
+
+    def append(self, data: bytes) -> None:
+        self.last_id += 1
+        frame = b"id: %d\n" % self.last_id + data
+        self.frames.append((self.last_id, frame))
+        self.bytes += len(frame)
+        while len(self.frames) > 1 and (len(self.frames) > self.max_events or self.bytes > self.max_bytes):
+            _, dropped = self.frames.popleft()
+            self.bytes -= len(dropped)
+        self.notify()
+
+    def frames_after(self, last_id: int) -> list[tuple[int, bytes]]:
+        """Retained frames with an id above `last_id`."""
+        if not self.frames or last_id >= self.last_id:
+            return []
+        start = max(0, last_id + 1 - self.frames[0][0])
+        return list(itertools.islice(self.frames, start, None))
+
+    def lagging(self, max_queued: int) -> bool:
+        """Whether an attached reader is more than `max_queued` frames behind."""
+        return bool(self.readers) and min(self.readers.values()) < self.last_id - max_queued
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, timeout: float | None) -> bool:
+        """Wait for a new frame or reader progress (False on timeout)."""
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class SSEStreamer:
+    """
+    Runs event streams independently of the connections reading them.
+
+    `start()` turns a stream of `(event_type, data)` events into SSE frames
+    in a background task; `subscribe()` sends a session's frames to one
+    connection, starting after any `Last-Event-ID`.
+
+    - Coalescing: consecutive `chunk` events (raw Gemini text, often a few
+      bytes each) are merged into one frame, flushed once `max_bytes` have
+      been buffered, `window` seconds after the first buffered fragment, or
+      right before any other event — so event order is preserved.
+    - Heartbeat: a `: keep-alive` comment is sent whenever nothing else has
+      been sent for `heartbeat` seconds, so idle proxies keep the
+      connection open during long generations.
+    - Backpressure: the producer pauses while an attached reader is more
+      than `max_queued` frames behind, instead of buffering without bound.
+      A reader still that far behind after `stall_timeout` seconds is
+      detached: its response ends at its next frame and it can resume with
+      Last-Event-ID, while the producer (and its Gemini stream and
+      governor slot) moves on.
+    - Resume: every frame carries an id and the last `replay_max_events`
+      frames are kept. A session with no reader keeps running for `grace`
+      seconds (and a finished one stays resumable that long); after that it
+      is dropped.
+    - Abandonment: readers poll `Request.is_disconnected` every
+      `disconnect_poll` seconds. An unfinished session whose grace period
+      ran out with no reader is cancelled — which closes the upstream
+      Gemini stream — and its `on_abandon` cleanup runs in the background.
+      Output tokens saved are estimated from the average output of
+      completed generations (~4 characters per token).
+
+    Also tracks time to first byte / first chunk frame, measured from
+    `started_at` (when the request handler started).
+    Sessions live in this process: a resume must reach the same worker.
+    """
+
+    LATENCY_WINDOW = 200
+    CHARS_PER_TOKEN = 4
+    ATTACH_TIMEOUT = 10  # seconds a new session waits for its first reader
+
+    def __init__(
+        self,
+        window: float,
+        max_bytes: int,
+        heartbeat: float,
+        max_queued: int,
+        replay_max_events: int,
+        replay_max_bytes: int,
+        grace: float,
+        disconnect_poll: float,
+        stall_timeout: float,
+    ):
+        self.window = window
+        self.max_bytes = max_bytes
+        self.heartbeat = heartbeat
+        self.max_queued = max_queued
+        self.replay_max_events = replay_max_events
+        self.replay_max_bytes = replay_max_bytes
+        self.grace = grace
+        self.disconnect_poll = disconnect_poll
+        self.stall_timeout = stall_timeout
+        self._sessions: dict[str, StreamSession] = {}
+        self._cleanups: set[asyncio.Task] = set()
+
+        self.active = 0
+        self.streams = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.abandoned_tokens_saved = 0
+        self.cleanup_failures = 0
+        self.disconnected = 0
+        self.resumes = 0
+        self.replayed_frames = 0
+        self.replay_gaps = 0
+        self.chunks_in = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.heartbeats = 0
+        self.backpressure_waits = 0
+        self.readers_dropped = 0
+        self._first_frame: deque = deque(maxlen=self.LATENCY_WINDOW)
+        self._first_chunk: deque = deque(maxlen=self.LATENCY_WINDOW)
+        self._output_chars: deque = deque(maxlen=self.LATENCY_WINDOW)  # per completed generation
+
+    # ── Sessions ─────────────────────────────────────
+    def start(
+        self,
+        key: str,
+        owner_id: str,
+        events: AsyncIterator[tuple[str, object]],
+        on_abandon: Callable[[], Awaitable[None]] | None = None,
+    ) -> StreamSession:
+        """
+        Start producing frames for `events` under `key` (e.g. the project id).
+        `on_abandon` runs (in the background, after the producer stopped) if
+        the session is cancelled because nobody is reading it any more.
+        """
+        session = StreamSession(key, owner_id, self.replay_max_events, self.replay_max_bytes, on_abandon)
+        previous = self._sessions.pop(key, None)
+        if previous is not None and previous.task is not None:
+            previous.task.cancel()
+        self._sessions[key] = session
+        session.task = asyncio.create_task(self._produce(session, events))
+        self.streams += 1
+        self.active += 1
+        self._schedule_expiry(session, max(self.grace, self.ATTACH_TIMEOUT))
+        return session
+
+    def get(self, key: str, owner_id: str) -> StreamSession | None:
+        """The session for `key`, if it still exists and belongs to `owner_id`."""
+        session = self._sessions.get(key)
+        if session is None or session.owner_id != owner_id:
+            return None
+        return session
+
+    async def subscribe(
+        self,
+        session: StreamSession,
+        last_event_id: int = 0,
+        started_at: float | None = None,
+        request: Request | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Frames of `session` after `last_event_id`, then live ones, until the
+        session finishes or `request`'s client disconnects. Use as a
+        StreamingResponse body. `started_at` (a time.monotonic() reading
+        taken when the request started) enables the first byte / first
+        chunk timings.
+        """
+        token = next(session._tokens)
+        session.readers[token] = last_event_id
+        if session.expiry is not None:
+            session.expiry.cancel()
+            session.expiry = None
+        if last_event_id:
+            self.resumes += 1
+            if session.frames and session.frames[0][0] > last_event_id + 1:
+                self.replay_gaps += 1  # oldest missed frames are gone
+        replaying = last_event_id < session.last_id
+        sent_frame = sent_chunk = started_at is None
+        sent_at = checked_at = time.monotonic()
+
+        async def client_gone() -> bool:
+            nonlocal checked_at
+            if request is None or time.monotonic() - checked_at < self.disconnect_poll:
+                return False
+            checked_at = time.monotonic()
+            return await request.is_disconnected()
+
+        poll = min(self.heartbeat, self.disconnect_poll) if request is not None else self.heartbeat
+        try:
+            while True:
+                if token not in session.readers:
+                    return  # detached for lagging; the client resumes from its last id
+                frames = session.frames_after(session.readers[token])
+                if frames:
+                    for frame_id, frame in frames:
+                        if replaying:
+                            self.replayed_frames += 1
+                        self.frames_out += 1
+                        self.bytes_out += len(frame)
+                        if not sent_frame:
+                            sent_frame = True
+                            self._first_frame.append(time.monotonic() - started_at)
+                        if not sent_chunk and frame.startswith(_CHUNK_PREFIX, frame.index(b"\n") + 1):
+                            sent_chunk = True
+                            self._first_chunk.append(time.monotonic() - started_at)
+                        yield frame
+                        if token not in session.readers:
+                            return
+                        session.readers[token] = frame_id
+                        session.notify()
+                    sent_at = time.monotonic()
+                    replaying = False
+                    if await client_gone():
+                        return
+                    continue
+                if session.finished:
+                    return
+                if not await session.wait(poll):
+                    if await client_gone():
+                        return
+                    if time.monotonic() - sent_at >= self.heartbeat:
+                        self.heartbeats += 1
+                        self.bytes_out += len(_HEARTBEAT)
+                        sent_at = time.monotonic()
+                        yield _HEARTBEAT
+        finally:
+            if not session.finished:
+                self.disconnected += 1
+            session.readers.pop(token, None)
+            session.notify()
+            if not session.readers:
+                self._schedule_expiry(session)
+
+    def stats(self) -> dict:
+        return {
+            "active_streams": self.active,
+            "sessions": len(self._sessions),
+            "attached_readers": sum(len(s.readers) for s in self._sessions.values()),
+            "streams": self.streams,
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+            "abandoned_tokens_saved_estimate": self.abandoned_tokens_saved,
+            "avg_output_tokens_estimate": round(self._avg_output_chars() / self.CHARS_PER_TOKEN),
+            "cleanup_failures": self.cleanup_failures,
+            "disconnected": self.disconnected,
+            "resumes": self.resumes,
+            "replayed_frames": self.replayed_frames,
+            "replay_gaps": self.replay_gaps,
+            "chunks_in": self.chunks_in,
+            "frames_out": self.frames_out,
+            "bytes_out": self.bytes_out,
+            "heartbeats": self.heartbeats,
+            "backpressure_waits": self.backpressure_waits,
+            "readers_dropped": self.readers_dropped,
+            "ttfb_p50_seconds": self._percentile(self._first_frame, 50),
+            "ttfb_p95_seconds": self._percentile(self._first_frame, 95),
+            "first_chunk_p50_seconds": self._percentile(self._first_chunk, 50),
+            "first_chunk_p95_seconds": self._percentile(self._first_chunk, 95),
+            "window_seconds": self.window,
+            "max_bytes": self.max_bytes,
+            "max_queued": self.max_queued,
+            "grace_seconds": self.grace,
+            "disconnect_poll_seconds": self.disconnect_poll,
+            "stall_timeout_seconds": self.stall_timeout,
+        }
+
+    # ── Internals ────────────────────────────────────
+    async def _produce(self, session: StreamSession, events: AsyncIterator[tuple[str, object]]) -> None:
+        loop = asyncio.get_running_loop()
+        buffer: list[str] = []
+        size = 0
+        flush_at = 0.0
+        pending: asyncio.Future | None = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(events.__anext__())
+                timeout = max(0.0, flush_at - loop.time()) if buffer else None
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    # Window elapsed with fragments buffered; keep waiting on `pending`
+                    await self._append(session, self._chunk_frame(buffer))
+                    buffer, size = [], 0
+                    continue
+
+                future, pending = pending, None
+                try:
+                    event_type, data = future.result()
+                except StopAsyncIteration:
+                    break
+
+                if event_type == "chunk":
+                    self.chunks_in += 1
+                    session.output_chars += len(data)
+                    if not buffer:
+                        flush_at = loop.time() + self.window
+                    buffer.append(data)
+                    size += len(data.encode())
+                    if size >= self.max_bytes:
+                        await self._append(session, self._chunk_frame(buffer))
+                        buffer, size = [], 0
+                    continue
+
+                if buffer:
+                    await self._append(session, self._chunk_frame(buffer))
+                    buffer, size = [], 0
+                if event_type == "done":
+                    self._output_chars.append(session.output_chars)
+                await self._append(session, sse_event(event_type, data).encode())
+
+            if buffer:
+                await self._append(session, self._chunk_frame(buffer))
+            self.completed += 1
+        except Exception as e:
+            print(f"SSE stream {session.key} failed: {e}")
+            session.append(sse_event("error", f"Streaming failed: {str(e)}").encode())
+        finally:
+            self.active -= 1
+            session.finished = True
+            session.notify()
+            if not session.readers:
+                self._schedule_expiry(session)
+            if pending is not None:
+                pending.cancel()
+                with suppress(BaseException):
+                    await pending
+            await events.aclose()
+
+    async def _append(self, session: StreamSession, frame: bytes) -> None:
+        if session.lagging(self.max_queued):
+            self.backpressure_waits += 1
+            deadline = time.monotonic() + self.stall_timeout
+            while session.lagging(self.max_queued):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._drop_lagging(session)
+                    break
+                await session.wait(remaining)
+        session.append(frame)
+
+    def _drop_lagging(self, session: StreamSession) -> None:
+        """Detach readers still more than `max_queued` frames behind."""
+        floor = session.last_id - self.max_queued
+        for token in [t for t, last_id in session.readers.items() if last_id < floor]:
+            del session.readers[token]
+            self.readers_dropped += 1
+        session.notify()
+        if not session.readers:
+            self._schedule_expiry(session)
+
+    def _schedule_expiry(self, session: StreamSession, delay: float | None = None) -> None:
+        if session.expiry is not None:
+            session.expiry.cancel()
+        delay = self.grace if delay is None else delay
+        session.expiry = asyncio.get_running_loop().call_later(delay, self._expire, session)
+
+    def _expire(self, session: StreamSession) -> None:
+        """Grace period over with nobody attached: stop generating, forget the frames."""
+        session.expiry = None
+        if session.readers:
+            return
+        if not session.finished and session.task is not None:
+            session.task.cancel()
+            self.abandoned += 1
+            expected = self._avg_output_chars()
+            self.abandoned_tokens_saved += int(max(0, expected - session.output_chars) / self.CHARS_PER_TOKEN)
+            cleanup = asyncio.create_task(self._abandon(session))
+            self._cleanups.add(cleanup)
+            cleanup.add_done_callback(self._cleanups.discard)
+        if self._sessions.get(session.key) is session:
+            del self._sessions[session.key]
+
+    async def _abandon(self, session: StreamSession) -> None:
+        with suppress(asyncio.CancelledError):
+            await session.task  # let the producer unwind (closes the Gemini stream)
+        if session.on_abandon is None:
+            return
+        try:
+            await session.on_abandon()
+        except Exception as e:
+            self.cleanup_failures += 1
+            print(f"Cleanup of abandoned stream {session.key} failed: {e}")
+
+    def _avg_output_chars(self) -> float:
+        return sum(self._output_chars) / len(self._output_chars) if self._output_chars else 0.0
+
+    @staticmethod
+    def _percentile(samples: deque, percentile: float) -> float:
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return round(ordered[index], 4)
+
+    @staticmethod
+    def _chunk_frame(buffer: list[str]) -> bytes:
+        return sse_event("chunk", "".join(buffer)).encode()
+
+
+@lru_cache()
+def get_sse_streamer() -> SSEStreamer:
+    """Process-wide SSE streamer — created once, shared by every stream."""
+    settings = get_settings()
+    return SSEStreamer(
+        window=settings.SSE_COALESCE_WINDOW_SECONDS,
+        max_bytes=settings.SSE_COALESCE_MAX_BYTES,
+        heartbeat=settings.SSE_HEARTBEAT_SECONDS,
+        max_queued=settings.SSE_MAX_QUEUED_FRAMES,
+        replay_max_events=settings.SSE_REPLAY_MAX_EVENTS,
+        replay_max_bytes=settings.SSE_REPLAY_MAX_BYTES,
+        grace=settings.SSE_RESUME_GRACE_SECONDS,
+        disconnect_poll=settings.SSE_DISCONNECT_POLL_SECONDS,
+        stall_timeout=settings.SSE_READER_STALL_SECONDS,
+    )
@@ -0,0 +1,99 @@
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from jose import jwt, JWTError
+from app.config import get_settings
+from app.services.jwks_store import JWKSKeyStore, get_jwks_store
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens without leaving the process.
+
+    - HS256 tokens are checked locally against SUPABASE_JWT_SECRET.
+    - ES256 / RS256 tokens are checked against parsed public keys
+      from the cached JWKS store.
+    - Successfully verified tokens are remembered in a bounded LRU
+      keyed by the SHA-256 digest of the token (raw tokens are never kept).
+      Each entry expires at the token's own `exp`, so a cached hit is
+      never valid for longer than the token itself.
+    """
+
+    ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+    AUDIENCE = "authenticated"
+
+    def __init__(self, jwt_secret: str, jwks_store: JWKSKeyStore, cache_size: int):
+        self.jwt_secret = jwt_secret
+        self.jwks_store = jwks_store
+        self.cache_size = cache_size
+        # digest → (exp, claims)
+        self._cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def verify(self, token: str) -> dict:
+        """Return the verified claims for `token` or raise JWTError."""
+        digest = hashlib.sha256(token.encode()).hexdigest()
+
+        cached = self._cache.get(digest)
+        if cached is not None:
+            exp, claims = cached
+            if exp > time.time():
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return claims
+            del self._cache[digest]
+
+        self.misses += 1
+        claims = await self._decode(token)
+        self._remember(digest, claims)
+        return claims
+
+    def clear(self) -> None:
+        """Forget every cached verification result."""
+        self._cache.clear()
+
+    # ── Internals ────────────────────────────────────
+    async def _decode(self, token: str) -> dict:
+        header = jwt.get_unverified_header(token)
+        alg = header.get("alg")
+
+        if alg == "HS256":
+            if not self.jwt_secret:
+                raise JWTError("HS256 tokens are not accepted: no JWT secret configured.")
+            key = self.jwt_secret
+        elif alg in self.ASYMMETRIC_ALGORITHMS:
+            key = await self.jwks_store.get_signing_key(header.get("kid"), alg)
+            if key is None:
+                raise JWTError("No matching signing key for token.")
+        else:
+            raise JWTError(f"Unsupported token algorithm: {alg}")
+
+        return jwt.decode(
+            token,
+            key=key,
+            algorithms=[alg],
+            audience=self.AUDIENCE,
+        )
+
+    def _remember(self, digest: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.cache_size <= 0:
+            return  # tokens without an expiry are never cached
+
+        self._cache[digest] = (float(exp), claims)
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+@lru_cache()
+def get_token_verifier() -> TokenVerifier:
+    """Process-wide token verifier — created once, reused by every request."""
+    settings = get_settings()
+    return TokenVerifier(
+        jwt_secret=settings.SUPABASE_JWT_SECRET,
+        jwks_store=get_jwks_store(),
+        cache_size=settings.AUTH_CLAIMS_CACHE_SIZE,
+    )
@@ -1,4 +1,7 @@
-from supabase import create_client, Client
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from supabase import create_client, Client, ClientOptions
 from app.config import get_settings
 
 settings = get_settings()
@@ -9,3 +12,44 @@ supabase: Client = create_client(
     settings.SUPABASE_URL,
     settings.SUPABASE_SERVICE_ROLE_KEY
 )
+
+
+def create_session_client() -> Client:
+    """
+    Short-lived client for calls that act as a user (set_session and then
+    user-scoped auth calls). The auth session lives on the client, so
+    these must never run on the shared `supabase` client: concurrent
+    requests would overwrite each other's session.
+    """
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_SERVICE_ROLE_KEY,
+        options=ClientOptions(auto_refresh_token=False, persist_session=False),
+    )
+
+# The supabase-py client is synchronous. Every call goes through this
+# bounded executor so a slow PostgREST query only occupies one DB thread
+# instead of freezing the event loop. Size it at or below the HTTP pool
+# of the underlying client so threads never queue on connections.
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.SUPABASE_EXECUTOR_WORKERS,
+    thread_name_prefix="supabase",
+)
+
+
+async def run_sync(fn, *args, **kwargs):
+    """Run a blocking Supabase call (auth, storage, ...) on the DB executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(fn, *args, **kwargs))
+
+
+async def execute(query):
+    """
+    Await a PostgREST query builder without blocking the event loop.
+
+    Usage:
+        response = await execute(
+            supabase.table("projects").select("*").eq("id", project_id)
+        )
+    """
+    return await run_sync(query.execute)
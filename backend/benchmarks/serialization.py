@@ -0,0 +1,105 @@
+"""
+Serialization benchmark for the project detail response and SSE frames.
+
+    cd backend && python -m benchmarks.serialization
+
+Builds a project with 5 modules × 10 tasks (50 tasks) shaped like a
+GET /api/projects/{id} response and times, per response:
+
+- what FastAPI does for a `response_model` route (validate + serialize
+  with pydantic), then rendering with the stdlib JSONResponse vs
+  FastJSONResponse;
+- one SSE `chunk` frame encoded with json.dumps + f-string vs sse_event().
+
+No database or environment variables needed.
+"""
+import json
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from fastapi.responses import JSONResponse
+from app.responses import FastJSONResponse, orjson, sse_event
+from app.schemas.project import ProjectWithRoadmap
+
+
+def build_project(modules: int = 5, tasks_per_module: int = 10) -> dict:
+    now = datetime.now(timezone.utc)
+    project_id = str(uuid.uuid4())
+    return {
+        "id": project_id,
+        "user_id": str(uuid.uuid4()),
+        "title": "Realtime collaborative whiteboard",
+        "description": "A multi-user whiteboard with presence, undo history and export. " * 3,
+        "tech_stack": ["Next.js", "FastAPI", "PostgreSQL", "Redis", "WebSockets"],
+        "planning_mode": "deadline",
+        "deadline_date": (date.today() + timedelta(days=90)).isoformat(),
+        "working_hours_per_day": 6,
+        "status": "active",
+        "created_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "llm_raw_response": None,
+        "modules": [
+            {
+                "id": (module_id := str(uuid.uuid4())),
+                "project_id": project_id,
+                "title": f"Module {m + 1}: Core feature set",
+                "description": "Build, test and document this part of the product. " * 2,
+                "order_index": m,
+                "status": "in_progress" if m == 0 else "pending",
+                "estimated_days": 9,
+                "start_date": (date.today() + timedelta(days=m * 9)).isoformat(),
+                "end_date": (date.today() + timedelta(days=m * 9 + 8)).isoformat(),
+                "created_at": now.isoformat(),
+                "tasks": [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "module_id": module_id,
+                        "project_id": project_id,
+                        "title": f"Task {t + 1}: implement and test the endpoint",
+                        "description": "Write the handler, validation, tests and docs. ✅",
+                        "order_index": t,
+                        "status": "completed" if (m == 0 and t < 4) else "pending",
+                        "estimated_hours": 4.5,
+                        "deadline": (date.today() + timedelta(days=m * 9 + t)).isoformat(),
+                        "completed_at": now.isoformat() if (m == 0 and t < 4) else None,
+                        "created_at": now.isoformat(),
+                    }
+                    for t in range(tasks_per_module)
+                ],
+            }
+            for m in range(modules)
+        ],
+    }
+
+
+def per_call_us(fn, number: int) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main() -> None:
+    project = build_project()
+    payload = ProjectWithRoadmap.model_validate(project).model_dump(mode="json")
+    n = 2000
+
+    model_us = per_call_us(lambda: ProjectWithRoadmap.model_validate(project).model_dump(mode="json"), n)
+    stdlib_us = per_call_us(lambda: JSONResponse(payload).body, n)
+    fast_us = per_call_us(lambda: FastJSONResponse(payload).body, n)
+
+    chunk = 'ect description", "tasks": [{"title": "Set up'
+    sse_old_us = per_call_us(lambda: f"data: {json.dumps({'type': 'chunk', 'data': chunk})}\n\n", n * 10)
+    sse_new_us = per_call_us(lambda: sse_event("chunk", chunk), n * 10)
+
+    encoder = f"orjson {orjson.__version__}" if orjson is not None else "stdlib fallback (orjson not installed)"
+    print(f"Project detail: 50 tasks, {len(JSONResponse(payload).body):,} bytes — FastJSONResponse uses {encoder}")
+    print(f"  response_model validate + serialize   {model_us:8.1f} µs")
+    print(f"  render, JSONResponse (json.dumps)     {stdlib_us:8.1f} µs")
+    print(f"  render, FastJSONResponse              {fast_us:8.1f} µs   ({stdlib_us / fast_us:.1f}x)")
+    print(f"  total per response                    {model_us + stdlib_us:8.1f} µs → {model_us + fast_us:.1f} µs")
+    print("SSE chunk frame")
+    print(f"  f-string + json.dumps                 {sse_old_us:8.2f} µs")
+    print(f"  sse_event()                           {sse_new_us:8.2f} µs   ({sse_old_us / sse_new_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
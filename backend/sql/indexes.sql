@@ -0,0 +1,16 @@
+-- Indexes backing the API's hot read paths. Safe to re-run.
+
+-- GET /api/projects: keyset pagination on (created_at, id), newest first,
+-- filtered by user (ProjectService.get_projects)
+CREATE INDEX IF NOT EXISTS projects_user_created_id_idx
+    ON public.projects (user_id, created_at DESC, id DESC);
+
+-- GET /api/projects/deadlines: open tasks with a deadline, soonest first
+-- (ProjectService.get_upcoming_deadlines). Partial, so completed tasks and
+-- tasks without a deadline don't take up space; kept current by Postgres.
+-- It leads with project_id, so it only narrows the scan to the user's
+-- projects: their open tasks are still all read and sorted. For an index
+-- that serves the order directly, see sql/tasks_user_id.sql.
+CREATE INDEX IF NOT EXISTS tasks_open_deadline_idx
+    ON public.tasks (project_id, deadline, id)
+    WHERE status <> 'completed' AND deadline IS NOT NULL;
@@ -0,0 +1,238 @@
+-- Incrementally maintained progress counters for modules and projects.
+-- Read by ProjectService.get_progress when PROGRESS_COUNTERS=true.
+--
+-- Statement-level triggers on public.tasks turn every insert / update /
+-- delete into per-module deltas (+1 for new rows, -1 for old rows), so a
+-- bulk roadmap insert or a batch status update costs one upsert per
+-- touched module, and reading progress never scans tasks.
+-- Module status and project status are rolled up from the counters:
+--   module:  all tasks completed → 'completed', any started → 'in_progress', else 'pending'
+--   project: 'active' ↔ 'completed' (never touches 'planning' / 'archived')
+-- Safe to re-run: the last section recomputes every counter from tasks.
+--
+-- The delta helper lives in the `private` schema, which PostgREST doesn't
+-- expose: only the trigger calls it. Counter tables have RLS enabled with
+-- no policies, so only the backend (service_role) and the triggers
+-- (SECURITY DEFINER, run as the owner) can read or write them.
+
+CREATE TABLE IF NOT EXISTS public.module_progress (
+    module_id UUID PRIMARY KEY REFERENCES public.modules(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES public.projects(id) ON DELETE CASCADE,
+    pending INT NOT NULL DEFAULT 0,
+    in_progress INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    blocked INT NOT NULL DEFAULT 0,
+    hours_total NUMERIC NOT NULL DEFAULT 0,
+    hours_done NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS module_progress_project_idx ON public.module_progress (project_id);
+
+CREATE TABLE IF NOT EXISTS public.project_progress (
+    project_id UUID PRIMARY KEY REFERENCES public.projects(id) ON DELETE CASCADE,
+    pending INT NOT NULL DEFAULT 0,
+    in_progress INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    blocked INT NOT NULL DEFAULT 0,
+    hours_total NUMERIC NOT NULL DEFAULT 0,
+    hours_done NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE public.module_progress ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.project_progress ENABLE ROW LEVEL SECURITY;
+
+CREATE SCHEMA IF NOT EXISTS private;
+REVOKE ALL ON SCHEMA private FROM PUBLIC, anon, authenticated;
+
+-- Earlier versions of this file created the helper in public
+DROP FUNCTION IF EXISTS public.apply_task_progress(JSONB);
+
+
+-- Apply a set of task deltas: [{module_id, project_id, status, hours, sign}, ...]
+-- One statement: the status roll-ups read the new counters via RETURNING.
+CREATE OR REPLACE FUNCTION private.apply_task_progress(p_delta JSONB)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+    WITH delta AS (
+        SELECT module_id,
+               project_id,
+               COALESCE(SUM(sign) FILTER (WHERE status = 'pending'), 0) AS pending,
+               COALESCE(SUM(sign) FILTER (WHERE status = 'in_progress'), 0) AS in_progress,
+               COALESCE(SUM(sign) FILTER (WHERE status = 'completed'), 0) AS completed,
+               COALESCE(SUM(sign) FILTER (WHERE status = 'blocked'), 0) AS blocked,
+               COALESCE(SUM(sign * COALESCE(hours, 0)), 0) AS hours_total,
+               COALESCE(SUM(sign * COALESCE(hours, 0)) FILTER (WHERE status = 'completed'), 0) AS hours_done
+        FROM jsonb_to_recordset(COALESCE(p_delta, '[]'::jsonb))
+            AS d(module_id UUID, project_id UUID, status TEXT, hours NUMERIC, sign INT)
+        GROUP BY module_id, project_id
+    ),
+    -- Modules/projects removed by a cascading delete are skipped (EXISTS)
+    module_counts AS (
+        INSERT INTO public.module_progress AS mp
+            (module_id, project_id, pending, in_progress, completed, blocked, hours_total, hours_done)
+        SELECT module_id, project_id, pending, in_progress, completed, blocked, hours_total, hours_done
+        FROM delta
+        WHERE EXISTS (SELECT 1 FROM public.modules m WHERE m.id = delta.module_id)
+        ON CONFLICT (module_id) DO UPDATE SET
+            pending = mp.pending + EXCLUDED.pending,
+            in_progress = mp.in_progress + EXCLUDED.in_progress,
+            completed = mp.completed + EXCLUDED.completed,
+            blocked = mp.blocked + EXCLUDED.blocked,
+            hours_total = mp.hours_total + EXCLUDED.hours_total,
+            hours_done = mp.hours_done + EXCLUDED.hours_done,
+            updated_at = now()
+        RETURNING module_id,
+                  CASE
+                      WHEN completed > 0 AND completed = pending + in_progress + completed + blocked THEN 'completed'
+                      WHEN completed > 0 OR in_progress > 0 THEN 'in_progress'
+                      ELSE 'pending'
+                  END AS rolled_up_status
+    ),
+    project_counts AS (
+        INSERT INTO public.project_progress AS pp
+            (project_id, pending, in_progress, completed, blocked, hours_total, hours_done)
+        SELECT project_id, SUM(pending), SUM(in_progress), SUM(completed), SUM(blocked),
+               SUM(hours_total), SUM(hours_done)
+        FROM delta
+        WHERE EXISTS (SELECT 1 FROM public.projects p WHERE p.id = delta.project_id)
+        GROUP BY project_id
+        ON CONFLICT (project_id) DO UPDATE SET
+            pending = pp.pending + EXCLUDED.pending,
+            in_progress = pp.in_progress + EXCLUDED.in_progress,
+            completed = pp.completed + EXCLUDED.completed,
+            blocked = pp.blocked + EXCLUDED.blocked,
+            hours_total = pp.hours_total + EXCLUDED.hours_total,
+            hours_done = pp.hours_done + EXCLUDED.hours_done,
+            updated_at = now()
+        RETURNING project_id,
+                  CASE
+                      WHEN completed > 0 AND completed = pending + in_progress + completed + blocked THEN 'completed'
+                      ELSE 'active'
+                  END AS rolled_up_status
+    ),
+    module_status AS (
+        UPDATE public.modules m
+        SET status = mc.rolled_up_status
+        FROM module_counts mc
+        WHERE m.id = mc.module_id
+          AND m.status IS DISTINCT FROM mc.rolled_up_status
+        RETURNING m.id
+    )
+    -- Projects only move between 'active' and 'completed'
+    UPDATE public.projects p
+    SET status = pc.rolled_up_status
+    FROM project_counts pc
+    WHERE p.id = pc.project_id
+      AND p.status IN ('active', 'completed')
+      AND p.status IS DISTINCT FROM pc.rolled_up_status;
+$$;
+
+REVOKE EXECUTE ON FUNCTION private.apply_task_progress(JSONB) FROM PUBLIC, anon, authenticated, service_role;
+
+
+-- One function for all three statement triggers. Transition tables only
+-- exist for the matching operation; plpgsql plans each branch lazily, so
+-- the branches that reference a missing one are never prepared.
+CREATE OR REPLACE FUNCTION public.tasks_progress_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    delta JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(jsonb_build_object(
+            'module_id', module_id, 'project_id', project_id,
+            'status', status, 'hours', estimated_hours, 'sign', 1))
+        INTO delta
+        FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT jsonb_agg(d)
+        INTO delta
+        FROM (
+            SELECT jsonb_build_object(
+                'module_id', module_id, 'project_id', project_id,
+                'status', status, 'hours', estimated_hours, 'sign', 1) AS d
+            FROM new_rows
+            UNION ALL
+            SELECT jsonb_build_object(
+                'module_id', module_id, 'project_id', project_id,
+                'status', status, 'hours', estimated_hours, 'sign', -1)
+            FROM old_rows
+        ) changes;
+    ELSE
+        SELECT jsonb_agg(jsonb_build_object(
+            'module_id', module_id, 'project_id', project_id,
+            'status', status, 'hours', estimated_hours, 'sign', -1))
+        INTO delta
+        FROM old_rows;
+    END IF;
+
+    PERFORM private.apply_task_progress(delta);
+    RETURN NULL;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.tasks_progress_trigger() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS tasks_progress_insert ON public.tasks;
+CREATE TRIGGER tasks_progress_insert
+    AFTER INSERT ON public.tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.tasks_progress_trigger();
+
+DROP TRIGGER IF EXISTS tasks_progress_update ON public.tasks;
+CREATE TRIGGER tasks_progress_update
+    AFTER UPDATE ON public.tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.tasks_progress_trigger();
+
+DROP TRIGGER IF EXISTS tasks_progress_delete ON public.tasks;
+CREATE TRIGGER tasks_progress_delete
+    AFTER DELETE ON public.tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.tasks_progress_trigger();
+
+
+-- Backfill / repair: recompute every counter from the tasks table
+INSERT INTO public.module_progress AS mp
+    (module_id, project_id, pending, in_progress, completed, blocked, hours_total, hours_done)
+SELECT module_id,
+       project_id,
+       COUNT(*) FILTER (WHERE status = 'pending'),
+       COUNT(*) FILTER (WHERE status = 'in_progress'),
+       COUNT(*) FILTER (WHERE status = 'completed'),
+       COUNT(*) FILTER (WHERE status = 'blocked'),
+       COALESCE(SUM(estimated_hours), 0),
+       COALESCE(SUM(estimated_hours) FILTER (WHERE status = 'completed'), 0)
+FROM public.tasks
+GROUP BY module_id, project_id
+ON CONFLICT (module_id) DO UPDATE SET
+    pending = EXCLUDED.pending,
+    in_progress = EXCLUDED.in_progress,
+    completed = EXCLUDED.completed,
+    blocked = EXCLUDED.blocked,
+    hours_total = EXCLUDED.hours_total,
+    hours_done = EXCLUDED.hours_done,
+    updated_at = now();
+
+INSERT INTO public.project_progress AS pp
+    (project_id, pending, in_progress, completed, blocked, hours_total, hours_done)
+SELECT project_id, SUM(pending), SUM(in_progress), SUM(completed), SUM(blocked), SUM(hours_total), SUM(hours_done)
+FROM public.module_progress
+GROUP BY project_id
+ON CONFLICT (project_id) DO UPDATE SET
+    pending = EXCLUDED.pending,
+    in_progress = EXCLUDED.in_progress,
+    completed = EXCLUDED.completed,
+    blocked = EXCLUDED.blocked,
+    hours_total = EXCLUDED.hours_total,
+    hours_done = EXCLUDED.hours_done,
+    updated_at = now();
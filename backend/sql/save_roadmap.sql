@@ -0,0 +1,55 @@
+-- Persist a generated roadmap in one transaction.
+-- Called by LLMService.save_roadmap_to_db when ROADMAP_SAVE_RPC=true.
+--
+-- p_modules / p_tasks are the rows built by LLMService._build_roadmap_rows
+-- (module ids are generated by the backend, tasks reference them).
+-- Returns the created modules, each with its tasks, ordered by order_index.
+--
+-- No ownership check: only the backend (service_role) may call this, see
+-- the REVOKE at the end. Every table reference is schema-qualified.
+CREATE OR REPLACE FUNCTION public.save_roadmap(
+    p_project_id UUID,
+    p_roadmap JSONB,
+    p_modules JSONB,
+    p_tasks JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+BEGIN
+    INSERT INTO public.modules
+        (id, project_id, title, description, order_index, estimated_days, start_date, end_date, status)
+    SELECT id, p_project_id, title, description, order_index, estimated_days, start_date, end_date, status
+    FROM jsonb_populate_recordset(NULL::public.modules, p_modules);
+
+    INSERT INTO public.tasks
+        (module_id, project_id, title, description, order_index, estimated_hours, deadline, status)
+    SELECT module_id, p_project_id, title, description, order_index, estimated_hours, deadline, status
+    FROM jsonb_populate_recordset(NULL::public.tasks, p_tasks);
+
+    UPDATE public.projects
+    SET llm_raw_response = p_roadmap, status = 'active'
+    WHERE id = p_project_id;
+
+    RETURN COALESCE((
+        SELECT jsonb_agg(
+            to_jsonb(m) || jsonb_build_object(
+                'tasks',
+                COALESCE((
+                    SELECT jsonb_agg(to_jsonb(t) ORDER BY t.order_index)
+                    FROM public.tasks t
+                    WHERE t.module_id = m.id
+                ), '[]'::jsonb)
+            )
+            ORDER BY m.order_index
+        )
+        FROM public.modules m
+        WHERE m.project_id = p_project_id
+    ), '[]'::jsonb);
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.save_roadmap(UUID, JSONB, JSONB, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.save_roadmap(UUID, JSONB, JSONB, JSONB) TO service_role;
@@ -0,0 +1,61 @@
+-- Denormalized owner on tasks, for the deadlines view.
+-- Read by ProjectService.get_upcoming_deadlines and update_task_statuses
+-- (which filters its UPDATEs on it instead of checking the project first)
+-- when TASK_USER_ID_COLUMN=true.
+--
+-- GET /api/projects/deadlines wants the N soonest open tasks of one user.
+-- Through projects!inner the owner lives on another table, so no tasks
+-- index can serve "this user, ordered by deadline": every open task of
+-- every project of the user is read and sorted before the LIMIT applies.
+-- With user_id on the row, (user_id, deadline, id) returns the first N
+-- in index order and stops.
+--
+-- user_id is filled in by a trigger from the task's project, so the
+-- backend's inserts (bulk inserts and the save_roadmap RPC) don't change.
+-- A project's owner never changes, so nothing propagates the other way.
+-- Safe to re-run.
+
+ALTER TABLE public.tasks ADD COLUMN IF NOT EXISTS user_id UUID;
+
+CREATE OR REPLACE FUNCTION public.tasks_set_user_id()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+BEGIN
+    SELECT p.user_id INTO NEW.user_id
+    FROM public.projects p
+    WHERE p.id = NEW.project_id;
+    RETURN NEW;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.tasks_set_user_id() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS tasks_set_user_id ON public.tasks;
+CREATE TRIGGER tasks_set_user_id
+    BEFORE INSERT OR UPDATE OF project_id ON public.tasks
+    FOR EACH ROW EXECUTE FUNCTION public.tasks_set_user_id();
+
+-- Backfill rows written before the trigger existed
+UPDATE public.tasks t
+SET user_id = p.user_id
+FROM public.projects p
+WHERE p.id = t.project_id
+  AND t.user_id IS DISTINCT FROM p.user_id;
+
+-- Open tasks with a deadline, per user, soonest first
+CREATE INDEX IF NOT EXISTS tasks_user_open_deadline_idx
+    ON public.tasks (user_id, deadline, id)
+    WHERE status <> 'completed' AND deadline IS NOT NULL;
+
+-- Expected plan for the deadlines query (limit 10):
+--   Limit
+--     -> Nested Loop
+--          -> Index Scan using tasks_user_open_deadline_idx on tasks
+--               Index Cond: (user_id = $1)
+--          -> Index Scan using projects_pkey on projects
+--               Index Cond: (id = tasks.project_id)
+-- i.e. no Sort node: at most `limit` index entries are read, however many
+-- projects and tasks the user has.
@@ -0,0 +1,36 @@
+-- Update the status of one or more tasks of a project, checking that the
+-- project belongs to the user in the same statement.
+-- Called by ProjectService.update_task_statuses when TASK_UPDATE_RPC=true.
+--
+-- p_updates is a JSON array of {"task_id": ..., "status": ...}.
+-- completed_at is set when a task becomes completed and cleared otherwise.
+-- Returns the updated task rows (none if the project isn't the user's).
+--
+-- p_user_id is trusted: only the backend (service_role) may call this.
+-- Without the REVOKE below, PostgREST would expose it to the anon key as
+-- /rest/v1/rpc/update_task_statuses and anyone could pass any user id.
+CREATE OR REPLACE FUNCTION public.update_task_statuses(
+    p_user_id UUID,
+    p_project_id UUID,
+    p_updates JSONB
+)
+RETURNS SETOF public.tasks
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+    UPDATE public.tasks AS t
+    SET status = u.status,
+        completed_at = CASE WHEN u.status = 'completed' THEN now() ELSE NULL END
+    FROM jsonb_to_recordset(p_updates) AS u(task_id UUID, status TEXT)
+    WHERE t.id = u.task_id
+      AND t.project_id = p_project_id
+      AND EXISTS (
+          SELECT 1 FROM public.projects AS p
+          WHERE p.id = p_project_id AND p.user_id = p_user_id
+      )
+    RETURNING t.*;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.update_task_statuses(UUID, UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.update_task_statuses(UUID, UUID, JSONB) TO service_role;
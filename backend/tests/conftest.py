@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+# app.config reads these at import time; the units under test never talk
+# to Supabase, so placeholders are enough when no .env is present.
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+# supabase-py only checks that the key looks like a JWT
+os.environ.setdefault(
+    "SUPABASE_SERVICE_ROLE_KEY",
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.test",
+)
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+
+
+class _JWKSServer:
+    """Local JWKS endpoint: serves `jwks` (or `status` if not 200) and counts requests."""
+
+    def __init__(self):
+        self.jwks: dict = {"keys": []}
+        self.status = 200
+        self.requests = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps(server.jwks).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/auth/v1/.well-known/jwks.json"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def jwks_server():
+    server = _JWKSServer()
+    yield server
+    server.close()
+
+
+class _SigningKey:
+    """An ES256 key pair: `public_jwk` goes in the JWKS, `sign()` makes tokens."""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        private = ec.generate_private_key(ec.SECP256R1())
+        self.private_pem = private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        self.public_jwk = {**jwk.construct(public_pem, "ES256").to_dict(), "kid": kid, "alg": "ES256"}
+
+    def sign(self, claims: dict) -> str:
+        return jwt.encode(claims, self.private_pem, algorithm="ES256", headers={"kid": self.kid})
+
+
+@pytest.fixture
+def signing_key():
+    """Factory: signing_key("kid-1") → a fresh ES256 key with that kid."""
+    return _SigningKey
+
+
+class _PostgREST:
+    """
+    Answers the supabase client's PostgREST calls in-process.
+    `routes[(method, table)] = handler(request)` returns a JSON body (or an
+    httpx.Response); unrouted calls get []. Every request is recorded.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests: list[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        table = request.url.path.rsplit("/", 1)[-1]
+        handler = self.routes.get((request.method, table))
+        body = handler(request) if handler else []
+        return body if isinstance(body, httpx.Response) else httpx.Response(200, json=body)
+
+    def calls(self, method: str, table: str) -> list[httpx.Request]:
+        return [r for r in self.requests if r.method == method and r.url.path.endswith(f"/{table}")]
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    from app.services.project_tree_cache import get_project_tree_cache
+    from app.supabase_client import supabase
+
+    fake = _PostgREST()
+    monkeypatch.setattr(supabase.postgrest.session, "_transport", httpx.MockTransport(fake.handle))
+    get_project_tree_cache().clear()
+    yield fake
+    get_project_tree_cache().clear()
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import gemini_policy
+from app.services.gemini_policy import GeminiCallPolicy
+
+
+def make_policy() -> GeminiCallPolicy:
+    return GeminiCallPolicy(SimpleNamespace(
+        LLM_RETRY_BASE_DELAY_SECONDS=0.5,
+        LLM_RETRY_MAX_DELAY_SECONDS=8,
+    ))
+
+
+@pytest.fixture
+def max_jitter(monkeypatch):
+    """Make random.uniform return its upper bound."""
+    monkeypatch.setattr(gemini_policy.random, "uniform", lambda low, high: high)
+
+
+def test_backoff_is_full_jitter_within_ceiling():
+    policy = make_policy()
+    for attempt in range(6):
+        ceiling = min(8, 0.5 * 2 ** attempt)
+        for _ in range(50):
+            assert 0 <= policy._backoff(attempt, None) <= ceiling
+
+
+def test_backoff_ceiling_grows_then_caps(max_jitter):
+    policy = make_policy()
+    assert [policy._backoff(a, None) for a in range(6)] == [0.5, 1, 2, 4, 8, 8]
+
+
+def test_backoff_waits_at_least_retry_after(max_jitter):
+    policy = make_policy()
+    assert policy._backoff(0, 3) == 3
+    assert policy._backoff(4, 3) == 8  # own backoff already longer
+    assert policy._backoff(0, 8) == 8
+
+
+def test_backoff_gives_up_on_long_retry_after():
+    assert make_policy()._backoff(0, 30) is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2", 2.0),
+    ("0.5", 0.5),
+    ("-1", 0.0),
+    ("", None),
+    (None, None),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", None),
+])
+def test_parse_retry_after(value, expected):
+    assert GeminiCallPolicy._parse_retry_after(value) == expected
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.idempotency import IdempotencyStore
+
+
+USER = "user-1"
+SCOPE = "create"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_fingerprint_ignores_key_order():
+    a = IdempotencyStore.fingerprint({"name": "x", "hours": 3})
+    b = IdempotencyStore.fingerprint({"hours": 3, "name": "x"})
+    assert a == b
+    assert a != IdempotencyStore.fingerprint({"name": "x", "hours": 4})
+
+
+def test_concurrent_claims_join_the_first():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, created = store.claim(USER, SCOPE, None, "fp")
+        joined, joined_created = store.claim(USER, SCOPE, None, "fp")
+        assert created and not joined_created
+        assert joined is entry
+
+        store.complete(entry, "project-1")
+        assert await joined.future == "project-1"
+        assert store.stats()["started"] == 1
+        assert store.stats()["joined"] == 1
+
+    run(scenario())
+
+
+def test_keyless_entry_is_dropped_on_completion():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, None, "fp")
+        store.complete(entry, "project-1")
+
+        again, created = store.claim(USER, SCOPE, None, "fp")
+        assert created
+        assert again is not entry
+
+    run(scenario())
+
+
+def test_keyless_entry_held_until_hold_finishes():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, None, "fp")
+        hold = asyncio.get_running_loop().create_future()
+        store.complete(entry, "job-1", hold=hold)
+
+        repeat, created = store.claim(USER, SCOPE, None, "fp")
+        assert not created
+        assert await repeat.future == "job-1"
+
+        hold.set_exception(RuntimeError("job failed"))
+        await asyncio.sleep(0)  # let the done callback run
+
+        _, created = store.claim(USER, SCOPE, None, "fp")
+        assert created
+
+    run(scenario())
+
+
+def test_explicit_key_replays_until_ttl():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, "k1", "fp")
+        store.complete(entry, "project-1")
+
+        replay, created = store.claim(USER, SCOPE, "k1", "fp")
+        assert not created
+        assert replay.future.result() == "project-1"
+        assert store.stats()["replayed"] == 1
+
+        replay.expires_at = 0  # expired
+        _, created = store.claim(USER, SCOPE, "k1", "fp")
+        assert created
+
+    run(scenario())
+
+
+def test_key_reused_with_different_body_is_422():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        store.claim(USER, SCOPE, "k1", "fp-a")
+        with pytest.raises(HTTPException) as exc:
+            store.claim(USER, SCOPE, "k1", "fp-b")
+        assert exc.value.status_code == 422
+        assert store.stats()["conflicts"] == 1
+
+    run(scenario())
+
+
+def test_keys_are_per_user_and_scope():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        store.claim(USER, SCOPE, "k1", "fp")
+        _, created_other_user = store.claim("user-2", SCOPE, "k1", "other")
+        _, created_other_scope = store.claim(USER, "stream", "k1", "other")
+        assert created_other_user and created_other_scope
+
+    run(scenario())
+
+
+def test_failure_reaches_waiters_and_is_not_remembered():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, "k1", "fp")
+        joined, _ = store.claim(USER, SCOPE, "k1", "fp")
+        store.fail(entry, HTTPException(status_code=502, detail="LLM down"))
+
+        with pytest.raises(HTTPException):
+            await joined.future
+        _, created = store.claim(USER, SCOPE, "k1", "fp")
+        assert created
+
+    run(scenario())
+
+
+def test_track_settles_from_task_result():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, "k1", "fp")
+
+        async def work():
+            return {"id": "project-1"}
+
+        store.track(entry, asyncio.create_task(work()), lambda project: project["id"])
+        assert await entry.future == "project-1"
+
+    run(scenario())
+
+
+def test_track_cancelled_work_fails_the_entry():
+    async def scenario():
+        store = IdempotencyStore(max_entries=10, ttl=60)
+        entry, _ = store.claim(USER, SCOPE, "k1", "fp")
+        task = asyncio.create_task(asyncio.sleep(10))
+        store.track(entry, task, lambda value: value)
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(HTTPException) as exc:
+            await entry.future
+        assert exc.value.status_code == 500
+
+    run(scenario())
+
+
+def test_bounded_lru_evicts_oldest():
+    async def scenario():
+        store = IdempotencyStore(max_entries=2, ttl=60)
+        store.claim(USER, SCOPE, "a", "fp")
+        store.claim(USER, SCOPE, "b", "fp")
+        store.claim(USER, SCOPE, "a", "fp")  # touch: b is now the oldest
+        store.claim(USER, SCOPE, "c", "fp")
+
+        assert store.stats()["entries"] == 2
+        _, created_a = store.claim(USER, SCOPE, "a", "fp")
+        _, created_b = store.claim(USER, SCOPE, "b", "fp")
+        assert not created_a
+        assert created_b
+
+    run(scenario())
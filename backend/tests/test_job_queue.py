@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+from app.services.job_backends import Job, MemoryJobBackend
+from app.services.job_queue import JobQueue
+
+
+def make_queue() -> JobQueue:
+    return JobQueue(MemoryJobBackend(max_size=10, max_retained=10), workers=1)
+
+
+def test_wait_sees_a_change_saved_during_its_first_load():
+    async def scenario():
+        queue = make_queue()
+        await queue.backend.put(Job(id="j1", kind="create", user_id="u1", payload={}))
+        load = queue.backend.load
+
+        async def load_then_progress(job_id):
+            job = await load(job_id)
+            queue.backend.load = load
+            changed = await load(job_id)
+            changed.progress = 50
+            await queue._save(changed)
+            return job
+
+        queue.backend.load = load_then_progress
+        started = time.monotonic()
+        job = await queue.wait("j1", timeout=5)
+        assert time.monotonic() - started < 1
+        assert job.progress == 50
+
+    asyncio.run(scenario())
+
+
+def test_wait_on_finished_or_missing_job_leaves_no_waiter_behind():
+    async def scenario():
+        queue = make_queue()
+        assert await queue.wait("missing", timeout=5) is None
+        assert queue._changed == {}
+
+    asyncio.run(scenario())
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.services.jwks_store import JWKSKeyStore, JWKSUnavailableError
+
+
+def make_store(url: str, **overrides) -> JWKSKeyStore:
+    options = dict(
+        ttl=600,
+        refresh_ahead=60,
+        max_stale_reads=2,
+        min_refetch_interval=30,
+        timeout=5,
+    )
+    options.update(overrides)
+    return JWKSKeyStore(url=url, **options)
+
+
+def age(store: JWKSKeyStore, seconds: float) -> None:
+    """Pretend the key set was fetched `seconds` earlier."""
+    store._fetched_at -= seconds
+
+
+def test_keys_fetched_once_and_reused(jwks_server, signing_key):
+    key = signing_key("kid-1")
+    jwks_server.jwks = {"keys": [key.public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url)
+        first = await store.get_signing_key("kid-1", "ES256")
+        second = await store.get_signing_key("kid-1", "ES256")
+        assert first is not None
+        assert second is first  # parsed key memoized
+        assert jwks_server.requests == 1
+
+    asyncio.run(scenario())
+
+
+def test_unknown_kid_refetches_after_rotation(jwks_server, signing_key):
+    old, new = signing_key("kid-old"), signing_key("kid-new")
+    jwks_server.jwks = {"keys": [old.public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url)
+        assert await store.get_signing_key("kid-old", "ES256") is not None
+
+        jwks_server.jwks = {"keys": [new.public_jwk]}
+        assert await store.get_signing_key("kid-new", "ES256") is not None
+        assert jwks_server.requests == 2
+        # The rotated-out key is gone with the old set
+        assert await store.get_signing_key("kid-old", "ES256") is None
+
+    asyncio.run(scenario())
+
+
+def test_unknown_kid_refetch_is_throttled(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url, min_refetch_interval=30)
+        await store.get_jwks()
+        for n in range(5):
+            assert await store.get_signing_key(f"random-{n}", "ES256") is None
+        assert jwks_server.requests == 2  # initial load + one forced refetch
+
+        store._last_forced_fetch -= 30
+        await store.get_signing_key("random-again", "ES256")
+        assert jwks_server.requests == 3
+
+    asyncio.run(scenario())
+
+
+def test_refresh_ahead_serves_cached_keys_while_reloading(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url, ttl=600, refresh_ahead=60)
+        await store.get_jwks()
+        age(store, 570)
+
+        assert (await store.get_jwks())["keys"]
+        await store._refresh_task
+        assert jwks_server.requests == 2
+
+    asyncio.run(scenario())
+
+
+def test_stale_reads_are_bounded_when_endpoint_is_down(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url, ttl=600, max_stale_reads=2)
+        cached = await store.get_jwks()
+        jwks_server.status = 503
+        age(store, 601)
+
+        for _ in range(2):
+            assert await store.get_jwks() == cached
+            await store._refresh_task  # background refresh fails quietly
+        with pytest.raises(JWKSUnavailableError):
+            await store.get_jwks()
+
+        # Endpoint back: the next call reloads and resets the budget
+        jwks_server.status = 200
+        assert await store.get_jwks() == cached
+        assert store._stale_reads == 0
+
+    asyncio.run(scenario())
+
+
+def test_first_load_failure_raises(jwks_server):
+    jwks_server.status = 500
+
+    async def scenario():
+        with pytest.raises(JWKSUnavailableError):
+            await make_store(jwks_server.url).get_jwks()
+
+    asyncio.run(scenario())
+
+
+def test_signing_key_must_match_kid_and_alg(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url)
+        assert await store.get_signing_key("kid-1", "RS256") is None
+        assert await store.get_signing_key("kid-1", "ES256") is not None
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_forces_reload(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+
+    async def scenario():
+        store = make_store(jwks_server.url)
+        await store.get_jwks()
+        store.invalidate()
+        await store.get_jwks()
+        assert jwks_server.requests == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.llm_governor import LLMGovernor, _TokenBucket
+
+
+# ── _TokenBucket ─────────────────────────────────────
+def test_bucket_starts_full_and_drains():
+    bucket = _TokenBucket(capacity=2, rate=0)
+    assert bucket.is_full()
+    assert bucket.take() and bucket.take()
+    assert not bucket.available()
+    assert not bucket.take()
+
+
+def test_bucket_refills_over_time():
+    bucket = _TokenBucket(capacity=2, rate=1.0)
+    bucket.take()
+    bucket.take()
+    bucket.updated -= 1.5  # 1.5 seconds pass
+    assert bucket.available()
+    assert bucket.take()
+    assert not bucket.available()
+    assert bucket.seconds_until_token() == pytest.approx(0.5, abs=0.01)
+
+
+def test_bucket_never_exceeds_capacity():
+    bucket = _TokenBucket(capacity=3, rate=10.0)
+    bucket.updated -= 60
+    assert bucket.available()
+    assert bucket.tokens == 3
+
+
+def test_seconds_until_token():
+    assert _TokenBucket(capacity=1, rate=1.0).seconds_until_token() == 0.0
+
+    bucket = _TokenBucket(capacity=1, rate=0.5)
+    bucket.take()
+    assert bucket.seconds_until_token() == pytest.approx(2.0, abs=0.01)
+
+    stalled = _TokenBucket(capacity=1, rate=0)
+    stalled.take()
+    assert stalled.seconds_until_token() == 0.0  # no refill: don't divide by zero
+
+
+# ── LLMGovernor ──────────────────────────────────────
+def make_governor(**overrides) -> LLMGovernor:
+    options = dict(
+        max_concurrency=1,
+        max_queue=1,
+        queue_timeout=5,
+        user_rate_per_minute=60,
+        user_burst=1,
+    )
+    options.update(overrides)
+    return LLMGovernor(**options)
+
+
+def test_check_admission_rejects_and_counts_rate_limited_user():
+    async def scenario():
+        governor = make_governor()
+        async with governor.slot("user-1"):
+            pass
+        with pytest.raises(HTTPException) as exc:
+            governor.check_admission("user-1")
+        assert exc.value.status_code == 429
+        assert "Retry-After" in exc.value.headers
+        assert governor.stats()["rejected_user_rate"] == 1
+        governor.check_admission("user-2")  # other users unaffected
+
+    asyncio.run(scenario())
+
+
+def test_check_admission_rejects_and_counts_when_queue_full():
+    async def scenario():
+        governor = make_governor(user_burst=10)
+        release = asyncio.Event()
+
+        async def hold():
+            async with governor.slot("user-1"):
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert governor.stats()["in_flight"] == 1
+        assert governor.stats()["waiting"] == 1
+
+        with pytest.raises(HTTPException) as exc:
+            governor.check_admission("user-2")
+        assert exc.value.status_code == 429
+        assert governor.stats()["rejected_queue_full"] == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert governor.stats()["admitted"] == 2
+
+    asyncio.run(scenario())
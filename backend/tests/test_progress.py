@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.services.project_service import ProjectService
+
+
+def progress(project_id: str = "p1", user_id: str = "user-1") -> dict:
+    return asyncio.run(ProjectService.get_progress(project_id, user_id))
+
+
+def no_rows(request):
+    return httpx.Response(406, json={
+        "code": "PGRST116",
+        "details": "The result contains 0 rows",
+        "hint": None,
+        "message": "JSON object requested, multiple (or no) rows returned",
+    })
+
+
+def module(module_id: str, order_index: int, **embedded) -> dict:
+    return {"id": module_id, "title": module_id, "order_index": order_index, "status": "active", **embedded}
+
+
+def test_counts_tasks_per_module_and_project(postgrest, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PROGRESS_COUNTERS", False)
+    postgrest.routes[("GET", "projects")] = lambda request: {
+        "id": "p1",
+        "status": "active",
+        "modules": [
+            module("m1", 0, tasks=[
+                {"status": "completed", "estimated_hours": 2},
+                {"status": "completed", "estimated_hours": 1.5},
+                {"status": "in_progress", "estimated_hours": 3},
+                {"status": "pending", "estimated_hours": None},
+            ]),
+            module("m2", 1, tasks=[
+                {"status": "blocked", "estimated_hours": 4},
+            ]),
+            module("m3", 2, tasks=[]),
+        ],
+    }
+
+    result = progress()
+
+    m1, m2, m3 = result["modules"]
+    assert [m["module_id"] for m in result["modules"]] == ["m1", "m2", "m3"]
+    assert (m1["completed"], m1["in_progress"], m1["pending"], m1["total"]) == (2, 1, 1, 4)
+    assert (m1["hours_total"], m1["hours_done"], m1["hours_remaining"]) == (6.5, 3.5, 3.0)
+    assert m1["percent_complete"] == 50.0
+    assert (m2["blocked"], m2["total"], m2["percent_complete"]) == (1, 1, 0.0)
+    assert (m3["total"], m3["percent_complete"], m3["hours_remaining"]) == (0, 0.0, 0.0)
+
+    assert result["project_id"] == "p1"
+    assert (result["total"], result["completed"], result["blocked"]) == (5, 2, 1)
+    assert (result["hours_total"], result["hours_done"], result["hours_remaining"]) == (10.5, 3.5, 7.0)
+    assert result["percent_complete"] == 40.0
+
+    (request,) = postgrest.calls("GET", "projects")
+    assert "tasks(status,estimated_hours)" in request.url.params["select"].replace(" ", "")
+    assert request.url.params["modules.order"] == "order_index"
+
+
+@pytest.mark.parametrize("as_list", [False, True], ids=["object", "list"])
+def test_reads_counter_rows(postgrest, monkeypatch, as_list):
+    monkeypatch.setattr(get_settings(), "PROGRESS_COUNTERS", True)
+
+    def row(**counts):
+        return [counts] if as_list else counts
+
+    postgrest.routes[("GET", "projects")] = lambda request: {
+        "id": "p1",
+        "status": "active",
+        "project_progress": row(pending=1, in_progress=0, completed=3, blocked=0, hours_total="8.5", hours_done="6"),
+        "modules": [
+            module("m1", 0, module_progress=row(pending=1, completed=3, hours_total=8.5, hours_done=6)),
+            module("m2", 1, module_progress=[] if as_list else None),
+        ],
+    }
+
+    result = progress()
+
+    m1, m2 = result["modules"]
+    assert (m1["total"], m1["percent_complete"], m1["hours_remaining"]) == (4, 75.0, 2.5)
+    assert (m2["total"], m2["percent_complete"], m2["hours_total"]) == (0, 0.0, 0.0)
+    assert (result["total"], result["completed"], result["percent_complete"]) == (4, 3, 75.0)
+    assert (result["hours_total"], result["hours_done"], result["hours_remaining"]) == (8.5, 6.0, 2.5)
+
+    (request,) = postgrest.calls("GET", "projects")
+    assert "tasks" not in request.url.params["select"]
+
+
+@pytest.mark.parametrize("counters", [False, True])
+def test_missing_project_is_404(postgrest, monkeypatch, counters):
+    monkeypatch.setattr(get_settings(), "PROGRESS_COUNTERS", counters)
+    postgrest.routes[("GET", "projects")] = no_rows
+
+    with pytest.raises(HTTPException) as exc:
+        progress(user_id="someone-else")
+
+    assert exc.value.status_code == 404
+    (request,) = postgrest.calls("GET", "projects")
+    assert request.url.params["user_id"] == "eq.someone-else"
@@ -0,0 +1,37 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.project_service import ProjectService
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = "2026-01-02T03:04:05.678901+00:00"
+    project_id = "6f1c2d3e-0000-4000-8000-000000000001"
+    cursor = ProjectService._encode_cursor(created_at, project_id)
+    assert "=" not in cursor  # unpadded, safe in a query string
+    assert ProjectService._decode_cursor(cursor) == (created_at, project_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    raw_cursor({"created_at": "x", "id": "y"}),
+    raw_cursor(["only-one"]),
+    raw_cursor(["a", "b", "c"]),
+    raw_cursor([1, "id"]),
+    raw_cursor(["2026-01-01", 2]),
+    raw_cursor(['2026-01-01",id.gt.0', "id"]),
+    raw_cursor(["2026-01-01", "id\\"]),
+])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        ProjectService._decode_cursor(cursor)
+    assert exc.value.status_code == 400
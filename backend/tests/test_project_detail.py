@@ -0,0 +1,27 @@
+import asyncio
+
+from app.services.project_service import ProjectService
+
+
+def test_detail_orders_embedded_modules_and_tasks(postgrest):
+    project = {"id": "p1", "modules": [{"id": "m1", "order_index": 0, "tasks": []}]}
+    postgrest.routes[("GET", "projects")] = lambda request: project
+
+    assert asyncio.run(ProjectService.get_project_detail("p1", "user-1")) == project
+
+    (request,) = postgrest.calls("GET", "projects")
+    params = request.url.params
+    assert params["modules.order"] == "order_index"
+    assert params["modules.tasks.order"] == "order_index"
+    assert "order" not in params
+    assert (params["id"], params["user_id"]) == ("eq.p1", "eq.user-1")
+
+
+def test_progress_orders_embedded_modules(postgrest):
+    postgrest.routes[("GET", "projects")] = lambda request: {"id": "p1", "status": "active", "modules": []}
+
+    asyncio.run(ProjectService.get_progress("p1", "user-1"))
+
+    (request,) = postgrest.calls("GET", "projects")
+    assert request.url.params["modules.order"] == "order_index"
+    assert "modules.tasks.order" not in request.url.params
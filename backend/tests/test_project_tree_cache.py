@@ -0,0 +1,142 @@
+import pytest
+
+from app.responses import dumps
+from app.services import project_tree_cache
+from app.services.project_tree_cache import ProjectTreeCache
+
+
+def tree(project_id: str = "p1", statuses: tuple[str, ...] = ("pending", "pending")) -> dict:
+    return {
+        "id": project_id,
+        "title": "Project",
+        "modules": [
+            {
+                "id": "m1",
+                "tasks": [
+                    {"id": f"t{n}", "status": status, "completed_at": None}
+                    for n, status in enumerate(statuses, start=1)
+                ],
+            }
+        ],
+    }
+
+
+def make_cache(**overrides) -> ProjectTreeCache:
+    options = dict(max_entries=10, max_bytes=1 << 20, ttl=300)
+    options.update(overrides)
+    return ProjectTreeCache(**options)
+
+
+# ── Reads ────────────────────────────────────────────
+def test_hit_requires_owner_and_current_version():
+    cache = make_cache()
+    cache.put("p1", "user-1", 5, tree())
+    assert cache.get("p1", "user-1", 5) == tree()
+    assert cache.get("p1", "user-2", 5) is None  # other users never hit
+    assert cache.get("p1", "user-1", 5) is not None
+    assert cache.get("p1", "user-1", 6) is None  # written elsewhere since
+    assert cache.get("p1", "user-1", 5) is None  # …and the stale entry is gone
+    assert cache.stats()["entries"] == 0
+
+
+def test_every_hit_is_a_fresh_copy():
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree())
+    first = cache.get("p1", "user-1", 1)
+    first["modules"][0]["tasks"].clear()
+    assert cache.get("p1", "user-1", 1) == tree()
+
+
+def test_entries_expire(monkeypatch):
+    cache = make_cache(ttl=60)
+    cache.put("p1", "user-1", 1, tree())
+    now = project_tree_cache.time.monotonic()
+    monkeypatch.setattr(project_tree_cache.time, "monotonic", lambda: now + 61)
+    assert cache.get("p1", "user-1", 1) is None
+
+
+# ── Size accounting ──────────────────────────────────
+def test_bytes_track_serialized_size():
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree("p1"))
+    cache.put("p2", "user-1", 1, tree("p2", ("pending",) * 5))
+    expected = len(dumps(tree("p1"))) + len(dumps(tree("p2", ("pending",) * 5)))
+    assert cache.stats()["bytes"] == expected
+
+    cache.put("p1", "user-1", 2, tree("p1", ("pending",)))  # replace
+    expected = len(dumps(tree("p1", ("pending",)))) + len(dumps(tree("p2", ("pending",) * 5)))
+    assert cache.stats()["bytes"] == expected
+
+    cache.evict("p1")
+    cache.forget("p2")
+    assert cache.stats()["bytes"] == 0
+
+
+def test_lru_eviction_by_bytes():
+    size = len(dumps(tree("p1")))
+    cache = make_cache(max_bytes=size * 2)
+    cache.put("p1", "user-1", 1, tree("p1"))
+    cache.put("p2", "user-1", 1, tree("p2"))
+    cache.get("p1", "user-1", 1)  # p2 is now least recently used
+    cache.put("p3", "user-1", 1, tree("p3"))
+
+    assert cache.get("p2", "user-1", 1) is None
+    assert cache.get("p1", "user-1", 1) is not None
+    assert cache.stats()["bytes"] <= size * 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_count():
+    cache = make_cache(max_entries=1)
+    cache.put("p1", "user-1", 1, tree("p1"))
+    cache.put("p2", "user-1", 1, tree("p2"))
+    assert cache.get("p1", "user-1", 1) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_oversized_tree_is_not_cached():
+    cache = make_cache(max_bytes=10)
+    cache.put("p1", "user-1", 1, tree())
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+# ── Task patches ─────────────────────────────────────
+def test_update_tasks_patches_when_no_other_write_slipped_in():
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree())
+    done = {"id": "t2", "status": "completed", "completed_at": "2026-01-01T00:00:00"}
+    cache.update_tasks("p1", [done], previous_version=1, new_version=2)
+
+    patched = cache.get("p1", "user-1", 2)
+    assert patched["modules"][0]["tasks"][1] == done
+    assert patched["modules"][0]["tasks"][0]["status"] == "pending"
+    assert cache.stats()["patches"] == 1
+    assert cache.stats()["bytes"] == len(dumps(patched))
+
+
+@pytest.mark.parametrize("previous_version", [None, 3])
+def test_update_tasks_evicts_when_stamp_is_not_the_previous_version(previous_version):
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree())
+    cache.update_tasks("p1", [{"id": "t1", "status": "completed"}], previous_version, new_version=4)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_update_tasks_evicts_on_unknown_task():
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree())
+    cache.update_tasks("p1", [{"id": "t9", "status": "completed"}], previous_version=1, new_version=2)
+    assert cache.get("p1", "user-1", 2) is None
+
+
+# ── Owners ───────────────────────────────────────────
+def test_owner_remembered_on_put_and_dropped_on_forget():
+    cache = make_cache()
+    cache.put("p1", "user-1", 1, tree())
+    assert cache.owner_of("p1") == "user-1"
+    cache.evict("p1")
+    assert cache.owner_of("p1") == "user-1"  # ownership never changes
+    cache.forget("p1")
+    assert cache.owner_of("p1") is None
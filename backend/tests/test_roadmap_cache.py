@@ -0,0 +1,186 @@
+import asyncio
+import os
+import shutil
+import time
+from datetime import date
+
+import pytest
+
+from app.services import roadmap_cache
+from app.services.roadmap_cache import RoadmapCache
+
+
+KEY_INPUTS = dict(
+    model="gemini-2.5-flash",
+    description="A todo app with auth",
+    tech_stack=["React", "FastAPI"],
+    planning_mode="ai_decides",
+    deadline_date=None,
+    working_hours_per_day=4,
+    skill_level="medium",
+    preferred_pace="medium",
+)
+
+ROADMAP = {
+    "modules": [
+        {
+            "title": "Setup",
+            "start_date": "2026-01-01",
+            "end_date": "2026-01-03",
+            "tasks": [
+                {"title": "Init repo", "deadline": "2026-01-02"},
+                {"title": "No date", "deadline": None},
+            ],
+        },
+        {
+            "title": "Build",
+            "start_date": "2026-01-04",
+            "end_date": "2026-01-10",
+            "tasks": [{"title": "API", "deadline": "2026-01-09"}],
+        },
+    ]
+}
+
+
+def key(**overrides) -> str:
+    return RoadmapCache.make_key(**{**KEY_INPUTS, **overrides})
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """today.set(date) moves the cache's notion of today."""
+    class Clock:
+        value = date(2026, 1, 1)
+
+        def set(self, value: date) -> None:
+            Clock.value = value
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return Clock.value
+
+    monkeypatch.setattr(roadmap_cache, "date", FakeDate)
+    return Clock()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ── Keys ─────────────────────────────────────────────
+def test_key_ignores_formatting_noise():
+    assert key() == key(description="  a TODO app\n with   auth ")
+    assert key() == key(tech_stack=["fastapi", " react ", "React", ""])
+    assert key() == key(working_hours_per_day=4.0)
+    assert key() == key(skill_level=None, preferred_pace=None)
+    # deadline only matters in deadline mode
+    assert key() == key(deadline_date="2026-03-01")
+
+
+def test_key_changes_with_prompt_inputs():
+    base = key()
+    assert key(model="gemini-2.5-pro") != base
+    assert key(description="A chat app") != base
+    assert key(tech_stack=["Vue"]) != base
+    assert key(working_hours_per_day=6) != base
+    assert key(planning_mode="deadline", deadline_date="2026-03-01") != key(
+        planning_mode="deadline", deadline_date="2026-04-01"
+    )
+
+
+# ── Hits, rebasing, deadline fit ─────────────────────
+def test_hit_returns_a_copy(today):
+    cache = RoadmapCache(max_entries=10, ttl=3600)
+    run(cache.set("k", ROADMAP))
+    hit = run(cache.get("k"))
+    assert hit == ROADMAP
+    hit["modules"][0]["title"] = "changed"
+    assert run(cache.get("k")) == ROADMAP
+
+
+def test_dates_rebased_by_elapsed_days(today):
+    cache = RoadmapCache(max_entries=10, ttl=30 * 86400)
+    run(cache.set("k", ROADMAP))
+    today.set(date(2026, 1, 11))
+
+    hit = run(cache.get("k"))
+    setup, build = hit["modules"]
+    assert (setup["start_date"], setup["end_date"]) == ("2026-01-11", "2026-01-13")
+    assert [t["deadline"] for t in setup["tasks"]] == ["2026-01-12", None]
+    assert build["tasks"][0]["deadline"] == "2026-01-19"
+
+
+def test_deadline_overrun_after_rebase_is_a_miss(today):
+    cache = RoadmapCache(max_entries=10, ttl=30 * 86400)
+    run(cache.set("k", ROADMAP))
+    assert run(cache.get("k", deadline_date="2026-01-10")) is not None
+
+    today.set(date(2026, 1, 5))  # plan now ends on 2026-01-14
+    assert run(cache.get("k", deadline_date="2026-01-10")) is None
+    assert run(cache.get("k", deadline_date="2026-01-14")) is not None
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = RoadmapCache(max_entries=10, ttl=60)
+    run(cache.set("k", ROADMAP))
+    now = time.time()
+    monkeypatch.setattr(roadmap_cache.time, "time", lambda: now + 61)
+    assert run(cache.get("k")) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_memory_tier_is_lru_bounded():
+    cache = RoadmapCache(max_entries=2, ttl=3600)
+    for k in ("a", "b"):
+        run(cache.set(k, ROADMAP))
+    run(cache.get("a"))
+    run(cache.set("c", ROADMAP))
+    assert run(cache.get("b")) is None
+    assert run(cache.get("a")) is not None
+
+
+# ── Disk tier ────────────────────────────────────────
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    run(RoadmapCache(max_entries=10, ttl=3600, disk_path=str(tmp_path)).set("k", ROADMAP))
+    assert os.listdir(tmp_path) == ["k.json"]  # no temp files left behind
+
+    fresh = RoadmapCache(max_entries=10, ttl=3600, disk_path=str(tmp_path))
+    assert run(fresh.get("k")) == ROADMAP
+    assert fresh.stats()["disk_hits"] == 1
+    run(fresh.get("k"))
+    assert fresh.stats()["disk_hits"] == 1  # promoted to memory
+
+
+def test_disk_entries_expire_and_are_removed(tmp_path, monkeypatch):
+    run(RoadmapCache(max_entries=10, ttl=60, disk_path=str(tmp_path)).set("k", ROADMAP))
+    now = time.time()
+    monkeypatch.setattr(roadmap_cache.time, "time", lambda: now + 61)
+    fresh = RoadmapCache(max_entries=10, ttl=60, disk_path=str(tmp_path))
+    assert run(fresh.get("k")) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_tier_pruned_oldest_first(tmp_path):
+    cache = RoadmapCache(max_entries=10, ttl=3600, disk_path=str(tmp_path), disk_max_entries=2)
+    for n, k in enumerate(("a", "b", "c")):
+        run(cache.set(k, ROADMAP))
+        os.utime(tmp_path / f"{k}.json", (1000 + n, 1000 + n))
+        cache._disk_prune()
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    (tmp_path / "k.json").write_text("{not json")
+    cache = RoadmapCache(max_entries=10, ttl=3600, disk_path=str(tmp_path))
+    assert run(cache.get("k")) is None
+
+
+def test_disk_write_failure_is_counted_not_raised(tmp_path):
+    path = tmp_path / "cache"
+    cache = RoadmapCache(max_entries=10, ttl=3600, disk_path=str(path))
+    shutil.rmtree(path)
+    run(cache.set("k", ROADMAP))
+    assert cache.stats()["write_errors"] == 1
+    assert run(cache.get("k")) == ROADMAP  # memory tier still has it
@@ -0,0 +1,65 @@
+import json
+
+from app.services.roadmap_stream_parser import ModuleStreamParser
+
+
+ROADMAP = {
+    "modules": [
+        {"name": "Setup", "tasks": [{"title": "Install {deps}", "hours": 2}]},
+        {"name": "Build \"core\"", "tasks": [{"title": "API [v1]", "hours": 5}]},
+        {"name": "Ship", "tasks": []},
+    ]
+}
+
+
+def feed_all(parser: ModuleStreamParser, chunks: list[str]) -> list[dict]:
+    modules = []
+    for chunk in chunks:
+        modules.extend(parser.feed(chunk))
+    return modules
+
+
+def test_whole_document_in_one_fragment():
+    modules = ModuleStreamParser().feed(json.dumps(ROADMAP))
+    assert modules == ROADMAP["modules"]
+
+
+def test_every_split_point():
+    text = json.dumps(ROADMAP)
+    for cut in range(len(text) + 1):
+        modules = feed_all(ModuleStreamParser(), [text[:cut], text[cut:]])
+        assert modules == ROADMAP["modules"], f"split at {cut}"
+
+
+def test_character_at_a_time():
+    text = json.dumps(ROADMAP, indent=2)
+    assert feed_all(ModuleStreamParser(), list(text)) == ROADMAP["modules"]
+
+
+def test_module_emitted_as_soon_as_it_closes():
+    parser = ModuleStreamParser()
+    assert parser.feed('{"modules": [{"name": "A", "tasks": [') == []
+    assert parser.feed(']}') == [{"name": "A", "tasks": []}]
+    assert parser.feed(', {"name": "B"') == []
+    assert parser.feed('}]}') == [{"name": "B"}]
+
+
+def test_ignores_other_top_level_keys():
+    text = json.dumps({
+        "summary": {"modules": [{"name": "decoy"}]},
+        "notes": ["modules", {"name": "decoy"}],
+        "modules": [{"name": "real"}],
+        "extra": [{"name": "after"}],
+    })
+    assert ModuleStreamParser().feed(text) == [{"name": "real"}]
+
+
+def test_escaped_quotes_and_backslashes_in_strings():
+    module = {"name": "a \\\"quoted\\\" } ] value\\", "tasks": []}
+    text = json.dumps({"modules": [module]})
+    assert feed_all(ModuleStreamParser(), list(text)) == [module]
+
+
+def test_non_object_elements_are_skipped():
+    text = '{"modules": [1, "x", {"name": "A"}, null]}'
+    assert ModuleStreamParser().feed(text) == [{"name": "A"}]
@@ -0,0 +1,147 @@
+import asyncio
+
+from app.services.sse_stream import SSEStreamer, StreamSession
+
+
+def frame(n: int) -> bytes:
+    return b"data: %d\n\n" % n
+
+
+def session_with(count: int, max_events: int = 100, max_bytes: int = 1 << 20) -> StreamSession:
+    session = StreamSession("project-1", "user-1", max_events=max_events, max_bytes=max_bytes)
+    for n in range(1, count + 1):
+        session.append(frame(n))
+    return session
+
+
+def ids(frames: list[tuple[int, bytes]]) -> list[int]:
+    return [frame_id for frame_id, _ in frames]
+
+
+# ── StreamSession ────────────────────────────────────
+def test_append_numbers_frames():
+    session = session_with(2)
+    assert session.last_id == 2
+    assert list(session.frames) == [
+        (1, b"id: 1\n" + frame(1)),
+        (2, b"id: 2\n" + frame(2)),
+    ]
+    assert session.bytes == sum(len(f) for _, f in session.frames)
+
+
+def test_frames_after():
+    session = session_with(5)
+    assert ids(session.frames_after(0)) == [1, 2, 3, 4, 5]
+    assert ids(session.frames_after(3)) == [4, 5]
+    assert session.frames_after(5) == []
+    assert session.frames_after(9) == []
+
+
+def test_frames_after_on_empty_session():
+    assert session_with(0).frames_after(0) == []
+
+
+def test_replay_buffer_bounded_by_events():
+    session = session_with(10, max_events=3)
+    assert ids(session.frames) == [8, 9, 10]
+    # Older frames are gone: a resume gets what is left
+    assert ids(session.frames_after(2)) == [8, 9, 10]
+    assert ids(session.frames_after(8)) == [9, 10]
+
+
+def test_replay_buffer_bounded_by_bytes():
+    size = len(b"id: 1\n" + frame(1))
+    session = session_with(9, max_bytes=size * 2)
+    assert ids(session.frames) == [8, 9]
+    assert session.bytes <= size * 2
+
+
+def test_replay_buffer_keeps_latest_frame_even_if_oversized():
+    session = session_with(3, max_bytes=1)
+    assert ids(session.frames) == [3]
+
+
+def test_lagging():
+    session = session_with(10)
+    assert not session.lagging(max_queued=2)  # no readers
+
+    session.readers[0] = 9
+    assert not session.lagging(max_queued=2)
+    session.readers[1] = 7
+    assert not session.lagging(max_queued=3)
+    assert session.lagging(max_queued=2)  # slowest reader decides
+
+
+# ── SSEStreamer ──────────────────────────────────────
+def make_streamer(**overrides) -> SSEStreamer:
+    options = dict(
+        window=0.01,
+        max_bytes=1024,
+        heartbeat=30,
+        max_queued=100,
+        replay_max_events=100,
+        replay_max_bytes=1 << 20,
+        grace=30,
+        disconnect_poll=1,
+        stall_timeout=5,
+    )
+    options.update(overrides)
+    return SSEStreamer(**options)
+
+
+async def events():
+    yield "chunk", '{"modules": ['
+    yield "module", {"name": "A"}
+    yield "complete", {"id": "project-1"}
+
+
+async def collect(streamer: SSEStreamer, session: StreamSession, last_event_id: int = 0) -> list[bytes]:
+    return [f async for f in streamer.subscribe(session, last_event_id)]
+
+
+def test_subscribe_replays_after_last_event_id():
+    async def scenario():
+        streamer = make_streamer()
+        session = streamer.start("project-1", "user-1", events())
+        full = await collect(streamer, session)
+        assert [f.split(b"\n", 1)[0] for f in full] == [b"id: 1", b"id: 2", b"id: 3"]
+        assert b'"type":"complete"' in full[-1]
+
+        resumed = await collect(streamer, session, last_event_id=1)
+        assert resumed == full[1:]
+        assert await collect(streamer, session, last_event_id=3) == []
+
+        stats = streamer.stats()
+        assert stats["resumes"] == 2
+        assert stats["replayed_frames"] == 2
+        assert stats["replay_gaps"] == 0
+        assert streamer.get("project-1", "someone-else") is None
+
+    asyncio.run(scenario())
+
+
+def test_stalled_reader_is_detached_and_can_resume():
+    async def many_events():
+        for n in range(10):
+            yield "status", f"step {n}"
+
+    async def scenario():
+        streamer = make_streamer(max_queued=2, stall_timeout=0.05)
+        session = streamer.start("project-1", "user-1", many_events())
+        stalled = streamer.subscribe(session)
+        first = await stalled.__anext__()  # then stop reading
+
+        # The producer doesn't wait for the stalled reader forever
+        await asyncio.wait_for(session.task, timeout=1)
+        assert session.finished
+        assert streamer.stats()["readers_dropped"] == 1
+        assert session.readers == {}
+
+        # The stalled response ends at its next step…
+        assert [f async for f in stalled] == []
+        # …and the client resumes after the last frame it got
+        resumed = await collect(streamer, session, last_event_id=1)
+        assert first.startswith(b"id: 1\n")
+        assert [f.split(b"\n", 1)[0] for f in resumed] == [b"id: %d" % n for n in range(2, 11)]
+
+    asyncio.run(scenario())
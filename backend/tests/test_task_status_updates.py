@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.services.project_service import ProjectService
+from app.services.project_tree_cache import get_project_tree_cache
+from app.services.resource_versions import get_resource_versions
+
+
+def eq(value: str) -> str:
+    return value.removeprefix("eq.")
+
+
+class Tables:
+    """projects + tasks rows behind the fake PostgREST."""
+
+    def __init__(self, postgrest):
+        self.owners = {"p1": "user-1"}
+        self.tasks = {
+            task_id: {
+                "id": task_id, "project_id": "p1", "module_id": "m1", "title": task_id,
+                "order_index": n, "status": "pending", "completed_at": None,
+            }
+            for n, task_id in enumerate(("t1", "t2", "t3"))
+        }
+        self.tasks["t3"].update(status="completed", completed_at="2026-01-01T00:00:00")
+        postgrest.routes[("PATCH", "tasks")] = self.patch_tasks
+        postgrest.routes[("GET", "projects")] = self.get_project
+
+    def patch_tasks(self, request):
+        params = request.url.params
+        ids = params["id"].removeprefix("in.(").removesuffix(")").split(",")
+        project_id = eq(params["project_id"])
+        user_id = params.get("user_id")
+        changes = json.loads(request.content)
+        updated = []
+        for task_id in ids:
+            row = self.tasks.get(task_id)
+            if row is None or row["project_id"] != project_id:
+                continue
+            if user_id is not None and self.owners.get(project_id) != eq(user_id):
+                continue
+            row.update(changes)
+            updated.append(dict(row))
+        return updated
+
+    def get_project(self, request):
+        params = request.url.params
+        project_id, user_id = eq(params["id"]), eq(params["user_id"])
+        return [{"id": project_id}] if self.owners.get(project_id) == user_id else []
+
+
+@pytest.fixture
+def tables(postgrest):
+    return Tables(postgrest)
+
+
+@pytest.fixture(params=[False, True], ids=["owner-check", "user-id-column"])
+def user_id_column(request, monkeypatch):
+    monkeypatch.setattr(get_settings(), "TASK_USER_ID_COLUMN", request.param)
+    return request.param
+
+
+def update(updates: dict, user_id: str = "user-1", project_id: str = "p1") -> dict:
+    return asyncio.run(ProjectService.update_task_statuses(project_id, user_id, updates))
+
+
+def test_results_in_request_order_with_not_found(tables, user_id_column):
+    result = update({"t2": "completed", "missing": "pending", "t1": "in_progress"})
+    assert [task["id"] for task in result["updated"]] == ["t2", "t1"]
+    assert result["not_found"] == ["missing"]
+
+
+def test_one_update_per_distinct_status(tables, postgrest, user_id_column):
+    update({"t1": "in_progress", "t2": "in_progress", "t3": "pending"})
+    assert len(postgrest.calls("PATCH", "tasks")) == 2
+
+
+def test_completed_at_set_and_cleared(tables, user_id_column):
+    result = update({"t1": "completed", "t3": "in_progress"})
+    rows = {task["id"]: task for task in result["updated"]}
+    assert rows["t1"]["completed_at"] is not None
+    assert rows["t3"]["completed_at"] is None
+    assert tables.tasks["t3"]["status"] == "in_progress"
+
+
+def test_ownership_folded_into_update_with_user_id_column(tables, postgrest, monkeypatch):
+    monkeypatch.setattr(get_settings(), "TASK_USER_ID_COLUMN", True)
+    update({"t1": "completed"})
+    assert postgrest.calls("GET", "projects") == []
+    assert postgrest.calls("PATCH", "tasks")[0].url.params["user_id"] == "eq.user-1"
+
+
+def test_owner_check_remembered(tables, postgrest, monkeypatch):
+    monkeypatch.setattr(get_settings(), "TASK_USER_ID_COLUMN", False)
+    update({"t1": "completed"})
+    update({"t2": "completed"})
+    assert len(postgrest.calls("GET", "projects")) == 1
+
+
+def test_other_users_project_is_404_and_leaves_its_cache_alone(tables, user_id_column):
+    versions = get_resource_versions()
+    key = versions.project_key("p1")
+    (version,) = asyncio.run(versions.get(key))
+    get_project_tree_cache().put("p1", "user-1", version, {"id": "p1", "modules": []})
+
+    with pytest.raises(HTTPException) as exc:
+        update({"t1": "completed"}, user_id="user-2")
+    assert exc.value.status_code == 404
+    assert tables.tasks["t1"]["status"] == "pending"
+
+    assert asyncio.run(versions.get(key)) == [version]
+    assert get_project_tree_cache().get("p1", "user-1", version) is not None
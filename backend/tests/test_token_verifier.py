@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+
+from app import dependencies
+from app.services import token_verifier
+from app.services.jwks_store import JWKSKeyStore
+from app.services.token_verifier import TokenVerifier
+
+
+SECRET = "local-test-secret"
+
+
+def claims(**overrides) -> dict:
+    now = int(time.time())
+    return {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+
+
+def hs256(payload: dict, secret: str = SECRET) -> str:
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def make_verifier(url: str, secret: str = SECRET, cache_size: int = 100) -> TokenVerifier:
+    store = JWKSKeyStore(
+        url=url, ttl=600, refresh_ahead=60, max_stale_reads=2, min_refetch_interval=30, timeout=5,
+    )
+    return TokenVerifier(jwt_secret=secret, jwks_store=store, cache_size=cache_size)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ── HS256 ────────────────────────────────────────────
+def test_hs256_verified_locally(jwks_server):
+    verifier = make_verifier(jwks_server.url)
+    assert run(verifier.verify(hs256(claims())))["sub"] == "user-1"
+    assert jwks_server.requests == 0
+
+
+@pytest.mark.parametrize("token", [
+    hs256(claims(), secret="wrong-secret"),
+    hs256(claims(aud="someone-else")),
+    hs256(claims(exp=int(time.time()) - 10)),
+])
+def test_hs256_rejects_bad_tokens(jwks_server, token):
+    with pytest.raises(JWTError):
+        run(make_verifier(jwks_server.url).verify(token))
+
+
+def test_hs256_refused_without_secret(jwks_server):
+    with pytest.raises(JWTError):
+        run(make_verifier(jwks_server.url, secret="").verify(hs256(claims(), secret="")))
+
+
+def test_unsupported_algorithm(jwks_server):
+    token = jwt.encode(claims(), SECRET, algorithm="HS512")
+    with pytest.raises(JWTError):
+        run(make_verifier(jwks_server.url).verify(token))
+
+
+# ── ES256 via JWKS ───────────────────────────────────
+def test_es256_verified_with_jwks_key(jwks_server, signing_key):
+    key = signing_key("kid-1")
+    jwks_server.jwks = {"keys": [key.public_jwk]}
+    verifier = make_verifier(jwks_server.url)
+    assert run(verifier.verify(key.sign(claims())))["sub"] == "user-1"
+
+
+def test_es256_from_unknown_key_rejected(jwks_server, signing_key):
+    jwks_server.jwks = {"keys": [signing_key("kid-1").public_jwk]}
+    forged = signing_key("kid-1")  # same kid, different key pair
+    with pytest.raises(JWTError):
+        run(make_verifier(jwks_server.url).verify(forged.sign(claims())))
+
+
+# ── Claims cache ─────────────────────────────────────
+def test_verified_claims_are_cached(jwks_server, signing_key):
+    key = signing_key("kid-1")
+    jwks_server.jwks = {"keys": [key.public_jwk]}
+    verifier = make_verifier(jwks_server.url)
+    token = key.sign(claims())
+
+    async def scenario():
+        first = await verifier.verify(token)
+        assert await verifier.verify(token) == first
+
+    run(scenario())
+    assert (verifier.hits, verifier.misses) == (1, 1)
+
+
+def test_cached_claims_expire_at_token_exp(jwks_server, monkeypatch):
+    verifier = make_verifier(jwks_server.url)
+    exp = int(time.time()) + 3600
+    token = hs256(claims(exp=exp))
+    run(verifier.verify(token))
+
+    monkeypatch.setattr(token_verifier.time, "time", lambda: exp + 1)
+    run(verifier.verify(token))  # re-verified, not served from the cache
+    assert (verifier.hits, verifier.misses) == (0, 2)
+
+
+def test_claims_cache_is_bounded(jwks_server):
+    verifier = make_verifier(jwks_server.url, cache_size=1)
+    a, b = hs256(claims(sub="a")), hs256(claims(sub="b"))
+    for token in (a, b, a):
+        run(verifier.verify(token))
+    assert (verifier.hits, verifier.misses) == (0, 3)
+
+
+def test_raw_tokens_are_not_kept(jwks_server):
+    verifier = make_verifier(jwks_server.url)
+    token = hs256(claims())
+    run(verifier.verify(token))
+    assert token not in verifier._cache
+
+
+# ── get_current_user error mapping ───────────────────
+def current_user(token: str) -> dict:
+    return run(dependencies.get_current_user(
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    ))
+
+
+def test_current_user_from_valid_token(jwks_server, monkeypatch):
+    verifier = make_verifier(jwks_server.url)
+    monkeypatch.setattr(dependencies, "get_token_verifier", lambda: verifier)
+    assert current_user(hs256(claims())) == {
+        "sub": "user-1", "email": "user@example.com", "role": "authenticated",
+    }
+
+
+def test_invalid_token_is_401(jwks_server, monkeypatch):
+    verifier = make_verifier(jwks_server.url)
+    monkeypatch.setattr(dependencies, "get_token_verifier", lambda: verifier)
+    with pytest.raises(HTTPException) as exc:
+        current_user(hs256(claims(), secret="wrong-secret"))
+    assert exc.value.status_code == 401
+
+
+def test_jwks_unavailable_is_503(jwks_server, signing_key, monkeypatch):
+    jwks_server.status = 503
+    verifier = make_verifier(jwks_server.url)
+    monkeypatch.setattr(dependencies, "get_token_verifier", lambda: verifier)
+    with pytest.raises(HTTPException) as exc:
+        current_user(signing_key("kid-1").sign(claims()))
+    assert exc.value.status_code == 503
@@ -12,6 +12,9 @@ import { Alert, AlertDescription } from '@/components/ui/alert';
 import { Label } from '@/components/ui/label';
 import TerminalBlock from '@/components/TerminalBlock';
 
+// Reconnects to a dropped generation stream before giving up
+const MAX_STREAM_RESUMES = 3;
+
 interface TerminalLine {
     text: string;
     type: 'status' | 'chunk' | 'error';
@@ -64,27 +67,13 @@ export default function CreateProjectPage() {
             tech_stack: techStack,
         };
 
-        try {
-            // Get JWT token from localStorage
-            const tokens = localStorage.getItem('auth_tokens');
-            const parsed = JSON.parse(tokens || '{}');
-
-            const response = await fetch(
-                `${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/projects/stream`,
-                {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        Authorization: `Bearer ${parsed.access_token}`,
-                    },
-                    body: JSON.stringify(requestData),
-                }
-            );
-
-            if (!response.ok) {
-                throw new Error(`HTTP ${response.status}`);
-            }
+        // Set from the stream itself, so a dropped connection can be
+        // resumed with Last-Event-ID
+        let projectId: string | null = null;
+        let lastEventId = '';
 
+        // Reads one SSE response; true once the stream has finished (done or error)
+        const readStream = async (response: Response): Promise<boolean> => {
             const reader = response.body?.getReader();
             if (!reader) throw new Error('No response body');
 
@@ -93,25 +82,42 @@ export default function CreateProjectPage() {
 
             while (true) {
                 const { done, value } = await reader.read();
-                if (done) break;
+                if (done) return false;
 
                 buffer += decoder.decode(value, { stream: true });
 
                 // Process complete SSE messages
-                const lines = buffer.split('\n\n');
-                buffer = lines.pop() || ''; // Keep incomplete message in buffer
-
-                for (const line of lines) {
-                    if (!line.startsWith('data: ')) continue;
+                const messages = buffer.split('\n\n');
+                buffer = messages.pop() || ''; // Keep incomplete message in buffer
+
+                for (const message of messages) {
+                    let data = '';
+                    for (const line of message.split('\n')) {
+                        if (line.startsWith('id: ')) lastEventId = line.slice(4);
+                        else if (line.startsWith('data: ')) data += line.slice(6);
+                    }
+                    if (!data) continue; // keep-alive comment
 
                     try {
-                        const event = JSON.parse(line.slice(6));
+                        const event = JSON.parse(data);
 
-                        if (event.type === 'status') {
+                        if (event.type === 'project') {
+                            projectId = event.data;
+                        } else if (event.type === 'status') {
                             setTerminalLines((prev) => [
                                 ...prev,
                                 { text: event.data, type: 'status' },
                             ]);
+                        } else if (event.type === 'outline') {
+                            // Module outline ahead of the tasks (two-phase generation)
+                            const outline = event.data as { title: string; estimated_days?: number }[];
+                            setTerminalLines((prev) => [
+                                ...prev,
+                                ...outline.map((module, i) => ({
+                                    text: `  ${i + 1}. ${module.title}${module.estimated_days ? ` (${module.estimated_days}d)` : ''}`,
+                                    type: 'status' as const,
+                                })),
+                            ]);
                         } else if (event.type === 'chunk') {
                             setTerminalLines((prev) => [
                                 ...prev,
@@ -125,20 +131,70 @@ export default function CreateProjectPage() {
                             setTerminalActive(false);
                             setIsCreating(false);
                             setCreateError(event.data);
-                            return;
+                            return true;
                         } else if (event.type === 'done') {
                             setTerminalActive(false);
                             // Small delay so user sees the "Done!" message
                             setTimeout(() => {
                                 router.push(`/projects/${event.data}`);
                             }, 1500);
-                            return;
+                            return true;
                         }
                     } catch {
                         // Skip malformed JSON
                     }
                 }
             }
+        };
+
+        try {
+            // Get JWT token from localStorage
+            const tokens = localStorage.getItem('auth_tokens');
+            const parsed = JSON.parse(tokens || '{}');
+            const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+
+            // Same key on every retry of this submission: the server joins
+            // the generation already running instead of starting another
+            const idempotencyKey = crypto.randomUUID();
+
+            // Until the project id is known, (re)send the POST; after that,
+            // reattach to the generation (it keeps running server-side) and
+            // replay what was missed
+            const openStream = () =>
+                projectId === null
+                    ? fetch(`${apiUrl}/api/projects/stream`, {
+                          method: 'POST',
+                          headers: {
+                              'Content-Type': 'application/json',
+                              Authorization: `Bearer ${parsed.access_token}`,
+                              'Idempotency-Key': idempotencyKey,
+                          },
+                          body: JSON.stringify(requestData),
+                      })
+                    : fetch(`${apiUrl}/api/projects/${projectId}/stream`, {
+                          headers: {
+                              Authorization: `Bearer ${parsed.access_token}`,
+                              'Last-Event-ID': lastEventId,
+                          },
+                      });
+
+            for (let attempt = 0; ; attempt++) {
+                try {
+                    const response = await openStream();
+                    if (!response.ok) {
+                        // Not a connection problem: don't retry
+                        attempt = MAX_STREAM_RESUMES;
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    if (await readStream(response)) break;
+                } catch (err) {
+                    if (attempt >= MAX_STREAM_RESUMES) throw err;
+                }
+                if (attempt >= MAX_STREAM_RESUMES) {
+                    throw new Error('Connection lost');
+                }
+                await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)));
+            }
         } catch (err: any) {
             console.error(err);
             setTerminalLines((prev) => [
@@ -23,13 +23,25 @@ export async function createProject(
     return response.data;
 }
 
+// Largest page the backend serves (PROJECT_LIST_MAX_PAGE_SIZE)
+const PROJECT_PAGE_SIZE = 100;
+
 /**
  * List all projects for the authenticated user.
- * Returns project summaries (no modules/tasks).
+ * Returns project summaries (no modules/tasks). The list endpoint is
+ * paginated: follows X-Next-Cursor until the last page.
  */
 export async function getProjects(): Promise<Project[]> {
-    const response = await api.get("/api/projects");
-    return response.data;
+    const projects: Project[] = [];
+    let cursor: string | undefined;
+    do {
+        const response = await api.get("/api/projects", {
+            params: { limit: PROJECT_PAGE_SIZE, cursor },
+        });
+        projects.push(...response.data);
+        cursor = response.headers["x-next-cursor"] || undefined;
+    } while (cursor);
+    return projects;
 }
 
 /**
@@ -4,7 +4,7 @@
 // ──────────────────────────────────────────────
 
 export type PlanningMode = "deadline" | "open";
-export type ProjectStatus = "planning" | "active" | "completed" | "archived";
+export type ProjectStatus = "planning" | "active" | "completed" | "archived" | "abandoned";
 export type TaskStatus = "pending" | "in_progress" | "completed" | "blocked";
 
 export interface CreateProjectRequest {